@@ -0,0 +1,26 @@
+"""add schedule generated_through watermark
+
+Revision ID: 3c9e5f1a7b42
+Revises: 1fa129643119
+Create Date: 2026-10-19 09:12:40.218331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e5f1a7b42'
+down_revision: Union[str, None] = '1fa129643119'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('schedules', sa.Column('generated_through', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('schedules', 'generated_through')
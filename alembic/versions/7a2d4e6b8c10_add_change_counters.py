@@ -0,0 +1,28 @@
+"""add schedule change_seq and organization ref_seq counters
+
+Revision ID: 7a2d4e6b8c10
+Revises: 3c9e5f1a7b42
+Create Date: 2026-10-19 11:02:17.504112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d4e6b8c10'
+down_revision: Union[str, None] = '3c9e5f1a7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('schedules', sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('organizations', sa.Column('ref_seq', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('organizations', 'ref_seq')
+    op.drop_column('schedules', 'change_seq')
@@ -0,0 +1,32 @@
+"""employee calendar_token and (employee_id, shift_id) assignment index
+
+Revision ID: a7d5e2c4f019
+Revises: f3c9a2b7d514
+Create Date: 2026-10-19 19:03:41.270556
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d5e2c4f019'
+down_revision: Union[str, None] = 'f3c9a2b7d514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('employees', sa.Column('calendar_token', sa.String(length=64), nullable=True))
+    op.create_unique_constraint('uq_employees_calendar_token', 'employees', ['calendar_token'])
+    op.create_index('ix_assignments_employee_shift', 'assignments', ['employee_id', 'shift_id'], unique=False)
+    op.drop_index(op.f('ix_assignments_employee_id'), table_name='assignments')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_assignments_employee_id'), 'assignments', ['employee_id'], unique=False)
+    op.drop_index('ix_assignments_employee_shift', table_name='assignments')
+    op.drop_constraint('uq_employees_calendar_token', 'employees', type_='unique')
+    op.drop_column('employees', 'calendar_token')
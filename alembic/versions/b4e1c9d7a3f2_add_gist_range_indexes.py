@@ -0,0 +1,44 @@
+"""add GiST range indexes for shift and unavailability overlap queries
+
+Revision ID: b4e1c9d7a3f2
+Revises: 7a2d4e6b8c10
+Create Date: 2026-10-19 12:20:03.117842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e1c9d7a3f2'
+down_revision: Union[str, None] = '7a2d4e6b8c10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # range types / GiST are PostgreSQL-only; other backends keep the B-tree indexes
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute(
+        "CREATE INDEX ix_shifts_org_during ON shifts "
+        "USING gist (org_id, tstzrange(start_at, end_at, '[)'))"
+    )
+    op.execute(
+        "CREATE INDEX ix_shifts_schedule_during ON shifts "
+        "USING gist (schedule_id, tstzrange(start_at, end_at, '[)'))"
+    )
+    op.execute(
+        "CREATE INDEX ix_unavail_emp_during ON unavailability "
+        "USING gist (employee_id, tstzrange(start_at, end_at, '[)'))"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('DROP INDEX IF EXISTS ix_unavail_emp_during')
+    op.execute('DROP INDEX IF EXISTS ix_shifts_schedule_during')
+    op.execute('DROP INDEX IF EXISTS ix_shifts_org_during')
@@ -0,0 +1,26 @@
+"""users: add token_version for access token revocation
+
+Revision ID: b4e8c1d7a396
+Revises: a7d5e2c4f019
+Create Date: 2026-10-19 21:12:08.514377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8c1d7a396'
+down_revision: Union[str, None] = 'a7d5e2c4f019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,31 @@
+"""add pg_trgm GIN index on shifts.notes
+
+Revision ID: c8f3a1e5d920
+Revises: b4e1c9d7a3f2
+Create Date: 2026-10-19 13:05:48.662190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f3a1e5d920'
+down_revision: Union[str, None] = 'b4e1c9d7a3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # trigram search is PostgreSQL-only; elsewhere notes search stays a plain ILIKE
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE INDEX ix_shifts_notes_trgm ON shifts USING gin (notes gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('DROP INDEX IF EXISTS ix_shifts_notes_trgm')
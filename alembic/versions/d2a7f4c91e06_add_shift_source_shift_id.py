@@ -0,0 +1,26 @@
+"""add shifts.source_shift_id for schedule cloning
+
+Revision ID: d2a7f4c91e06
+Revises: c8f3a1e5d920
+Create Date: 2026-10-19 16:40:12.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f4c91e06'
+down_revision: Union[str, None] = 'c8f3a1e5d920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('shifts', sa.Column('source_shift_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('shifts', 'source_shift_id')
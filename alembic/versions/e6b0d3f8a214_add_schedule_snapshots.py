@@ -0,0 +1,35 @@
+"""add schedule_snapshots for published schedules
+
+Revision ID: e6b0d3f8a214
+Revises: d2a7f4c91e06
+Create Date: 2026-10-19 17:25:48.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b0d3f8a214'
+down_revision: Union[str, None] = 'd2a7f4c91e06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'schedule_snapshots',
+        sa.Column('schedule_id', sa.Integer(), nullable=False),
+        sa.Column('change_seq', sa.Integer(), nullable=False),
+        sa.Column('etag', sa.String(length=80), nullable=False),
+        sa.Column('body', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['schedule_id'], ['schedules.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('schedule_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('schedule_snapshots')
@@ -0,0 +1,64 @@
+"""add shifts_archive / assignments_archive and the archived schedule status
+
+Revision ID: f3c9a2b7d514
+Revises: e6b0d3f8a214
+Create Date: 2026-10-19 18:12:03.557021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a2b7d514'
+down_revision: Union[str, None] = 'e6b0d3f8a214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # ScheduleStatus.archived existed in Python but never in the PG enum
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE schedule_status ADD VALUE IF NOT EXISTS 'archived'")
+
+    op.create_table(
+        'shifts_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('org_id', sa.Integer(), nullable=False),
+        sa.Column('schedule_id', sa.Integer(), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=True),
+        sa.Column('role_id', sa.Integer(), nullable=False),
+        sa.Column('start_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('required_staff_count', sa.Integer(), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('source_shift_id', sa.Integer(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['schedule_id'], ['schedules.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_shifts_archive_org_id'), 'shifts_archive', ['org_id'], unique=False)
+    op.create_index(op.f('ix_shifts_archive_schedule_id'), 'shifts_archive', ['schedule_id'], unique=False)
+
+    op.create_table(
+        'assignments_archive',
+        sa.Column('shift_id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['shift_id'], ['shifts_archive.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('shift_id', 'employee_id'),
+    )
+    op.create_index(op.f('ix_assignments_archive_shift_id'), 'assignments_archive', ['shift_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_assignments_archive_shift_id'), table_name='assignments_archive')
+    op.drop_table('assignments_archive')
+    op.drop_index(op.f('ix_shifts_archive_schedule_id'), table_name='shifts_archive')
+    op.drop_index(op.f('ix_shifts_archive_org_id'), table_name='shifts_archive')
+    op.drop_table('shifts_archive')
+    # PostgreSQL cannot drop an enum value; 'archived' stays on schedule_status
@@ -1,20 +1,20 @@
 from __future__ import annotations
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, date, timezone
 from typing import Literal
 
 from fastapi import HTTPException
-from sqlalchemy import select, and_, func, delete
+from sqlalchemy import select, delete, insert
 from sqlalchemy.orm import Session
 
+from core.ranges import overlaps
 from shift.models import Shift
 from assignment.models import Assignment
 from employee.models import Employee
 from preference.models import Preference
 from unavailability.models import Unavailability
 from jobrole.models import JobRole
-
-#TODO: Optimize auto assign service by pre-loading unavailability, 
-    # preferences and existing assignments instead of querying in inner loops.
+from schedule.service import bump_change_seq
 
 # ---------- helpers ----------
 
@@ -35,19 +35,98 @@ def _shift_hours(s: Shift) -> float:
 def _overlaps(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
     return (a_start < b_end) and (a_end > b_start)
 
-# ---------- scoring / constraints ----------
+# ---------- constraint snapshot ----------
 
-def _candidate_blocked_by_unavailability(db: Session, employee_id: int, start: datetime, end: datetime) -> bool:
-    stmt = select(func.count(Unavailability.id)).where(
-        and_(
-            Unavailability.employee_id == employee_id,
-            Unavailability.start_at < end,
-            Unavailability.end_at   > start,
+@dataclass
+class _Booking:
+    shift_id: int
+    schedule_id: int
+    role_id: int | None
+    start: datetime
+    end: datetime
+
+@dataclass
+class ConstraintSnapshot:
+    """
+    Everything the greedy pass needs to judge candidates, loaded once up front
+    so the inner loops never go back to the database.
+    """
+    employees: list[Employee]
+    unavailability: dict[int, list[tuple[datetime, datetime]]] = field(default_factory=dict)
+    preferences: dict[tuple[int, int], list[Preference]] = field(default_factory=dict)  # (employee_id, weekday)
+    role_caps: dict[int, int | None] = field(default_factory=dict)
+    bookings: dict[int, list[_Booking]] = field(default_factory=dict)  # employee_id -> assigned shifts
+    seats: dict[int, set[int]] = field(default_factory=dict)  # shift_id -> employee ids
+
+    def book(self, employee_id: int, sh: Shift) -> None:
+        self.bookings.setdefault(employee_id, []).append(
+            _Booking(sh.id, sh.schedule_id, sh.role_id, _aware(sh.start_at), _aware(sh.end_at))
         )
+        self.seats.setdefault(sh.id, set()).add(employee_id)
+
+def load_constraint_snapshot(db: Session, *, org_id: int, shifts: list[Shift]) -> ConstraintSnapshot:
+    """
+    Load employees, unavailability, preferences, role caps and existing
+    assignments for the org, bounded to the ISO weeks the given shifts touch.
+    """
+    employees = list(db.scalars(select(Employee).where(Employee.org_id == org_id)))
+    snap = ConstraintSnapshot(employees=employees)
+    if not shifts:
+        return snap
+
+    bound_start, _ = _week_bounds(min(_aware(s.start_at) for s in shifts).date())
+    _, bound_end = _week_bounds(max(_aware(s.start_at) for s in shifts).date())
+    # overnight shifts may run past the last Sunday
+    bound_end = max(bound_end, max(_aware(s.end_at) for s in shifts))
+
+    for emp_id, u_start, u_end in db.execute(
+        select(Unavailability.employee_id, Unavailability.start_at, Unavailability.end_at)
+        .join(Employee, Employee.id == Unavailability.employee_id)
+        .where(
+            Employee.org_id == org_id,
+            overlaps(Unavailability.start_at, Unavailability.end_at, bound_start, bound_end),
+        )
+    ):
+        snap.unavailability.setdefault(emp_id, []).append((_aware(u_start), _aware(u_end)))
+
+    for p in db.scalars(
+        select(Preference)
+        .join(Employee, Employee.id == Preference.employee_id)
+        .where(Employee.org_id == org_id)
+    ):
+        snap.preferences.setdefault((p.employee_id, p.weekday), []).append(p)
+
+    snap.role_caps = dict(db.execute(
+        select(JobRole.id, JobRole.weekly_hours_cap).where(JobRole.org_id == org_id)
+    ).all())
+
+    for shift_id, emp_id, sched_id, role_id, s_start, s_end in db.execute(
+        select(
+            Assignment.shift_id, Assignment.employee_id,
+            Shift.schedule_id, Shift.role_id, Shift.start_at, Shift.end_at,
+        )
+        .join(Shift, Shift.id == Assignment.shift_id)
+        .where(
+            Shift.org_id == org_id,
+            overlaps(Shift.start_at, Shift.end_at, bound_start, bound_end),
+        )
+    ):
+        snap.bookings.setdefault(emp_id, []).append(
+            _Booking(shift_id, sched_id, role_id, _aware(s_start), _aware(s_end))
+        )
+        snap.seats.setdefault(shift_id, set()).add(emp_id)
+
+    return snap
+
+# ---------- scoring / constraints ----------
+
+def _candidate_blocked_by_unavailability(snap: ConstraintSnapshot, employee_id: int, start: datetime, end: datetime) -> bool:
+    return any(
+        _overlaps(start, end, u_start, u_end)
+        for u_start, u_end in snap.unavailability.get(employee_id, ())
     )
-    return (db.scalar(stmt) or 0) > 0
 
-def _preference_score(db: Session, employee_id: int, shift: Shift) -> int:
+def _preference_score(snap: ConstraintSnapshot, employee_id: int, shift: Shift) -> int:
     """
     MVP scoring:
     - If any pref with do_not_schedule=True overlaps → disqualify via -infinity sentinel.
@@ -56,12 +135,7 @@ def _preference_score(db: Session, employee_id: int, shift: Shift) -> int:
     start = _aware(shift.start_at)
     end = _aware(shift.end_at)
 
-    prefs = list(db.scalars(
-        select(Preference).where(
-            Preference.employee_id == employee_id,
-            Preference.weekday == start.weekday(),  # filter on weekday
-        )
-    ))
+    prefs = snap.preferences.get((employee_id, start.weekday()), ())
     best = 0
     for p in prefs:
         # only use preferences in the valid date range
@@ -92,154 +166,87 @@ def _preference_score(db: Session, employee_id: int, shift: Shift) -> int:
 
     return best
 
-def _current_week_role_hours(db: Session, employee_id: int, role_id: int, week_start: datetime, week_end: datetime,) -> float:
+def _current_week_role_hours(snap: ConstraintSnapshot, employee_id: int, role_id: int, week_start: datetime, week_end: datetime,) -> float:
     """
     Sum assigned shift hours for this employee on this role within week window.
     """
-    stmt = (
-        select(Shift.start_at, Shift.end_at)
-        .join(Assignment, Assignment.shift_id == Shift.id)
-        .where(
-            Assignment.employee_id == employee_id,
-            Shift.role_id == role_id,
-            Shift.start_at < week_end,
-            Shift.end_at > week_start,
-        )
-    )
-
     total = 0.0
-    for s_start, s_end in db.execute(stmt):
-        total += (_aware(s_end) - _aware(s_start)).total_seconds() / 3600.0
+    for b in snap.bookings.get(employee_id, ()):
+        if b.role_id == role_id and _overlaps(b.start, b.end, week_start, week_end):
+            total += (b.end - b.start).total_seconds() / 3600.0
     return total
 
+def _has_conflict(snap: ConstraintSnapshot, employee_id: int, start: datetime, end: datetime) -> bool:
+    return any(_overlaps(b.start, b.end, start, end) for b in snap.bookings.get(employee_id, ()))
 
-def _role_week_cap(db: Session, role_id: int) -> float:
-    return db.scalar(
-        select(JobRole.weekly_hours_cap).where(JobRole.id == role_id)
-    )
-
-# ---------- fetch shifts and employees ----------
+# ---------- greedy pass ----------
 
-def _load_shifts_and_employees(db: Session, org_id: int, start: datetime, end: datetime):
-    # shifts in window
-    shifts = list(db.scalars(
-        select(Shift).where(
-            Shift.org_id == org_id,
-            Shift.start_at < end,
-            Shift.end_at   > start,
-        ).order_by(Shift.start_at.asc(), Shift.id.asc())
-    ))
-
-    employees = list(db.scalars(select(Employee).where(Employee.org_id == org_id)))
-    return shifts, employees
-
-# ---------- public API ----------
-def auto_assign(
+def assign_shifts(
     db: Session,
     *,
+    shifts: list[Shift],
+    snapshot: ConstraintSnapshot,
     schedule_id: int,
-    start_date: date,
-    end_date: date,
-    policy: Literal["fill_missing", "reassign_all"] = "fill_missing",
+    window_start: datetime,
+    window_end: datetime,
+    policy: str,
     dry_run: bool = False,
     ) -> dict:
     """
-    Greedy MVP:
-    - Traverse shifts in window.
-    - For each required seat, pick best candidate by:
-      1) not overlapping unavailability
-      2) not exceeding JobRole.weekly_hours_cap (per ISO week)
-      3) highest preference scores: if it's a tie: lowest current week-role hours, then lowest total assigned this window
-    - policy="reassign_all" clears assignments in window first.
+    Run the greedy pass over already-loaded shifts using a preloaded snapshot.
+    Picks are staged on the session (one bulk insert) but never committed,
+    so callers decide where the transaction ends.
     """
-    # Derive UTC bounds for the window (Iceland == UTC)
-    window_start = datetime(start_date.year, start_date.month, start_date.day, 0, 0, 0, tzinfo=timezone.utc)
-    window_end = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
-
-    # Get org_id via any shift from schedule
-    from schedule.models import Schedule
-    sched = db.get(Schedule, schedule_id)
-    if not sched:
-        raise HTTPException(status_code=404, detail="schedule not found")
-
-    # Load shifts and employees
-    shifts, employees = _load_shifts_and_employees(db, sched.org_id, window_start, window_end)
-
-    # Limit to this schedule’s shifts only
-    shifts = [s for s in shifts if s.schedule_id == schedule_id]
-
-    # Clear (policy: reassign_all)
-    if policy == "reassign_all" and not dry_run:
-        db.execute(
-            delete(Assignment).where(
-                Assignment.shift_id.in_([s.id for s in shifts])
-            )
-        )
-        db.commit()
+    employees = snapshot.employees
 
     # Build in-memory tally for tie-breaks: total hours this window (any role)
     emp_window_hours: dict[int, float] = {e.id: 0.0 for e in employees}
-    # Pre-compute from current assignments in window
-    current = db.execute(
-        select(Assignment.employee_id, Shift.start_at, Shift.end_at)
-        .join(Shift, Shift.id == Assignment.shift_id)
-        .where(
-            Shift.schedule_id == schedule_id,
-            Shift.start_at < window_end,
-            Shift.end_at > window_start,
-        )
-    ).all()
-    for emp_id, s_start, s_end in current:
-        emp_window_hours[emp_id] = emp_window_hours.get(emp_id, 0.0) + (
-            (_aware(s_end) - _aware(s_start)).total_seconds() / 3600.0
-        )
+    for emp_id, bookings in snapshot.bookings.items():
+        for b in bookings:
+            if b.schedule_id == schedule_id and _overlaps(b.start, b.end, window_start, window_end):
+                emp_window_hours[emp_id] = emp_window_hours.get(emp_id, 0.0) + (
+                    (b.end - b.start).total_seconds() / 3600.0
+                )
 
     result = {"assigned": 0, "skipped_full": 0, "skipped_no_candidates": 0, "policy": policy,}
+    new_rows: list[dict] = []
 
     # GREEDY
     for sh in shifts:
         seats_needed = max(0, (sh.required_staff_count or 1))
         # How many already assigned?
-        already = db.scalar(
-            select(func.count(Assignment.employee_id)).where(
-                Assignment.shift_id == sh.id
-            )
-        ) or 0
-        seats_available = seats_needed - already
+        already = snapshot.seats.get(sh.id, set())
+        seats_available = seats_needed - len(already)
         if seats_available <= 0:
             result["skipped_full"] += 1
             continue
 
-        week_start, week_end = _week_bounds(_aware(sh.start_at).date())
-        role_cap = _role_week_cap(db, sh.role_id)
+        sh_start, sh_end = _aware(sh.start_at), _aware(sh.end_at)
+        week_start, week_end = _week_bounds(sh_start.date())
+        role_cap = snapshot.role_caps.get(sh.role_id)
 
         # Gather candidates
         shift_hours = _shift_hours(sh)
         candidates = []
         for emp in employees:
             # Check if candiate already assigned to this shift
-            exists = db.scalar(
-                select(func.count(Assignment.employee_id)).where(Assignment.shift_id == sh.id, Assignment.employee_id == emp.id,)
-            )
-            if exists:
+            if emp.id in already:
                 continue
 
             # Unavailability
-            if _candidate_blocked_by_unavailability(
-                db, emp.id, _aware(sh.start_at), _aware(sh.end_at)
-            ):
+            if _candidate_blocked_by_unavailability(snapshot, emp.id, sh_start, sh_end):
                 continue
 
             # Weekly cap by role
             role_week_hours = _current_week_role_hours(
-                db, emp.id, sh.role_id, week_start, week_end
+                snapshot, emp.id, sh.role_id, week_start, week_end
             )
             if role_cap is not None:
                 if role_week_hours + shift_hours > role_cap + 1e-6:
                     continue
 
             # Preference score
-            score = _preference_score(db, emp.id, sh)
+            score = _preference_score(snapshot, emp.id, sh)
             if score <= -10_000:
                 continue  # hard block
 
@@ -266,12 +273,7 @@ def auto_assign(
             for idx, cand in enumerate(candidates):
                 score, role_week_hours, total_window_hours, emp_id = cand
                 # Basic overlap guard with existing assignments (rare if constraints are consistent)
-                conflict = db.scalar(
-                    select(func.count(Assignment.employee_id))
-                    .join(Shift, Shift.id == Assignment.shift_id)
-                    .where(Assignment.employee_id == emp_id, Shift.start_at < _aware(sh.end_at),Shift.end_at > _aware(sh.start_at),)
-                ) or 0
-                if conflict:
+                if _has_conflict(snapshot, emp_id, sh_start, sh_end):
                     continue
 
                 picked_emp = emp_id
@@ -280,16 +282,82 @@ def auto_assign(
                 emp_window_hours[picked_emp] = emp_window_hours.get(
                     picked_emp, 0.0
                 ) + shift_hours
+                snapshot.book(picked_emp, sh)
                 # remove chosen from candidate list for next seat
                 candidates.pop(idx)
                 break
 
         if picked:
-            if not dry_run:
-                for emp_id in picked:
-                    db.add(Assignment(shift_id=sh.id, employee_id=emp_id))
-                db.commit()
-
+            new_rows.extend({"shift_id": sh.id, "employee_id": emp_id} for emp_id in picked)
             # In both real run and dry_run we report how many seats we filled
             result["assigned"] += len(picked)
+
+    if new_rows and not dry_run:
+        db.execute(insert(Assignment), new_rows)
     return result
+
+# ---------- public API ----------
+def auto_assign(
+    db: Session,
+    *,
+    schedule_id: int,
+    start_date: date,
+    end_date: date,
+    policy: Literal["fill_missing", "reassign_all"] = "fill_missing",
+    dry_run: bool = False,
+    ) -> dict:
+    """
+    Greedy MVP:
+    - Traverse shifts in window.
+    - For each required seat, pick best candidate by:
+      1) not overlapping unavailability
+      2) not exceeding JobRole.weekly_hours_cap (per ISO week)
+      3) highest preference scores: if it's a tie: lowest current week-role hours, then lowest total assigned this window
+    - policy="reassign_all" clears assignments in window first.
+    - Everything runs in one transaction, committed once at the end.
+    """
+    # Derive UTC bounds for the window (Iceland == UTC)
+    window_start = datetime(start_date.year, start_date.month, start_date.day, 0, 0, 0, tzinfo=timezone.utc)
+    window_end = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
+
+    # Get org_id via any shift from schedule
+    from schedule.models import Schedule
+    sched = db.get(Schedule, schedule_id)
+    if not sched:
+        raise HTTPException(status_code=404, detail="schedule not found")
+
+    # This schedule's shifts in the window
+    shifts = list(db.scalars(
+        select(Shift).where(
+            Shift.schedule_id == schedule_id,
+            overlaps(Shift.start_at, Shift.end_at, window_start, window_end),
+        ).order_by(Shift.start_at.asc(), Shift.id.asc())
+    ))
+
+    try:
+        # Clear (policy: reassign_all)
+        if policy == "reassign_all" and not dry_run and shifts:
+            db.execute(
+                delete(Assignment).where(
+                    Assignment.shift_id.in_([s.id for s in shifts])
+                )
+            )
+
+        snapshot = load_constraint_snapshot(db, org_id=sched.org_id, shifts=shifts)
+        result = assign_shifts(
+            db,
+            shifts=shifts,
+            snapshot=snapshot,
+            schedule_id=schedule_id,
+            window_start=window_start,
+            window_end=window_end,
+            policy=policy,
+            dry_run=dry_run,
+        )
+        if not dry_run:
+            bump_change_seq(db, [schedule_id])
+            db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
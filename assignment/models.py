@@ -1,5 +1,6 @@
 from __future__ import annotations
-from sqlalchemy import ForeignKey
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from core.database import Base
 
@@ -9,7 +10,21 @@ class Assignment(Base):
         ForeignKey("shifts.id", ondelete="CASCADE"), primary_key=True, index=True
     )
     employee_id: Mapped[int] = mapped_column(
-        ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True, index=True
+        ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True
     )
     shift = relationship("Shift", back_populates="assignments")
     employee = relationship("Employee", back_populates="assignments")
+
+    # employee -> shift ids without touching the heap ("my shifts", ICS feed);
+    # also serves every lookup the old single-column employee_id index did
+    __table_args__ = (Index("ix_assignments_employee_shift", "employee_id", "shift_id"),)
+
+
+class AssignmentArchive(Base):
+    """Assignments of archived shifts; employee_id is kept as a plain id."""
+    __tablename__ = "assignments_archive"
+    shift_id: Mapped[int] = mapped_column(
+        ForeignKey("shifts_archive.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    employee_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,17 +1,23 @@
 from __future__ import annotations
 from typing import Optional, Literal
-from datetime import date
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from auth.services.auth_service import get_current_active_user
 from authz.deps import require_manager
+from core.fastjson import rows_response
+from core.columnar import wants_columnar, to_columns, columnar_response
+from core.etag import make_etag, etag_headers, etag_matches, not_modified
 
 from .schema import (
     AssignmentSchema,
+    AssignmentWithShiftSchema,
+    AssignmentRow,
     AssignmentCreatePayload,
     AssignmentCreate,
     AssignmentUpdate,
@@ -19,26 +25,73 @@ from .schema import (
     AutoAssignResponse,
     )
 from . import service
+from schedule import service as schedule_service
+from organization import service as org_service
 from schedule.models import Schedule
 from .auto_assign_service import auto_assign as auto_assign_service
 
 
 assignment_router = APIRouter(prefix="/assignments", tags=["Assignments"])
 
+_assignment_rows = TypeAdapter(list[AssignmentRow])
+_SHIFT_COLUMNS = ("schedule_id", "start_at", "end_at", "role_id", "location_id")
+
 # List assignments (scoped to caller's org). Optional filters.
-@assignment_router.get("", response_model=list[AssignmentSchema])
+@assignment_router.get("", response_model=list[AssignmentWithShiftSchema])
 def list_assignments(
+    request: Request,
     shift_id: Optional[int] = Query(None),
     employee_id: Optional[int] = Query(None),
+    schedule_id: Optional[int] = Query(None, description="Only assignments on this schedule's shifts"),
+    location_id: Optional[int] = Query(None),
+    start: Optional[datetime] = Query(None, description="Shift overlaps window starting here"),
+    end: Optional[datetime] = Query(None, description="Shift overlaps window ending here"),
+    include_shift: bool = Query(False, description="Embed the assigned shift"),
+    fmt: Optional[Literal["json", "columnar"]] = Query(None, alias="format", description="columnar: one array per field plus an employee lookup"),
     db: Session = Depends(get_db),
     user = Depends(get_current_active_user),
     ):
-    return service.get_assignments(
+    columnar = wants_columnar(request, fmt)
+    headers = {"Vary": "Accept"}
+    if schedule_id is not None:
+        seq = schedule_service.get_change_seq(db, schedule_id=schedule_id, org_id=user.org_id)
+        if seq is not None:
+            parts = ("s", schedule_id, seq)
+            if columnar:
+                # columnar bodies carry name lookups, so renames must change the tag too
+                parts += ("c", org_service.get_ref_seq(db, user.org_id))
+            etag = make_etag(*parts)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            headers.update(etag_headers(etag))
+
+    rows = service.get_assignment_rows(
         db,
         org_id=user.org_id,
         shift_id=shift_id,
         employee_id=employee_id,
+        schedule_id=schedule_id,
+        location_id=location_id,
+        start=start,
+        end=end,
+        include_shift=include_shift,
     )
+    if columnar:
+        names = ["shift_id", "employee_id"]
+        if include_shift:
+            # Flatten the embedded shift into prefixed columns
+            names += [f"shift_{name}" for name in _SHIFT_COLUMNS]
+            rows = [
+                {**row, **{f"shift_{name}": row["shift"][name] for name in _SHIFT_COLUMNS}}
+                for row in rows
+            ]
+        employees = service.get_employee_names(
+            db, org_id=user.org_id, employee_ids={row["employee_id"] for row in rows}
+        )
+        columns = to_columns(rows, names, epoch=("shift_start_at", "shift_end_at"))
+        return columnar_response(columns, count=len(rows), lookups={"employees": employees}, headers=headers)
+
+    return rows_response(_assignment_rows, rows, headers=headers)
 
 # Get single assignment by composite id (scoped)
 @assignment_router.get("/{shift_id}/{employee_id}", response_model=AssignmentSchema)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from datetime import date
 from typing import Optional
-from typing_extensions import Literal
+from typing_extensions import Literal, TypedDict
 from pydantic import BaseModel, ConfigDict
+from shift.schemas import ShiftSchema, ShiftRow
 
 
 class AssignmentSchema(BaseModel):
@@ -11,6 +12,14 @@ class AssignmentSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AssignmentWithShiftSchema(AssignmentSchema):
+    shift: Optional[ShiftSchema] = None
+
+class AssignmentRow(TypedDict, total=False):
+    shift_id: int
+    employee_id: int
+    shift: ShiftRow
+
 # PUBLIC payload from clients
 class AssignmentCreatePayload(BaseModel):
     shift_id: int
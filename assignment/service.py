@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional
 
 from fastapi import HTTPException
 from sqlalchemy import select
@@ -7,20 +8,27 @@ from sqlalchemy.orm import Session
 
 from .models import Assignment
 from .schema import AssignmentCreate, AssignmentUpdate
+from core.ranges import overlaps
 from shift.models import Shift
 from employee.models import Employee
+from schedule.service import bump_change_seq
 
 
 # LIST (org-scoped)
-def get_assignments(
-    db: Session,
+def _assignments_stmt(
+    columns: list,
     *,
     org_id: int,
     shift_id: Optional[int] = None,
     employee_id: Optional[int] = None,
-    ) -> List[Assignment]:
+    schedule_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    ):
         stmt = (
-            select(Assignment)
+            select(*columns)
+            .select_from(Assignment)
             .join(Shift, Shift.id == Assignment.shift_id)
             .join(Employee, Employee.id == Assignment.employee_id)
             .where(Shift.org_id == org_id, Employee.org_id == org_id)
@@ -29,9 +37,67 @@ def get_assignments(
             stmt = stmt.where(Assignment.shift_id == shift_id)
         if employee_id is not None:
             stmt = stmt.where(Assignment.employee_id == employee_id)
+        # shift-side filters go through ix_shifts_schedule_start / ix_shifts_org_start
+        if schedule_id is not None:
+            stmt = stmt.where(Shift.schedule_id == schedule_id)
+        if location_id is not None:
+            stmt = stmt.where(Shift.location_id == location_id)
+        if start is not None and end is not None:
+            stmt = stmt.where(overlaps(Shift.start_at, Shift.end_at, start, end))
+        elif start is not None:
+            stmt = stmt.where(Shift.end_at > start)    # overlaps window
+        elif end is not None:
+            stmt = stmt.where(Shift.start_at < end)    # overlaps window
+        return stmt.order_by(Assignment.shift_id, Assignment.employee_id)
+
+
+_SHIFT_COLUMNS = [
+    Shift.id, Shift.org_id, Shift.schedule_id, Shift.location_id, Shift.role_id,
+    Shift.start_at, Shift.end_at, Shift.notes, Shift.required_staff_count,
+]
+
+def get_assignment_rows(
+    db: Session,
+    *,
+    org_id: int,
+    shift_id: Optional[int] = None,
+    employee_id: Optional[int] = None,
+    schedule_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_shift: bool = False,
+    ) -> list[dict]:
+        """Org-scoped assignment listing as plain dicts from a column select (no ORM objects)."""
+        columns = [Assignment.shift_id, Assignment.employee_id]
+        if include_shift:
+            columns += _SHIFT_COLUMNS
+        stmt = _assignments_stmt(
+            columns,
+            org_id=org_id,
+            shift_id=shift_id,
+            employee_id=employee_id,
+            schedule_id=schedule_id,
+            location_id=location_id,
+            start=start,
+            end=end,
+        )
+        if not include_shift:
+            return [{"shift_id": a, "employee_id": e} for a, e in db.execute(stmt)]
+        names = [c.key for c in _SHIFT_COLUMNS]
+        return [
+            {"shift_id": row[0], "employee_id": row[1], "shift": dict(zip(names, row[2:]))}
+            for row in db.execute(stmt)
+        ]
+
 
-        stmt = stmt.order_by(Assignment.shift_id, Assignment.employee_id)
-        return list(db.scalars(stmt))
+def get_employee_names(db: Session, *, org_id: int, employee_ids: set[int]) -> dict[int, str]:
+    if not employee_ids:
+        return {}
+    return dict(db.execute(
+        select(Employee.id, Employee.display_name)
+        .where(Employee.org_id == org_id, Employee.id.in_(employee_ids))
+    ).all())
 
 
 # Single (org-scoped)
@@ -65,6 +131,7 @@ def create_assignment(db: Session, dto: AssignmentCreate) -> Assignment:
         employee_id=dto.employee_id,
     )
     db.add(row)
+    bump_change_seq(db, [shift.schedule_id])
     # Let IntegrityError bubble, router maps to 409 on duplicate composite key
     db.commit()
     db.refresh(row)
@@ -87,6 +154,7 @@ def update_assignment(
         for k, v in data.items():
             setattr(row, k, v)
 
+        bump_change_seq(db, [row.shift.schedule_id])
         db.commit()
         db.refresh(row)
         return row
@@ -98,6 +166,7 @@ def delete_assignment(db: Session, shift_id: int, employee_id: int) -> None:
         Assignment.employee_id == employee_id
     ).first()
     if row:
+        bump_change_seq(db, select(Shift.schedule_id).where(Shift.id == shift_id))
         db.delete(row)
         db.commit()
     return
@@ -5,7 +5,7 @@ from auth.models.token import Token
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from auth.services.auth_service import authenticate_user, create_access_token
+from auth.services.auth_service import authenticate_user, create_access_token, token_claims
 from core.database import get_db
 
 auth_router = APIRouter(
@@ -15,7 +15,7 @@ auth_router = APIRouter(
 
 
 @auth_router.post('/token')
-async def login_for_access_token(
+def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Session = Depends(get_db)
 ) -> Token:
@@ -28,7 +28,7 @@ async def login_for_access_token(
         )
     access_token_expires = timedelta(minutes=1440)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=token_claims(user), expires_delta=access_token_expires
     )
 
     return Token(access_token=access_token, token_type="bearer")
@@ -10,8 +10,9 @@ from fastapi import Depends, HTTPException, status
 from datetime import datetime, timedelta, timezone
 import jwt
 from core.database import get_db
-from user.models import User
-from user.service import get_user_by_email
+from user.service import get_user_by_email, get_token_state
+from auth.services import principal_cache
+from auth.services.principal_cache import Principal
 
 SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = "HS256"
@@ -28,6 +29,17 @@ def authenticate_user(email: str, password: str, db:Session = Depends(get_db)):
     return user
 
 
+def token_claims(user) -> dict:
+    """Everything authorization needs, so requests can skip the users table."""
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "org": user.org_id,
+        "mgr": user.is_manager,
+        "tv": user.token_version,
+    }
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     if expires_delta:
@@ -39,25 +51,53 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db:Session = Depends(get_db)):
+# Plain `def` on purpose: the lookup goes through a sync Session, so FastAPI
+# must run it in the threadpool rather than on the event loop.
+def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db:Session = Depends(get_db)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # entries never outlive the token's exp, so a hit needs no decode
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except InvalidTokenError:
+        raise credentials_exception
+
+    uid = payload.get("uid")
+    if uid is not None:
+        state = principal_cache.get_version(uid)
+        if state is None:
+            row = get_token_state(db, uid)
+            if row is None:
+                raise credentials_exception
+            state = (row.token_version, row.is_active)
+            principal_cache.put_version(uid, *state)
+        token_version, is_active = state
+        if payload.get("tv") != token_version:
+            raise credentials_exception
+        principal = Principal(
+            id=uid, org_id=payload.get("org"), is_manager=bool(payload.get("mgr")), is_active=is_active,
+        )
+    else:
+        # tokens issued before claims carried uid/org/mgr/tv; gone once they expire
         email = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = TokenData(email=email)
-    except InvalidTokenError:
-        raise credentials_exception
-    user = get_user_by_email(db, email=token_data.email)
-    if user is None:
-        raise credentials_exception
-    return user
+        user = get_user_by_email(db, email=token_data.email)
+        if user is None:
+            raise credentials_exception
+        principal = Principal(id=user.id, org_id=user.org_id, is_manager=user.is_manager, is_active=user.is_active)
+    principal_cache.put(token, principal, expires_at=payload.get("exp"))
+    return principal
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
+    if not current_user.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
     return current_user
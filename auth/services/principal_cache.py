@@ -0,0 +1,88 @@
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Principal:
+    """What request handlers need to know about the caller, without the ORM row."""
+    id: int
+    org_id: Optional[int]
+    is_manager: bool
+    is_active: bool
+
+
+# token -> (monotonic deadline, principal); per process, so TTL bounds how long
+# another worker can keep serving a user after a change it did not see
+PRINCIPAL_TTL = 60.0
+CACHE_SIZE = 1024
+_cache: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get(token: str) -> Optional[Principal]:
+    with _cache_lock:
+        entry = _cache.get(token)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _cache[token]
+            return None
+        _cache.move_to_end(token)
+        return entry[1]
+
+
+def put(token: str, principal: Principal, *, expires_at: Optional[float] = None) -> None:
+    """Cache for PRINCIPAL_TTL seconds, or until the token's own `exp` (epoch) if sooner."""
+    ttl = PRINCIPAL_TTL
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    if ttl <= 0:
+        return
+    with _cache_lock:
+        _cache[token] = (time.monotonic() + ttl, principal)
+        _cache.move_to_end(token)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+# user_id -> (monotonic deadline, token_version, is_active): the per-user
+# state a claims-only token is checked against
+_versions: OrderedDict[int, tuple[float, int, bool]] = OrderedDict()
+
+
+def get_version(user_id: int) -> Optional[tuple[int, bool]]:
+    with _cache_lock:
+        entry = _versions.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _versions[user_id]
+            return None
+        _versions.move_to_end(user_id)
+        return entry[1], entry[2]
+
+
+def put_version(user_id: int, token_version: int, is_active: bool) -> None:
+    with _cache_lock:
+        _versions[user_id] = (time.monotonic() + PRINCIPAL_TTL, token_version, is_active)
+        _versions.move_to_end(user_id)
+        while len(_versions) > CACHE_SIZE:
+            _versions.popitem(last=False)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop every cached token of a user; call after updating, deactivating or deleting them."""
+    with _cache_lock:
+        for token in [t for t, (_, p) in _cache.items() if p.id == user_id]:
+            del _cache[token]
+        _versions.pop(user_id, None)
+
+
+def clear() -> None:
+    with _cache_lock:
+        _cache.clear()
+        _versions.clear()
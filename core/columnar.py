@@ -0,0 +1,43 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+from fastapi import Request, Response
+from pydantic_core import to_json
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.vaktaplan.columnar+json"
+
+
+def wants_columnar(request: Request, fmt: Optional[str]) -> bool:
+    """?format=columnar wins; otherwise honour an explicit Accept for the columnar type."""
+    if fmt is not None:
+        return fmt == "columnar"
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _epoch(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def to_columns(rows: list[dict], names: Iterable[str], *, epoch: Iterable[str] = ()) -> dict[str, list]:
+    """Pivot row dicts into one array per column; `epoch` columns become Unix seconds."""
+    epoch = set(epoch)
+    columns: dict[str, list] = {}
+    for name in names:
+        values = [row[name] for row in rows]
+        columns[name] = [_epoch(v) for v in values] if name in epoch else values
+    return columns
+
+
+def columnar_response(
+    columns: dict[str, list],
+    *,
+    count: int,
+    lookups: Optional[dict[str, dict[int, Any]]] = None,
+    headers: Optional[dict[str, str]] = None,
+    ) -> Response:
+    body = {"count": count, "columns": columns, "lookups": lookups or {}}
+    return Response(content=to_json(body), media_type=COLUMNAR_MEDIA_TYPE, headers=headers)
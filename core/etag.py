@@ -0,0 +1,26 @@
+from __future__ import annotations
+from fastapi import Request, Response
+
+
+def make_etag(*parts: object) -> str:
+    """Weak validator built from change counters, e.g. W/"s12.40"."""
+    return 'W/"' + ".".join(str(p) for p in parts) + '"'
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    # no-cache: clients may keep the body but must revalidate every time
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
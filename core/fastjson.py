@@ -0,0 +1,23 @@
+from __future__ import annotations
+from typing import Any, Iterable, Optional
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def rows_response(adapter: TypeAdapter, rows: Any, *, headers: Optional[dict[str, str]] = None) -> Response:
+    """
+    Encode plain dict rows with a prebuilt TypeAdapter straight to JSON bytes.
+    Returning a Response bypasses response_model validation, which is the point:
+    the rows come from a Core select and already have the schema's shape.
+    """
+    return Response(content=adapter.dump_json(rows), media_type="application/json", headers=headers)
+
+
+def ndjson_response(records: Iterable[Any], *, headers: Optional[dict[str, str]] = None) -> StreamingResponse:
+    """Stream one JSON document per line; records are encoded lazily as the client reads."""
+    lines = (to_json(record) + b"\n" for record in records)
+    return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+import base64
+import binascii
+from datetime import datetime
+from fastapi import HTTPException
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(start_at: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for (start_at, id) ordered listings."""
+    raw = f"{start_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        ts, _, row_id = raw.rpartition("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def parse_fields(fields: str | None, allowed: set[str]) -> list[str] | None:
+    """Split a comma-separated `fields=` value, rejecting unknown names."""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown field(s): {', '.join(unknown)}")
+    return names or None
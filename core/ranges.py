@@ -0,0 +1,38 @@
+from __future__ import annotations
+from sqlalchemy import Boolean, and_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class overlaps(FunctionElement):
+    """
+    `overlaps(Shift.start_at, Shift.end_at, start, end)` is true when the
+    half-open interval [start_at, end_at) intersects [start, end).
+
+    On PostgreSQL it renders as `tstzrange(..., '[)') && tstzrange(..., '[)')`,
+    which matches the GiST expression indexes on shifts/unavailability; other
+    dialects (SQLite in tests) get the equivalent `start_at < end AND end_at > start`.
+    A reversed window (start > end) matches nothing on both: the upper bound is
+    clamped with GREATEST so tstzrange gets an empty range instead of raising.
+    """
+    type = Boolean()
+    inherit_cache = True
+    name = "overlaps"
+
+
+def _args(element):
+    return list(element.clauses)
+
+
+@compiles(overlaps)
+def _overlaps_default(element, compiler, **kw):
+    start_col, end_col, start, end = _args(element)
+    return "(%s)" % compiler.process(and_(start_col < end, end_col > start), **kw)
+
+
+@compiles(overlaps, "postgresql")
+def _overlaps_pg(element, compiler, **kw):
+    start_col, end_col, start, end = (compiler.process(c, **kw) for c in _args(element))
+    lo = f"CAST({start} AS TIMESTAMP WITH TIME ZONE)"
+    hi = f"CAST({end} AS TIMESTAMP WITH TIME ZONE)"
+    return f"(tstzrange({start_col}, {end_col}, '[)') && tstzrange({lo}, GREATEST({lo}, {hi}), '[)'))"
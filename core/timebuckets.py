@@ -0,0 +1,70 @@
+from __future__ import annotations
+from sqlalchemy import Date, Float, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class local_date(FunctionElement):
+    """
+    `local_date(Shift.start_at, tz)`: the calendar day of a timestamp in the
+    IANA zone `tz`. PostgreSQL converts with `timezone(tz, ...)`; other
+    dialects (SQLite in tests) store naive UTC and take the date as is.
+    """
+    type = Date()
+    inherit_cache = True
+    name = "local_date"
+
+
+class local_hour(FunctionElement):
+    """`local_hour(Shift.start_at, tz)`: hour of day (0-23) in the zone `tz`."""
+    type = Integer()
+    inherit_cache = True
+    name = "local_hour"
+
+
+def _args(element, compiler, **kw):
+    return tuple(compiler.process(c, **kw) for c in element.clauses)
+
+
+@compiles(local_date)
+def _local_date_default(element, compiler, **kw):
+    col, _ = _args(element, compiler, **kw)
+    return f"date({col})"
+
+
+@compiles(local_date, "postgresql")
+def _local_date_pg(element, compiler, **kw):
+    col, tz = _args(element, compiler, **kw)
+    return f"CAST(timezone({tz}, {col}) AS DATE)"
+
+
+@compiles(local_hour)
+def _local_hour_default(element, compiler, **kw):
+    col, _ = _args(element, compiler, **kw)
+    return f"CAST(strftime('%H', {col}) AS INTEGER)"
+
+
+@compiles(local_hour, "postgresql")
+def _local_hour_pg(element, compiler, **kw):
+    col, tz = _args(element, compiler, **kw)
+    return f"CAST(EXTRACT(HOUR FROM timezone({tz}, {col})) AS INTEGER)"
+
+
+class hours_between(FunctionElement):
+    """`hours_between(Shift.start_at, Shift.end_at)`: duration in (fractional) hours."""
+    type = Float()
+    inherit_cache = True
+    name = "hours_between"
+
+
+@compiles(hours_between)
+def _hours_between_default(element, compiler, **kw):
+    start, end = _args(element, compiler, **kw)
+    return f"((julianday({end}) - julianday({start})) * 24.0)"
+
+
+@compiles(hours_between, "postgresql")
+def _hours_between_pg(element, compiler, **kw):
+    start, end = _args(element, compiler, **kw)
+    return f"(EXTRACT(EPOCH FROM ({end} - {start})) / 3600.0)"
+
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, UniqueConstraint
 from core.database import Base
 
 class Employee(Base):
@@ -13,7 +13,14 @@ class Employee(Base):
 
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
 
+    # secret in the employee's iCalendar feed URL; rotating it revokes old links
+    calendar_token: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     # relationships
     user = relationship("User", back_populates="employee")
     org = relationship("Organization", back_populates="employees")
     assignments = relationship("Assignment", back_populates="employee", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        UniqueConstraint("calendar_token", name="uq_employees_calendar_token"),
+    )
@@ -2,6 +2,10 @@ from typing import Optional, List
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from .models import Employee
+from organization.service import bump_ref_seq
+from schedule.service import bump_change_seq
+from shift.models import Shift
+from assignment.models import Assignment
 from .schema import EmployeeCreate, EmployeeUpdate
 
 def get_employees(db: Session, *, org_id: int) -> List[Employee]:
@@ -18,6 +22,7 @@ def get_employee_for_org(db: Session, employee_id: int, org_id: int) -> Optional
 def create_employee(db: Session, employee: EmployeeCreate) -> Employee:
     db_employee = Employee(org_id = employee.org_id, display_name = employee.display_name)
     db.add(db_employee)
+    bump_ref_seq(db, db_employee.org_id)
     db.commit()
     db.refresh(db_employee)
     return db_employee
@@ -29,6 +34,7 @@ def update_employee(db: Session, employee_id: int, patch: EmployeeUpdate) -> Opt
     data = patch.model_dump(exclude_unset=True)
     for k,v in data.items():
         setattr(db_employee, k, v)
+    bump_ref_seq(db, db_employee.org_id)
     db.commit()
     db.refresh(db_employee)
     return db_employee
@@ -36,6 +42,9 @@ def update_employee(db: Session, employee_id: int, patch: EmployeeUpdate) -> Opt
 def delete_employee(db: Session, employee_id: int) -> None:
     db_employee = db.get(Employee, employee_id)
     if db_employee:
+        bump_ref_seq(db, db_employee.org_id)
+        # their assignments go with them (cascade), which changes those schedules
+        bump_change_seq(db, select(Shift.schedule_id).join(Assignment, Assignment.shift_id == Shift.id).where(Assignment.employee_id == employee_id))
         db.delete(db_employee)
         db.commit()
     return
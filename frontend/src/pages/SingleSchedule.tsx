@@ -35,28 +35,22 @@ export default function SingleSchedule() {
       const token = getTokenOrThrow()
       const headers = { Authorization: `Bearer ${token}` }
 
-      const [schedRes, shiftsRes, assignmentsRes, employeesRes] =
-        await Promise.all([
-          fetch(`${API_BASE_URL}/schedules/${scheduleId}`, { headers }),
-          fetch(`${API_BASE_URL}/shifts?schedule_id=${scheduleId}`, {
-            headers,
-          }),
-          fetch(`${API_BASE_URL}/assignments`, { headers }),
-          fetch(`${API_BASE_URL}/employees`, { headers }),
-        ])
-
-      if (!schedRes.ok) throw new Error(await schedRes.text())
-      if (!shiftsRes.ok) throw new Error(await shiftsRes.text())
-      if (!assignmentsRes.ok) throw new Error(await assignmentsRes.text())
-      if (!employeesRes.ok) throw new Error(await employeesRes.text())
-
-      const schedJson = (await schedRes.json()) as Schedule
-      const shiftsJson = (await shiftsRes.json()) as Shift[]
-      const assignmentsJson = (await assignmentsRes.json()) as {
-        shift_id: number
-        employee_id: number
-      }[]
-      const employeesJson = (await employeesRes.json()) as Employee[]
+      const res = await fetch(
+        `${API_BASE_URL}/schedules/${scheduleId}/bundle`,
+        { headers },
+      )
+      if (!res.ok) throw new Error(await res.text())
+
+      const bundle = (await res.json()) as {
+        schedule: Schedule
+        shifts: Shift[]
+        assignments: { shift_id: number; employee_id: number }[]
+        employees: Employee[]
+      }
+      const schedJson = bundle.schedule
+      const shiftsJson = bundle.shifts
+      const assignmentsJson = bundle.assignments
+      const employeesJson = bundle.employees
 
       setSchedule(schedJson)
 
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 from .models import JobRole
+from organization.service import bump_ref_seq
 from .schemas import JobRoleCreate, JobRoleUpdate
 
 def get_jobroles(db: Session, *, org_id: int) -> List[JobRole]:
@@ -20,6 +21,7 @@ def get_jobrole_for_org(db: Session, jobrole_id: int, org_id: int) -> Optional[J
 def create_jobrole(db: Session, role: JobRoleCreate) -> JobRole:
     db_role = JobRole(org_id=role.org_id, name=role.name, weekly_hours_cap=role.weekly_hours_cap)
     db.add(db_role)
+    bump_ref_seq(db, db_role.org_id)
     db.commit()
     db.refresh(db_role)
     return db_role
@@ -32,6 +34,7 @@ def update_jobrole(db: Session, jobrole_id: int, patch: JobRoleUpdate) -> JobRol
     for k, v in data.items():
         setattr(db_role, k, v)
     try:
+        bump_ref_seq(db, db_role.org_id)
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -42,6 +45,7 @@ def update_jobrole(db: Session, jobrole_id: int, patch: JobRoleUpdate) -> JobRol
 def delete_jobrole(db: Session, jobrole_id: int) -> None:
     db_role = db.get(JobRole, jobrole_id)
     if db_role:
+        bump_ref_seq(db, db_role.org_id)
         db.delete(db_role)
         db.commit()
     return
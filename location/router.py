@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from auth.services.auth_service import get_current_active_user
+from core.etag import make_etag, etag_headers, etag_matches, not_modified
+from organization import service as org_service
 from .schemas import LocationSchema, LocationCreatePayload, LocationCreate, LocationUpdate
 from . import service
 
@@ -11,7 +13,11 @@ location_router = APIRouter(prefix="/locations", tags=["Locations"])
 
 # List all locations
 @location_router.get("", response_model=list[LocationSchema])
-def list_locations(db: Session = Depends(get_db), user=Depends(get_current_active_user)):
+def list_locations(request: Request, response: Response, db: Session = Depends(get_db), user=Depends(get_current_active_user)):
+    etag = make_etag("r", user.org_id, org_service.get_ref_seq(db, user.org_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
     return service.get_locations(db, org_id=user.org_id)
 
 # Get location by id
@@ -2,6 +2,9 @@ from typing import Optional, List
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from .models import Location
+from organization.service import bump_ref_seq
+from schedule.service import bump_change_seq
+from shift.models import Shift
 from .schemas import LocationCreate, LocationUpdate
 
 def get_locations(db: Session, *, org_id: int) -> List[Location]:
@@ -18,6 +21,7 @@ def get_location_for_org(db: Session, location_id: int, org_id: int) -> Optional
 def create_location(db: Session, loc: LocationCreate) -> Location:
     db_loc = Location(org_id=loc.org_id, name=loc.name)
     db.add(db_loc)
+    bump_ref_seq(db, db_loc.org_id)
     db.commit()
     db.refresh(db_loc)
     return db_loc
@@ -29,6 +33,7 @@ def update_location(db: Session, location_id: int, patch: LocationUpdate) -> Opt
     data = patch.model_dump(exclude_unset=True)
     for k, v in data.items():
         setattr(db_loc, k, v)
+    bump_ref_seq(db, db_loc.org_id)
     db.commit()
     db.refresh(db_loc)
     return db_loc
@@ -36,6 +41,9 @@ def update_location(db: Session, location_id: int, patch: LocationUpdate) -> Opt
 def delete_location(db: Session, location_id: int) -> None:
     db_loc = db.get(Location, location_id)
     if db_loc:
+        bump_ref_seq(db, db_loc.org_id)
+        # shifts at this location are set to NULL location (FK SET NULL)
+        bump_change_seq(db, select(Shift.schedule_id).where(Shift.location_id == location_id))
         db.delete(db_loc)
         db.commit()
     return
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 from core.config_loader import settings
+from core.pagination import NEXT_CURSOR_HEADER
 
 from auth.routes.auth_router import auth_router
 from user.router import user_router
@@ -14,6 +15,7 @@ from unavailability.router import unavailability_router
 from assignment.router import assignment_router
 from schedule.router import schedule_router
 from weeklytemplate.router import weeklytemplate_router
+from me.router import me_router
 
 import models_bootstrap 
 
@@ -39,6 +41,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 app.include_router(auth_router, prefix="/api")
@@ -53,6 +56,7 @@ app.include_router(unavailability_router, prefix="/api")
 app.include_router(assignment_router, prefix="/api")
 app.include_router(schedule_router, prefix="/api")
 app.include_router(weeklytemplate_router, prefix="/api")
+app.include_router(me_router, prefix="/api")
 
 
 
@@ -0,0 +1,63 @@
+"""Minimal RFC 5545 writer for the employee shift feed."""
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+
+
+def _utc(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    # content lines are limited to 75 octets; continuation lines start with a space
+    raw = line.encode()
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, chunk = [], b""
+    for ch in line:
+        enc = ch.encode()
+        if len(chunk) + len(enc) > (75 if not parts else 74):
+            parts.append(chunk.decode())
+            chunk = b""
+        chunk += enc
+    parts.append(chunk.decode())
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def iter_calendar(shifts: Iterable[dict], *, name: str, stamp: datetime) -> Iterator[bytes]:
+    """Yield the feed a VEVENT at a time so large feeds never sit in memory as one string."""
+    yield (
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//VaktaPlan//Shifts//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        + _fold(f"X-WR-CALNAME:{_text(name)}")
+    ).encode()
+    dtstamp = _utc(stamp)
+    for s in shifts:
+        summary = s.get("role_name") or "Shift"
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:shift-{s['id']}@vaktaplan",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART:{_utc(s['start_at'])}",
+            f"DTEND:{_utc(s['end_at'])}",
+            f"SUMMARY:{_text(summary)}",
+        ]
+        if s.get("location_name"):
+            lines.append(f"LOCATION:{_text(s['location_name'])}")
+        if s.get("notes"):
+            lines.append(f"DESCRIPTION:{_text(s['notes'])}")
+        lines.append("END:VEVENT")
+        yield "".join(_fold(line) for line in lines).encode()
+    yield b"END:VCALENDAR\r\n"
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from core.database import get_db
+from auth.services.auth_service import get_current_active_user
+from core.etag import make_etag, etag_headers, etag_matches, not_modified
+from .schema import MyShiftSchema, CalendarTokenSchema
+from .ics import ICS_MEDIA_TYPE, iter_calendar
+from . import service
+
+me_router = APIRouter(prefix="/me", tags=["Me"])
+
+# Caller's own shifts in published schedules
+@me_router.get("/shifts", response_model=list[MyShiftSchema])
+def my_shifts(
+    start: Optional[datetime] = Query(None, alias="from", description="Shifts ending after (default: now)"),
+    end: Optional[datetime] = Query(None, alias="to", description="Shifts starting before"),
+    limit: int = Query(200, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    ):
+    emp = service.get_employee_for_user(db, user_id=user.id, org_id=user.org_id)
+    return service.get_my_shifts(
+        db,
+        employee_id=emp.id,
+        start=start or datetime.now(timezone.utc),
+        end=end,
+        limit=limit,
+    )
+
+# New secret feed URL for the caller; the previous one stops working
+@me_router.post("/calendar-token", response_model=CalendarTokenSchema)
+def rotate_calendar_token(
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    ):
+    emp = service.get_employee_for_user(db, user_id=user.id, org_id=user.org_id)
+    token = service.rotate_calendar_token(db, emp)
+    return {"token": token, "path": f"/api/me/calendar/{token}.ics"}
+
+# iCalendar feed; no auth header (calendar apps can't send one), the token is the credential
+@me_router.get("/calendar/{token}.ics")
+def calendar_feed(token: str, request: Request, db: Session = Depends(get_db)):
+    emp = service.get_employee_by_calendar_token(db, token)
+    if not emp:
+        raise HTTPException(status_code=404, detail="calendar not found")
+
+    now = datetime.now(timezone.utc)
+    # the window slides with the date, so a feed with no writes still changes daily
+    etag = make_etag("ics", emp.id, now.date().isoformat(), *service.get_feed_version(db, org_id=emp.org_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # rows are fetched now (the session closes before streaming); text is produced lazily
+    shifts = service.get_feed_shifts(db, employee_id=emp.id, now=now)
+    return StreamingResponse(
+        iter_calendar(shifts, name=emp.display_name, stamp=now),
+        media_type=ICS_MEDIA_TYPE,
+        headers=etag_headers(etag),
+    )
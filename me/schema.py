@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class MyShiftSchema(BaseModel):
+    id: int
+    schedule_id: int
+    start_at: datetime
+    end_at: datetime
+    role_id: Optional[int] = None
+    role_name: Optional[str] = None
+    location_id: Optional[int] = None
+    location_name: Optional[str] = None
+    notes: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CalendarTokenSchema(BaseModel):
+    token: str
+    path: str
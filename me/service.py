@@ -0,0 +1,101 @@
+from __future__ import annotations
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from assignment.models import Assignment
+from employee.models import Employee
+from jobrole.models import JobRole
+from location.models import Location
+from organization.models import Organization
+from schedule.models import Schedule, ScheduleStatus
+from shift.models import Shift
+
+# ICS feed window around "now"
+FEED_PAST = timedelta(days=30)
+FEED_FUTURE = timedelta(days=365)
+
+
+def get_employee_for_user(db: Session, *, user_id: int, org_id: int) -> Employee:
+    emp = db.scalars(
+        select(Employee).where(Employee.user_id == user_id, Employee.org_id == org_id)
+    ).first()
+    if not emp:
+        raise HTTPException(status_code=404, detail="no employee profile linked to this user")
+    return emp
+
+
+def get_employee_by_calendar_token(db: Session, token: str) -> Optional[Employee]:
+    return db.scalars(select(Employee).where(Employee.calendar_token == token)).first()
+
+
+def rotate_calendar_token(db: Session, emp: Employee) -> str:
+    emp.calendar_token = secrets.token_urlsafe(32)
+    db.commit()
+    return emp.calendar_token
+
+
+def get_my_shifts(
+    db: Session,
+    *,
+    employee_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    ) -> list[dict]:
+    """
+    Shifts the employee is assigned to in published schedules, soonest first.
+    Walks ix_assignments_employee_shift to the shift ids, then the shifts
+    primary key. start/end select shifts overlapping the window, so one that
+    is in progress at `start` is still listed.
+    """
+    stmt = (
+        select(
+            Shift.id,
+            Shift.schedule_id,
+            Shift.start_at,
+            Shift.end_at,
+            Shift.role_id,
+            JobRole.name.label("role_name"),
+            Shift.location_id,
+            Location.name.label("location_name"),
+            Shift.notes,
+        )
+        .select_from(Assignment)
+        .join(Shift, Shift.id == Assignment.shift_id)
+        .join(Schedule, Schedule.id == Shift.schedule_id)
+        .outerjoin(JobRole, JobRole.id == Shift.role_id)
+        .outerjoin(Location, Location.id == Shift.location_id)
+        .where(Assignment.employee_id == employee_id, Schedule.status == ScheduleStatus.published)
+        .order_by(Shift.start_at, Shift.id)
+    )
+    if start is not None:
+        stmt = stmt.where(Shift.end_at > start)
+    if end is not None:
+        stmt = stmt.where(Shift.start_at < end)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def get_feed_shifts(db: Session, *, employee_id: int, now: Optional[datetime] = None) -> list[dict]:
+    now = now or datetime.now(timezone.utc)
+    return get_my_shifts(db, employee_id=employee_id, start=now - FEED_PAST, end=now + FEED_FUTURE)
+
+
+def get_feed_version(db: Session, *, org_id: int) -> tuple:
+    """
+    Cheap validator for an employee's feed: published schedules only change
+    through writes that bump their change_seq, and names come from the org's
+    ref_seq. One aggregate over the org's (small) schedules table.
+    """
+    count, seq_sum, max_id = db.execute(
+        select(func.count(), func.coalesce(func.sum(Schedule.change_seq), 0), func.coalesce(func.max(Schedule.id), 0))
+        .where(Schedule.org_id == org_id, Schedule.status == ScheduleStatus.published)
+    ).one()
+    ref_seq = db.scalar(select(Organization.ref_seq).where(Organization.id == org_id)) or 0
+    return count, seq_sum, max_id, ref_seq
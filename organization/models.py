@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String
+from sqlalchemy import String, Integer
 from core.database import Base
 
 class Organization(Base):
@@ -9,6 +9,9 @@ class Organization(Base):
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     timezone: Mapped[str] = mapped_column(String(64), nullable=False, default="Atlantic/Reykjavik")
 
+    # bumped by every employee/job role/location write; ETag for those lists
+    ref_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     # relationships
     users = relationship("User", back_populates="org", cascade="all, delete") 
     employees = relationship("Employee", back_populates="org", cascade="all, delete-orphan")
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 
@@ -14,6 +14,18 @@ def list_organizations(db: Session) -> List[Organization]:
 def get_organization(db: Session, org_id: int) -> Optional[Organization]:
     return db.get(Organization, org_id)
 
+def bump_ref_seq(db: Session, org_id: int) -> None:
+    """Increment the org's reference-data counter in the caller's transaction."""
+    db.execute(
+        update(Organization)
+        .where(Organization.id == org_id)
+        .values(ref_seq=Organization.ref_seq + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def get_ref_seq(db: Session, org_id: int) -> Optional[int]:
+    return db.scalar(select(Organization.ref_seq).where(Organization.id == org_id))
+
 def create_organization(db: Session, dto: OrganizationCreate) -> Organization:
     org = Organization(name=dto.name, timezone=dto.timezone or "Atlantic/Reykjavik")
     db.add(org)
@@ -0,0 +1,115 @@
+"""
+Archiving: move a schedule's shifts and assignments out of the hot tables
+into shifts_archive / assignments_archive, a batch at a time, each batch in
+its own transaction so locks stay short and memory flat.
+
+Runs as a background task from POST /schedules/{id}/archive, or from the
+command line for old ranges:
+
+    python -m schedule.archive_service --ended-before 2025-01-01
+"""
+from __future__ import annotations
+import argparse
+import json
+from datetime import date
+from typing import Callable
+
+from sqlalchemy import select, insert, delete, update
+from sqlalchemy.orm import Session
+
+from assignment.models import Assignment, AssignmentArchive
+from shift.models import Shift, ShiftArchive
+from .models import Schedule, ScheduleStatus
+from . import snapshot_service
+
+ARCHIVE_BATCH_SIZE = 2000
+
+_SHIFT_COLUMNS = [
+    "id", "org_id", "schedule_id", "location_id", "role_id",
+    "start_at", "end_at", "required_staff_count", "notes", "source_shift_id",
+]
+
+
+def _archive_batch(db: Session, schedule_id: int, batch_size: int) -> int:
+    ids = db.scalars(
+        select(Shift.id).where(Shift.schedule_id == schedule_id).order_by(Shift.id).limit(batch_size)
+    ).all()
+    if not ids:
+        return 0
+    db.execute(
+        insert(ShiftArchive).from_select(
+            _SHIFT_COLUMNS,
+            select(*(getattr(Shift, c) for c in _SHIFT_COLUMNS)).where(Shift.id.in_(ids)),
+        )
+    )
+    db.execute(
+        insert(AssignmentArchive).from_select(
+            ["shift_id", "employee_id"],
+            select(Assignment.shift_id, Assignment.employee_id).where(Assignment.shift_id.in_(ids)),
+        )
+    )
+    db.execute(delete(Assignment).where(Assignment.shift_id.in_(ids)))
+    db.execute(delete(Shift).where(Shift.id.in_(ids)))
+    db.commit()
+    return len(ids)
+
+
+def archive_schedule(
+    session_factory: Callable[[], Session],
+    schedule_id: int,
+    *,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> dict:
+    """Archive one schedule with its own session; returns the number of shifts moved."""
+    db = session_factory()
+    try:
+        moved = 0
+        while n := _archive_batch(db, schedule_id, batch_size):
+            moved += n
+        db.execute(
+            update(Schedule)
+            .where(Schedule.id == schedule_id)
+            .values(status=ScheduleStatus.archived, change_seq=Schedule.change_seq + 1)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    snapshot_service.invalidate(schedule_id)
+    return {"schedule_id": schedule_id, "shifts_archived": moved}
+
+
+def archive_schedules_ended_before(
+    session_factory: Callable[[], Session],
+    ended_before: date,
+    *,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> list[dict]:
+    db = session_factory()
+    try:
+        ids = db.scalars(
+            select(Schedule.id)
+            .where(Schedule.range_end < ended_before, Schedule.status != ScheduleStatus.archived)
+            .order_by(Schedule.id)
+        ).all()
+    finally:
+        db.close()
+    return [archive_schedule(session_factory, sid, batch_size=batch_size) for sid in ids]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Archive schedules whose range ended before a date.")
+    parser.add_argument("--ended-before", type=date.fromisoformat, required=True, help="YYYY-MM-DD")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    from core.database import SessionLocal
+    import models_bootstrap  # noqa: F401  (register all mappers)
+    results = archive_schedules_ended_before(SessionLocal, args.ended_before, batch_size=args.batch_size)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import calendar
+from datetime import date, datetime, time, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import select, func, case
+from sqlalchemy.orm import Session
+
+from core.timebuckets import local_date
+from organization.models import Organization
+from shift.models import Shift
+from .coverage_service import assigned_counts
+from .models import Schedule
+
+DEFAULT_PER_DAY = 5
+
+
+def parse_month(value: str) -> date:
+    """'YYYY-MM' -> first day of that month."""
+    try:
+        year, month = value.split("-")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="month must be YYYY-MM")
+
+
+def get_month_calendar(
+    db: Session,
+    *,
+    schedule_id: int,
+    org_id: int,
+    month: date,
+    per_day: int = DEFAULT_PER_DAY,
+    ) -> dict:
+    """
+    One bucket per day of `month` (org timezone) with shift count, seats and
+    coverage ratio, plus the first `per_day` shifts of the day and how many
+    more there are. Day totals come from window functions over the month's
+    shifts, so the whole month is one query whatever the shifts per day.
+    """
+    tz = db.scalar(
+        select(Organization.timezone)
+        .join(Schedule, Schedule.org_id == Organization.id)
+        .where(Schedule.id == schedule_id, Schedule.org_id == org_id)
+    )
+    if tz is None:
+        raise HTTPException(status_code=404, detail="schedule not found")
+
+    days_in_month = calendar.monthrange(month.year, month.month)[1]
+    next_month = month + timedelta(days=days_in_month)
+
+    # a day either side in UTC keeps the start_at index usable; local_date does the exact cut
+    lo = datetime.combine(month - timedelta(days=1), time.min, tzinfo=timezone.utc)
+    hi = datetime.combine(next_month + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    counts = assigned_counts(schedule_id=schedule_id, org_id=org_id, start=lo, end=hi)
+
+    assigned = func.coalesce(counts.c.assigned, 0)
+    required = Shift.required_staff_count
+    filled = case((assigned > required, required), else_=assigned)
+    day = local_date(Shift.start_at, tz)
+    per = {"partition_by": day}
+
+    ranked = (
+        select(
+            day.label("day"),
+            Shift.id,
+            Shift.start_at,
+            Shift.end_at,
+            Shift.role_id,
+            Shift.location_id,
+            required.label("required"),
+            assigned.label("assigned"),
+            func.row_number().over(order_by=(Shift.start_at, Shift.id), **per).label("rn"),
+            func.count().over(**per).label("day_shifts"),
+            func.sum(required).over(**per).label("day_required"),
+            func.sum(assigned).over(**per).label("day_assigned"),
+            func.sum(filled).over(**per).label("day_filled"),
+        )
+        .select_from(Shift)
+        .outerjoin(counts, counts.c.shift_id == Shift.id)
+        .where(
+            Shift.schedule_id == schedule_id,
+            Shift.org_id == org_id,
+            Shift.start_at >= lo,
+            Shift.start_at < hi,
+            day >= month,
+            day < next_month,
+        )
+        .subquery()
+    )
+    rows = db.execute(
+        select(ranked).where(ranked.c.rn <= per_day).order_by(ranked.c.day, ranked.c.rn)
+    ).mappings()
+
+    days = {
+        month + timedelta(days=i): {
+            "day": month + timedelta(days=i),
+            "shifts": 0, "required": 0, "assigned": 0, "coverage": None,
+            "items": [], "more": 0,
+        }
+        for i in range(days_in_month)
+    }
+    for row in rows:
+        bucket = days[row["day"]]
+        if not bucket["items"]:
+            bucket.update(
+                shifts=row["day_shifts"],
+                required=row["day_required"],
+                assigned=row["day_assigned"],
+                coverage=round(row["day_filled"] / row["day_required"], 3) if row["day_required"] else None,
+                more=row["day_shifts"] - min(row["day_shifts"], per_day),
+            )
+        bucket["items"].append({
+            k: row[k] for k in ("id", "start_at", "end_at", "role_id", "location_id", "required", "assigned")
+        })
+    return {"schedule_id": schedule_id, "month": month.strftime("%Y-%m"), "days": list(days.values())}
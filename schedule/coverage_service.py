@@ -0,0 +1,110 @@
+from __future__ import annotations
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, func, case
+from sqlalchemy.orm import Session
+
+from core.timebuckets import local_date, local_hour
+from assignment.models import Assignment
+from organization.models import Organization
+from shift.models import Shift
+from .models import Schedule
+
+COVERAGE_GROUPS = ("role", "location", "hour")
+
+
+def assigned_counts(*, schedule_id: int, org_id: int, start=None, end=None):
+    """
+    Assignments per shift as a (shift_id, assigned) subquery, aggregated over
+    this schedule's shifts only; start/end further bound Shift.start_at.
+    """
+    stmt = (
+        select(Assignment.shift_id, func.count().label("assigned"))
+        .join(Shift, Shift.id == Assignment.shift_id)
+        .where(Shift.schedule_id == schedule_id, Shift.org_id == org_id)
+        .group_by(Assignment.shift_id)
+    )
+    if start is not None:
+        stmt = stmt.where(Shift.start_at >= start)
+    if end is not None:
+        stmt = stmt.where(Shift.start_at < end)
+    return stmt.subquery()
+
+
+def get_coverage(
+    db: Session,
+    *,
+    schedule_id: int,
+    org_id: int,
+    group_by: Optional[list[str]] = None,
+    include_unfilled: bool = False,
+    ) -> dict:
+    """
+    Required vs assigned seats for a schedule, aggregated in SQL per local day
+    (org timezone) and optionally per role/location/start hour. Filled seats
+    are capped at required_staff_count, so over-staffing one shift does not
+    hide a gap in another.
+    """
+    tz = db.scalar(
+        select(Organization.timezone)
+        .join(Schedule, Schedule.org_id == Organization.id)
+        .where(Schedule.id == schedule_id, Schedule.org_id == org_id)
+    )
+    if tz is None:
+        raise HTTPException(status_code=404, detail="schedule not found")
+
+    group_by = group_by or []
+    counts = assigned_counts(schedule_id=schedule_id, org_id=org_id)
+    assigned = func.coalesce(counts.c.assigned, 0)
+    required = Shift.required_staff_count
+    filled = case((assigned > required, required), else_=assigned)
+
+    keys = [local_date(Shift.start_at, tz).label("day")]
+    if "role" in group_by:
+        keys.append(Shift.role_id.label("role_id"))
+    if "location" in group_by:
+        keys.append(Shift.location_id.label("location_id"))
+    if "hour" in group_by:
+        keys.append(local_hour(Shift.start_at, tz).label("hour"))
+
+    stmt = (
+        select(
+            *keys,
+            func.count().label("shifts"),
+            func.sum(required).label("required"),
+            func.sum(assigned).label("assigned"),
+            func.sum(required - filled).label("open"),
+            func.sum(case((assigned < required, 1), else_=0)).label("understaffed_shifts"),
+        )
+        .select_from(Shift)
+        .outerjoin(counts, counts.c.shift_id == Shift.id)
+        .where(Shift.schedule_id == schedule_id, Shift.org_id == org_id)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+    buckets = [dict(row) for row in db.execute(stmt).mappings()]
+
+    totals = {
+        name: sum(b[name] for b in buckets)
+        for name in ("shifts", "required", "assigned", "open", "understaffed_shifts")
+    }
+    result = {"schedule_id": schedule_id, "buckets": buckets, "totals": totals, "unfilled": None}
+
+    if include_unfilled:
+        unfilled = (
+            select(
+                Shift.id,
+                Shift.start_at,
+                Shift.end_at,
+                Shift.role_id,
+                Shift.location_id,
+                required.label("required_staff_count"),
+                assigned.label("assigned"),
+            )
+            .outerjoin(counts, counts.c.shift_id == Shift.id)
+            .where(Shift.schedule_id == schedule_id, Shift.org_id == org_id, assigned < required)
+            .order_by(Shift.start_at, Shift.id)
+        )
+        result["unfilled"] = [dict(row) for row in db.execute(unfilled).mappings()]
+    return result
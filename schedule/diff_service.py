@@ -0,0 +1,142 @@
+from __future__ import annotations
+from typing import Callable, Iterator
+
+from fastapi import HTTPException
+from sqlalchemy import select, func, and_, exists
+from sqlalchemy.orm import Session, aliased
+
+from assignment.models import Assignment
+from shift.models import Shift
+from .models import Schedule
+
+# shifts are the "same" across versions when these match
+MATCH_KEY = ("start_at", "end_at", "role_id", "location_id")
+_COMPARED = ("required_staff_count", "notes")
+_FIELDS = ("id", *MATCH_KEY, *_COMPARED)
+BATCH_SIZE = 500
+
+
+def _numbered(schedule_id: int):
+    """Shifts of one schedule, numbered within each match key so duplicates pair up one-to-one."""
+    # plain equality on every key column keeps hash/merge joins available on
+    # PostgreSQL (IS NOT DISTINCT FROM would force a nested loop)
+    loc_key = func.coalesce(Shift.location_id, 0)
+    key = [Shift.start_at, Shift.end_at, Shift.role_id, loc_key]
+    return (
+        select(
+            *(getattr(Shift, c) for c in _FIELDS),
+            loc_key.label("loc_key"),
+            func.row_number().over(partition_by=key, order_by=Shift.id).label("n"),
+        )
+        .where(Shift.schedule_id == schedule_id)
+        .subquery()
+    )
+
+
+def _same_slot(a, b):
+    return and_(
+        a.c.start_at == b.c.start_at,
+        a.c.end_at == b.c.end_at,
+        a.c.role_id == b.c.role_id,
+        a.c.loc_key == b.c.loc_key,
+        a.c.n == b.c.n,
+    )
+
+
+def _prefixed(sub, prefix: str):
+    return [getattr(sub.c, c).label(f"{prefix}{c}") for c in _FIELDS]
+
+
+def _unprefixed(row, prefix: str) -> dict:
+    return {c: row[f"{prefix}{c}"] for c in _FIELDS}
+
+
+def check_schedules(db: Session, *, a_id: int, b_id: int, org_id: int) -> None:
+    """404 unless both schedules belong to the org; run before the response starts."""
+    found = set(db.scalars(
+        select(Schedule.id).where(Schedule.org_id == org_id, Schedule.id.in_([a_id, b_id]))
+    ))
+    if found != {a_id, b_id}:
+        raise HTTPException(status_code=404, detail="schedule not found")
+
+
+def _diff_queries(a_id: int, b_id: int):
+    """(kind, statement, row -> record fields) for each kind of difference, in output order."""
+    a = _numbered(a_id)
+    b = _numbered(b_id)
+
+    def only_in(left, right):
+        return (
+            select(*left.c)
+            .select_from(left.outerjoin(right, _same_slot(left, right)))
+            .where(right.c.id.is_(None))
+            .order_by(left.c.start_at, left.c.id)
+        )
+
+    changed = (
+        select(*_prefixed(a, "a_"), *_prefixed(b, "b_"))
+        .join_from(a, b, _same_slot(a, b))
+        .where(
+            (a.c.required_staff_count != b.c.required_staff_count)
+            | a.c.notes.is_distinct_from(b.c.notes)
+        )
+        .order_by(a.c.start_at, a.c.id)
+    )
+
+    pairs = (
+        select(a.c.id.label("a_id"), b.c.id.label("b_id"))
+        .join_from(a, b, _same_slot(a, b))
+        .subquery()
+    )
+
+    def assignments_only_in(this_side, other_side):
+        mine, theirs = aliased(Assignment), aliased(Assignment)
+        return (
+            select(mine.shift_id, mine.employee_id)
+            .join(pairs, this_side == mine.shift_id)
+            .where(~exists().where(
+                theirs.shift_id == other_side,
+                theirs.employee_id == mine.employee_id,
+            ))
+            .order_by(mine.shift_id, mine.employee_id)
+        )
+
+    shift = lambda row: {c: row[c] for c in _FIELDS}
+    return [
+        ("shifts_added", only_in(b, a), shift),
+        ("shifts_removed", only_in(a, b), shift),
+        ("shifts_changed", changed, lambda row: {"a": _unprefixed(row, "a_"), "b": _unprefixed(row, "b_")}),
+        ("assignments_added", assignments_only_in(pairs.c.b_id, pairs.c.a_id), dict),
+        ("assignments_removed", assignments_only_in(pairs.c.a_id, pairs.c.b_id), dict),
+    ]
+
+
+def iter_diff_records(
+    session_factory: Callable[[], Session],
+    *,
+    a_id: int,
+    b_id: int,
+    batch_size: int = BATCH_SIZE,
+    ) -> Iterator[dict]:
+    """
+    NDJSON records for the differences from schedule `a` to schedule `b`: one
+    line per difference, then a summary line with the counts. Shifts match
+    on (start, end, role, location); a matched pair with different
+    staffing/notes is "changed", and assignments are compared only within
+    matched pairs (those of added or removed shifts go with the shift).
+
+    Each anti-join is read in `batch_size` chunks as the client consumes the
+    stream, so memory stays flat whatever the schedule size. The generator
+    owns its session: the request's session is closed before a streamed
+    body is sent. Check access with check_schedules first.
+    """
+    counts = {}
+    with session_factory() as db:
+        for kind, stmt, to_record in _diff_queries(a_id, b_id):
+            what, change = kind.split("_")
+            n = 0
+            for row in db.execute(stmt.execution_options(yield_per=batch_size)).mappings():
+                n += 1
+                yield {"type": what[:-1], "change": change, **to_record(row)}
+            counts[kind] = n
+    yield {"type": "summary", "a": a_id, "b": b_id, **counts}
@@ -2,7 +2,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from enum import Enum
 from typing import List
-from sqlalchemy import Date, DateTime, Integer, String, Enum as SAEnum, ForeignKey, UniqueConstraint
+from sqlalchemy import Date, DateTime, Integer, String, LargeBinary, Enum as SAEnum, ForeignKey, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from core.database import Base
 from weeklytemplate.models import WeeklyTemplate
@@ -27,11 +27,35 @@ class Schedule(Base):
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_by: Mapped[int | None] = mapped_column(ForeignKey("users.id"), index=True)
 
+    # last day the rolling horizon job has generated shifts for
+    generated_through: Mapped[date | None] = mapped_column(Date(), nullable=True)
+
+    # bumped in the same transaction as every write to the schedule's shifts,
+    # assignments or template; read endpoints use it as their ETag
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     # relationships
-    shifts = relationship("Shift", back_populates="schedule", cascade="all, delete-orphan")
+    # passive_deletes: deleting a schedule leaves shifts/assignments to ON DELETE CASCADE
+    shifts = relationship("Shift", back_populates="schedule", cascade="all, delete-orphan", passive_deletes=True)
     weeklytemplate: Mapped[List["WeeklyTemplate"]] = relationship("WeeklyTemplate", back_populates="schedule", cascade="all, delete-orphan", passive_deletes=True)
 
 
     __table_args__ = (
         UniqueConstraint("org_id", "range_start", "range_end", "version", name="uq_schedule_range_version"),
         )
+
+
+class ScheduleSnapshot(Base):
+    """
+    Gzipped JSON of a published schedule (shifts, assignments, employee names),
+    written at publish time and rebuilt on read if change_seq has moved on.
+    """
+    __tablename__ = "schedule_snapshots"
+
+    schedule_id: Mapped[int] = mapped_column(ForeignKey("schedules.id", ondelete="CASCADE"), primary_key=True)
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    # strong validator: sha256 of the uncompressed JSON
+    etag: Mapped[str] = mapped_column(String(80), nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
@@ -1,26 +1,50 @@
 from __future__ import annotations
+import gzip
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from core.database import get_db
+from core.database import get_db, SessionLocal
 from auth.services.auth_service import get_current_active_user
 from authz.deps import require_manager
+from core.etag import make_etag, etag_headers, etag_matches, not_modified
+from organization import service as org_service
 
-from .schema import ScheduleSchema, ScheduleCreatePayload, ScheduleCreate, ScheduleUpdate
+from core.pagination import parse_fields
+from core.fastjson import ndjson_response
+
+from .schema import (
+    ScheduleSchema,
+    ScheduleWithStatsSchema,
+    ScheduleBundleSchema,
+    CoverageSchema,
+    MonthCalendarSchema,
+    PublishedScheduleSchema,
+    ScheduleCreatePayload,
+    ScheduleClonePayload,
+    ScheduleCreate,
+    ScheduleUpdate,
+    )
 from . import service 
+from . import coverage_service
+from . import calendar_service
+from . import snapshot_service
+from . import diff_service
+from . import archive_service
+from .coverage_service import COVERAGE_GROUPS
 
 schedule_router = APIRouter(prefix="/schedules", tags=["Schedules"])
 
 # List (scoped to caller's org)
-@schedule_router.get("", response_model=list[ScheduleSchema])
+@schedule_router.get("", response_model=list[ScheduleWithStatsSchema])
 def list_schedules(
     active_on: Optional[date] = Query(None, description="Return schedules covering this date"),
     start_from: Optional[date] = Query(None, description="range_start >= start_from"),
     end_to: Optional[date] = Query(None, description="range_end <= end_to"),
+    include_stats: bool = Query(False, description="Add shift count, required/assigned seats and hours per schedule"),
     db: Session = Depends(get_db),
     user = Depends(get_current_active_user),
     ):
@@ -30,6 +54,7 @@ def list_schedules(
         active_on=active_on,
         start_from=start_from,
         end_to=end_to,
+        include_stats=include_stats,
     )
 
 # Get by id (scoped)
@@ -44,6 +69,111 @@ def get_schedule(
         raise HTTPException(status_code=404, detail="schedule not found")
     return obj
 
+# Schedule + shifts + assignments + referenced employees/roles/locations in one response
+@schedule_router.get("/{schedule_id}/bundle", response_model=ScheduleBundleSchema)
+def get_schedule_bundle(
+    schedule_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    ):
+    seq = service.get_change_seq(db, schedule_id=schedule_id, org_id=user.org_id)
+    if seq is None:
+        raise HTTPException(status_code=404, detail="schedule not found")
+    # bundle also carries employees/roles/locations, so the org counter is part of the tag
+    etag = make_etag("b", schedule_id, seq, org_service.get_ref_seq(db, user.org_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return service.get_schedule_bundle(db, schedule_id=schedule_id, org_id=user.org_id)
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if Accept-Encoding allows gzip with q > 0, explicitly or via `*`."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.strip().lower()] = q
+    return weights.get("gzip", weights.get("*", 0.0)) > 0
+
+# Published schedule for employees, served from its pre-rendered snapshot
+@schedule_router.get("/{schedule_id}/published", response_model=PublishedScheduleSchema)
+def get_published_schedule(
+    schedule_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    ):
+    etag, body = snapshot_service.get_published_snapshot(db, schedule_id=schedule_id, org_id=user.org_id)
+    gzipped = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    if gzipped:
+        # the compressed bytes are a different representation, so a different strong tag
+        etag = etag[:-1] + '-gzip"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = {**etag_headers(etag), "Vary": "Accept-Encoding"}
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = gzip.decompress(body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Added/removed/changed shifts and assignments from one version to another, as NDJSON
+@schedule_router.get("/{schedule_id}/diff/{other_id}")
+def diff_schedules(
+    schedule_id: int,
+    other_id: int,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    ):
+    diff_service.check_schedules(db, a_id=schedule_id, b_id=other_id, org_id=user.org_id)
+    # the generator opens its own session: this request's one is closed before the body streams
+    return ndjson_response(diff_service.iter_diff_records(SessionLocal, a_id=schedule_id, b_id=other_id))
+
+# Required vs assigned seats per day (optionally per role/location/hour)
+@schedule_router.get("/{schedule_id}/coverage", response_model=CoverageSchema)
+def get_schedule_coverage(
+    schedule_id: int,
+    by: Optional[str] = Query(None, description="Comma-separated extra grouping: role, location, hour"),
+    include_unfilled: bool = Query(False, description="Also list shifts with open seats"),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    ):
+    return coverage_service.get_coverage(
+        db,
+        schedule_id=schedule_id,
+        org_id=user.org_id,
+        group_by=parse_fields(by, set(COVERAGE_GROUPS)),
+        include_unfilled=include_unfilled,
+    )
+
+# Month view: per-day buckets with the first few shifts of each day
+@schedule_router.get("/{schedule_id}/calendar", response_model=MonthCalendarSchema)
+def get_schedule_calendar(
+    schedule_id: int,
+    month: str = Query(..., description="YYYY-MM"),
+    per_day: int = Query(calendar_service.DEFAULT_PER_DAY, ge=1, le=50, description="Shift summaries per day"),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    ):
+    return calendar_service.get_month_calendar(
+        db,
+        schedule_id=schedule_id,
+        org_id=user.org_id,
+        month=calendar_service.parse_month(month),
+        per_day=per_day,
+    )
+
 # Create (manager only)
 @schedule_router.post("", response_model=ScheduleSchema, status_code=status.HTTP_201_CREATED)
 def create_schedule(
@@ -69,6 +199,32 @@ def create_schedule(
             detail="schedule already exists for this range and version",
         )
 
+# Clone into the next version for the same range (manager only)
+@schedule_router.post("/{schedule_id}/clone", response_model=ScheduleSchema, status_code=status.HTTP_201_CREATED)
+def clone_schedule(
+    schedule_id: int,
+    payload: Optional[ScheduleClonePayload] = None,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    _mgr = Depends(require_manager),
+    ):
+    payload = payload or ScheduleClonePayload()
+    try:
+        return service.clone_schedule(
+            db,
+            schedule_id=schedule_id,
+            org_id=user.org_id,
+            created_by=user.id,
+            name=payload.name,
+            include_assignments=payload.include_assignments,
+        )
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="schedule already exists for this range and version",
+        )
+
 # Delete (manager only)
 @schedule_router.delete("/{schedule_id}")
 def delete_schedule(
@@ -83,6 +239,21 @@ def delete_schedule(
     service.delete_schedule(db, schedule_id)
     return {"message": "schedule deleted"}
 
+# Move shifts/assignments to the archive tables in the background (manager only)
+@schedule_router.post("/{schedule_id}/archive", status_code=status.HTTP_202_ACCEPTED)
+def archive_schedule(
+    schedule_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    _mgr = Depends(require_manager),
+    ):
+    obj = service.get_schedule_for_org(db, schedule_id, user.org_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="schedule not found")
+    background_tasks.add_task(archive_service.archive_schedule, SessionLocal, schedule_id)
+    return {"message": "schedule archiving started", "schedule_id": schedule_id}
+
 # Publish schedule (manager only)
 @schedule_router.post("/{schedule_id}/publish", response_model=ScheduleSchema, status_code=status.HTTP_200_OK)
 def publish_schedule(
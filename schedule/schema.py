@@ -2,6 +2,11 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Optional
 from pydantic import BaseModel, ConfigDict, Field, model_validator
+from shift.schemas import ShiftSchema
+from assignment.schema import AssignmentSchema
+from employee.schema import EmployeeSchema
+from jobrole.schemas import JobRoleSchema
+from location.schemas import LocationSchema
 from .models import ScheduleStatus
 
 class ScheduleSchema(BaseModel):
@@ -14,8 +19,94 @@ class ScheduleSchema(BaseModel):
     status: ScheduleStatus
     created_by: Optional[int] = None
     published_at: Optional[datetime] = None
+    generated_through: Optional[date] = None
+    change_seq: int = 0
     model_config = ConfigDict(from_attributes=True)
 
+class ScheduleStats(BaseModel):
+    shift_count: int
+    required_seats: int
+    assigned_seats: int
+    hours: float
+
+class ScheduleWithStatsSchema(ScheduleSchema):
+    stats: Optional[ScheduleStats] = None
+
+class ScheduleBundleSchema(BaseModel):
+    schedule: ScheduleSchema
+    shifts: list[ShiftSchema]
+    assignments: list[AssignmentSchema]
+    employees: list[EmployeeSchema]
+    roles: list[JobRoleSchema]
+    locations: list[LocationSchema]
+
+class SnapshotEmployee(BaseModel):
+    id: int
+    display_name: str
+
+# Body of GET /schedules/{id}/published, rendered once per change_seq
+class PublishedScheduleSchema(BaseModel):
+    schedule: ScheduleSchema
+    shifts: list[ShiftSchema]
+    assignments: list[AssignmentSchema]
+    employees: list[SnapshotEmployee]
+
+class CoverageBucket(BaseModel):
+    day: date
+    role_id: Optional[int] = None
+    location_id: Optional[int] = None
+    hour: Optional[int] = None
+    shifts: int
+    required: int
+    assigned: int
+    open: int
+    understaffed_shifts: int
+
+class CoverageTotals(BaseModel):
+    shifts: int
+    required: int
+    assigned: int
+    open: int
+    understaffed_shifts: int
+
+class UnfilledShift(BaseModel):
+    id: int
+    start_at: datetime
+    end_at: datetime
+    role_id: Optional[int] = None
+    location_id: Optional[int] = None
+    required_staff_count: int
+    assigned: int
+
+class CoverageSchema(BaseModel):
+    schedule_id: int
+    buckets: list[CoverageBucket]
+    totals: CoverageTotals
+    unfilled: Optional[list[UnfilledShift]] = None
+
+class CalendarShift(BaseModel):
+    id: int
+    start_at: datetime
+    end_at: datetime
+    role_id: Optional[int] = None
+    location_id: Optional[int] = None
+    required: int
+    assigned: int
+
+class CalendarDay(BaseModel):
+    day: date
+    shifts: int
+    required: int
+    assigned: int
+    coverage: Optional[float] = None
+    items: list[CalendarShift]
+    more: int
+
+class MonthCalendarSchema(BaseModel):
+    schedule_id: int
+    month: str
+    days: list[CalendarDay]
+
 class ScheduleCreatePayload(BaseModel):
     name: str = Field(..., description="Name for this schedule")
     range_start: date = Field(..., description="Inclusive start date of the schedule window")
@@ -29,6 +120,11 @@ class ScheduleCreatePayload(BaseModel):
             raise ValueError("start must be on or before end")
         return self
 
+class ScheduleClonePayload(BaseModel):
+    name: Optional[str] = Field(None, description="Defaults to the source schedule's name")
+    include_assignments: bool = Field(True, description="Also copy who is assigned to each shift")
+    model_config = ConfigDict(extra="forbid")
+
 class ScheduleCreate(BaseModel):
     org_id: int
     name: str
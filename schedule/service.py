@@ -3,11 +3,19 @@ from datetime import date, datetime, timezone
 from typing import Optional, List
 
 from fastapi import HTTPException
-from sqlalchemy import select, func, and_
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func, and_, update, insert, delete, literal, Integer
+from sqlalchemy.orm import Session, selectinload, noload, aliased
 
+from core.timebuckets import hours_between
+from shift.models import Shift
+from assignment.models import Assignment
+from weeklytemplate.models import WeeklyTemplate
+from employee.models import Employee
+from jobrole.models import JobRole
+from location.models import Location
 from .models import Schedule, ScheduleStatus
 from .schema import ScheduleCreate, ScheduleUpdate
+from . import snapshot_service
 
 def get_schedules(
     db: Session,
@@ -16,7 +24,13 @@ def get_schedules(
     active_on: Optional[date] = None,
     start_from: Optional[date] = None,
     end_to: Optional[date] = None,
-    ) -> List[Schedule]:
+    include_stats: bool = False,
+    ) -> List[Schedule] | list[dict]:
+    """
+    Schedules of an org, newest range first. With include_stats each row is
+    a dict carrying a `stats` entry (shift count, required/assigned seats,
+    hours) from one grouped subquery joined to the list.
+    """
     stmt = select(Schedule).where(Schedule.org_id == org_id)
     if active_on is not None:
         stmt = stmt.where(and_(Schedule.range_start <= active_on, Schedule.range_end >= active_on))
@@ -25,12 +39,106 @@ def get_schedules(
     if end_to is not None:
         stmt = stmt.where(Schedule.range_end <= end_to)
     stmt = stmt.order_by(Schedule.range_start.desc(), Schedule.version.desc())
-    return list(db.scalars(stmt))
+    if not include_stats:
+        return list(db.scalars(stmt))
+
+    stats = _schedule_stats(org_id)
+    stmt = stmt.add_columns(*(func.coalesce(c, 0).label(c.name) for c in stats.c if c.name != "schedule_id"))
+    stmt = stmt.outerjoin(stats, stats.c.schedule_id == Schedule.id)
+    columns = [attr.key for attr in Schedule.__mapper__.column_attrs]
+    return [
+        {
+            **{key: getattr(sched, key) for key in columns},
+            "stats": {
+                "shift_count": shift_count,
+                "required_seats": required_seats,
+                "assigned_seats": assigned_seats,
+                "hours": round(hours, 2),
+            },
+        }
+        for sched, shift_count, required_seats, assigned_seats, hours in db.execute(stmt)
+    ]
+
+def _schedule_stats(org_id: int):
+    """Per-schedule shift/seat/hour totals for one org, as a subquery keyed by schedule_id."""
+    assigned = (
+        select(Assignment.shift_id, func.count().label("n"))
+        .join(Shift, Shift.id == Assignment.shift_id)
+        .where(Shift.org_id == org_id)
+        .group_by(Assignment.shift_id)
+        .subquery()
+    )
+    return (
+        select(
+            Shift.schedule_id,
+            func.count(Shift.id).label("shift_count"),
+            func.sum(Shift.required_staff_count).label("required_seats"),
+            func.sum(func.coalesce(assigned.c.n, 0)).label("assigned_seats"),
+            func.sum(hours_between(Shift.start_at, Shift.end_at)).label("hours"),
+        )
+        .outerjoin(assigned, assigned.c.shift_id == Shift.id)
+        .where(Shift.org_id == org_id)
+        .group_by(Shift.schedule_id)
+        .subquery()
+    )
 
 def get_schedule_for_org(db: Session, schedule_id: int, org_id: int) -> Schedule | None:
     stmt = select(Schedule).where(Schedule.id == schedule_id, Schedule.org_id == org_id)
     return db.scalars(stmt).first()
 
+def bump_change_seq(db: Session, schedule_ids) -> None:
+    """
+    Increment change_seq for the given schedules (ids or a select of ids) in
+    the caller's transaction, so the bump commits or rolls back with the write.
+    """
+    if isinstance(schedule_ids, (list, set, tuple)) and not schedule_ids:
+        return
+    db.execute(
+        update(Schedule)
+        .where(Schedule.id.in_(schedule_ids))
+        .values(change_seq=Schedule.change_seq + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def get_change_seq(db: Session, *, schedule_id: int, org_id: int) -> int | None:
+    return db.scalar(
+        select(Schedule.change_seq).where(Schedule.id == schedule_id, Schedule.org_id == org_id)
+    )
+
+def get_schedule_bundle(db: Session, *, schedule_id: int, org_id: int) -> dict:
+    """
+    Schedule + its shifts, assignments and the employees/roles/locations they
+    reference, in a fixed number of queries regardless of schedule size.
+    - 404 if schedule not found or belongs to another org
+    """
+    sched = get_schedule_for_org(db, schedule_id, org_id)
+    if not sched:
+        raise HTTPException(status_code=404, detail="schedule not found")
+
+    shifts = list(db.scalars(
+        select(Shift)
+        .where(Shift.schedule_id == schedule_id)
+        .options(selectinload(Shift.assignments), noload(Shift.location))
+        .order_by(Shift.start_at, Shift.id)
+    ))
+    assignments = [a for sh in shifts for a in sh.assignments]
+
+    def _by_ids(model, ids: set[int]) -> list:
+        if not ids:
+            return []
+        return list(db.scalars(
+            select(model).where(model.org_id == org_id, model.id.in_(ids)).order_by(model.id)
+        ))
+
+    return {
+        "schedule": sched,
+        "shifts": shifts,
+        "assignments": assignments,
+        "employees": _by_ids(Employee, {a.employee_id for a in assignments}),
+        "roles": _by_ids(JobRole, {sh.role_id for sh in shifts if sh.role_id is not None}),
+        "locations": _by_ids(Location, {sh.location_id for sh in shifts if sh.location_id is not None}),
+    }
+
 def next_version_for_range(db: Session, *, org_id: int, start: date, end: date) -> int:
     maxv = db.scalar(
         select(func.max(Schedule.version)).where(
@@ -62,17 +170,86 @@ def create_schedule(db: Session, dto: ScheduleCreate) -> Schedule:
     db.refresh(row)
     return row
 
+def clone_schedule(
+    db: Session,
+    *,
+    schedule_id: int,
+    org_id: int,
+    created_by: int,
+    name: Optional[str] = None,
+    include_assignments: bool = True,
+    ) -> Schedule:
+    """
+    Copy a schedule into the next draft version for the same range. Template
+    rows, shifts and (optionally) assignments are copied with INSERT ... SELECT
+    in one transaction; new shifts record their source_shift_id so
+    assignments can be remapped onto them in SQL.
+    """
+    src = get_schedule_for_org(db, schedule_id, org_id)
+    if not src:
+        raise HTTPException(status_code=404, detail="schedule not found")
+
+    row = Schedule(
+        org_id=org_id,
+        name=name or src.name,
+        range_start=src.range_start,
+        range_end=src.range_end,
+        version=next_version_for_range(db, org_id=org_id, start=src.range_start, end=src.range_end),
+        created_by=created_by,
+        status=ScheduleStatus.draft,
+        published_at=None,
+        generated_through=src.generated_through,
+    )
+    db.add(row)
+    db.flush()
+    new_id = literal(row.id, Integer)
+
+    tpl_cols = ["weekday", "location_id", "role_id", "start_time", "end_time", "required_staff_count", "notes"]
+    db.execute(
+        insert(WeeklyTemplate).from_select(
+            ["org_id", "schedule_id", *tpl_cols],
+            select(WeeklyTemplate.org_id, new_id, *(getattr(WeeklyTemplate, c) for c in tpl_cols))
+            .where(WeeklyTemplate.schedule_id == src.id),
+        )
+    )
+
+    shift_cols = ["location_id", "role_id", "start_at", "end_at", "required_staff_count", "notes"]
+    db.execute(
+        insert(Shift).from_select(
+            ["org_id", "schedule_id", *shift_cols, "source_shift_id"],
+            select(Shift.org_id, new_id, *(getattr(Shift, c) for c in shift_cols), Shift.id)
+            .where(Shift.schedule_id == src.id),
+        )
+    )
+
+    if include_assignments:
+        copy = aliased(Shift)
+        db.execute(
+            insert(Assignment).from_select(
+                ["shift_id", "employee_id"],
+                select(copy.id, Assignment.employee_id)
+                .join(copy, copy.source_shift_id == Assignment.shift_id)
+                .where(copy.schedule_id == row.id),
+            )
+        )
+
+    db.commit()
+    db.refresh(row)
+    return row
+
 def delete_schedule(db: Session, schedule_id: int) -> None:
-    row = db.get(Schedule, schedule_id)
-    if row:
-        db.delete(row)
-        db.commit()
+    # single DELETE; shifts, assignments, template rows and the snapshot go
+    # with it through ON DELETE CASCADE instead of being loaded by the ORM
+    db.execute(delete(Schedule).where(Schedule.id == schedule_id))
+    db.commit()
+    snapshot_service.invalidate(schedule_id)
 
 def publish_schedule(db: Session, *,schedule_id: int, org_id: int,) -> Schedule:
     """
     Mark a schedule as published for the given org.
     - 404 if schedule not found or belongs to another org
     - if it is already published, just return it
+    - the published snapshot is rendered in the same transaction
     """
     sched = db.get(Schedule, schedule_id)
     if not sched or sched.org_id != org_id:
@@ -81,6 +258,9 @@ def publish_schedule(db: Session, *,schedule_id: int, org_id: int,) -> Schedule:
     if sched.status != ScheduleStatus.published:
         sched.status = ScheduleStatus.published
         sched.published_at = datetime.now(timezone.utc)
+        bump_change_seq(db, [sched.id])
+        db.refresh(sched, ["change_seq"])
+        snapshot_service.materialize_snapshot(db, sched)
         db.commit()
         db.refresh(sched)
 
@@ -98,7 +278,9 @@ def update_schedule(
     data = patch.model_dump(exclude_unset=True, exclude_none=True)
     for k, v in data.items():
         setattr(db_sched, k, v)
+    bump_change_seq(db, [db_sched.id])
     db.commit()
+    snapshot_service.invalidate(schedule_id)
     db.refresh(db_sched)
     return db_sched
 
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from assignment.models import Assignment
+from employee.models import Employee
+from shift.models import Shift
+from .models import Schedule, ScheduleSnapshot, ScheduleStatus
+from .schema import PublishedScheduleSchema, ScheduleSchema
+
+_SHIFT_COLUMNS = [
+    Shift.id, Shift.org_id, Shift.schedule_id, Shift.location_id, Shift.role_id,
+    Shift.start_at, Shift.end_at, Shift.notes, Shift.required_staff_count,
+]
+
+# schedule_id -> (change_seq, etag, gzipped body); per process, validated
+# against schedules.change_seq on every read so workers never serve stale data
+CACHE_SIZE = 64
+_cache: OrderedDict[int, tuple[int, str, bytes]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(schedule_id: int):
+    with _cache_lock:
+        entry = _cache.get(schedule_id)
+        if entry is not None:
+            _cache.move_to_end(schedule_id)
+        return entry
+
+
+def _cache_put(schedule_id: int, entry: tuple[int, str, bytes]) -> None:
+    with _cache_lock:
+        _cache[schedule_id] = entry
+        _cache.move_to_end(schedule_id)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def invalidate(schedule_id: int) -> None:
+    with _cache_lock:
+        _cache.pop(schedule_id, None)
+
+
+def _render(db: Session, sched: Schedule) -> bytes:
+    shifts = db.execute(
+        select(*_SHIFT_COLUMNS)
+        .where(Shift.schedule_id == sched.id)
+        .order_by(Shift.start_at, Shift.id)
+    ).mappings().all()
+    assignments = db.execute(
+        select(Assignment.shift_id, Assignment.employee_id)
+        .join(Shift, Shift.id == Assignment.shift_id)
+        .where(Shift.schedule_id == sched.id)
+        .order_by(Assignment.shift_id, Assignment.employee_id)
+    ).mappings().all()
+    employees = db.execute(
+        select(Employee.id, Employee.display_name)
+        .where(Employee.id.in_({a["employee_id"] for a in assignments}))
+        .order_by(Employee.id)
+    ).mappings().all() if assignments else []
+    # validated once per publish/change, so the full model round-trip is fine here
+    snapshot = PublishedScheduleSchema(
+        schedule=ScheduleSchema.model_validate(sched),
+        shifts=[dict(r) for r in shifts],
+        assignments=[dict(r) for r in assignments],
+        employees=[dict(r) for r in employees],
+    )
+    return snapshot.model_dump_json().encode()
+
+
+def materialize_snapshot(db: Session, sched: Schedule) -> ScheduleSnapshot:
+    """Render and store the snapshot for `sched` at its current change_seq; caller commits."""
+    body = _render(db, sched)
+    snap = db.get(ScheduleSnapshot, sched.id)
+    if snap is None:
+        snap = ScheduleSnapshot(schedule_id=sched.id)
+        db.add(snap)
+    snap.change_seq = sched.change_seq
+    snap.etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+    snap.body = gzip.compress(body)
+    return snap
+
+
+def get_published_snapshot(db: Session, *, schedule_id: int, org_id: int) -> tuple[str, bytes]:
+    """
+    (etag, gzipped JSON) for a published schedule. Served from the process
+    cache, then the stored snapshot; only rebuilt if the schedule changed
+    since it was rendered.
+    """
+    row = db.execute(
+        select(Schedule.status, Schedule.change_seq)
+        .where(Schedule.id == schedule_id, Schedule.org_id == org_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="schedule not found")
+    if row.status != ScheduleStatus.published:
+        raise HTTPException(status_code=404, detail="schedule not published")
+
+    cached = _cache_get(schedule_id)
+    if cached is not None and cached[0] == row.change_seq:
+        return cached[1], cached[2]
+
+    snap = db.get(ScheduleSnapshot, schedule_id)
+    if snap is None or snap.change_seq != row.change_seq:
+        try:
+            snap = materialize_snapshot(db, db.get(Schedule, schedule_id))
+            entry = (snap.change_seq, snap.etag, snap.body)
+            db.commit()
+        except IntegrityError:
+            # a concurrent first read stored it first; use theirs, or update it if already stale
+            db.rollback()
+            snap = db.get(ScheduleSnapshot, schedule_id)
+            if snap.change_seq != row.change_seq:
+                snap = materialize_snapshot(db, db.get(Schedule, schedule_id))
+                entry = (snap.change_seq, snap.etag, snap.body)
+                db.commit()
+            else:
+                entry = (snap.change_seq, snap.etag, snap.body)
+    else:
+        entry = (snap.change_seq, snap.etag, snap.body)
+    _cache_put(schedule_id, entry)
+    return entry[1], entry[2]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import Integer, DateTime, Text, ForeignKey, Index
+from sqlalchemy import Integer, DateTime, Text, ForeignKey, Index, func, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from core.database import Base
 
@@ -40,6 +40,10 @@ class Shift(Base):
 
     notes: Mapped[str | None] = mapped_column(Text(), nullable=True)
 
+    # shift this row was copied from by a schedule clone; plain column (no FK)
+    # so deleting the source version never touches its clones
+    source_shift_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     # relationships
     schedule: Mapped["Schedule"] = relationship("Schedule", back_populates="shifts")
     location: Mapped["Location | None"] = relationship("Location", lazy="joined", passive_deletes=True)
@@ -49,3 +53,37 @@ class Shift(Base):
 
 Index("ix_shifts_org_start", Shift.org_id, Shift.start_at)
 Index("ix_shifts_schedule_start", Shift.schedule_id, Shift.start_at)
+
+# GiST over the [start_at, end_at) range for `&&` overlap lookups (see core.ranges).
+# PostgreSQL only; needs btree_gist for the leading integer column.
+_during = func.tstzrange(Shift.start_at, Shift.end_at, literal_column("'[)'"))
+Index("ix_shifts_org_during", Shift.org_id, _during, postgresql_using="gist").ddl_if(dialect="postgresql")
+Index("ix_shifts_schedule_during", Shift.schedule_id, _during, postgresql_using="gist").ddl_if(dialect="postgresql")
+
+# Trigram GIN for notes search (ILIKE '%tag%' and word_similarity), PostgreSQL only
+Index(
+    "ix_shifts_notes_trgm",
+    Shift.notes,
+    postgresql_using="gin",
+    postgresql_ops={"notes": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+
+class ShiftArchive(Base):
+    """
+    Cold copy of shifts moved out of `shifts` by schedule archiving
+    (see schedule.archive_service). Same columns, original ids kept.
+    """
+    __tablename__ = "shifts_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    org_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), index=True)
+    schedule_id: Mapped[int] = mapped_column(ForeignKey("schedules.id", ondelete="CASCADE"), index=True)
+    location_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    role_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    required_staff_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    notes: Mapped[str | None] = mapped_column(Text(), nullable=True)
+    source_shift_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,32 +1,117 @@
 from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from typing import Optional, Literal
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from core.database import get_db
 from auth.services.auth_service import get_current_active_user
-from .schemas import ShiftSchema, ShiftCreatePayload, ShiftCreate, ShiftUpdate
+from core.fastjson import rows_response
+from core.columnar import wants_columnar, to_columns, columnar_response
+from core.etag import make_etag, etag_headers, etag_matches, not_modified
+from core.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, encode_cursor, decode_cursor, parse_fields
+from .schemas import (
+    ShiftSchema,
+    ShiftRow,
+    ShiftCreatePayload,
+    ShiftCreate,
+    ShiftUpdate,
+    ShiftBatchRequest,
+    ShiftBatchResult,
+    )
 from shift import service
+from schedule import service as schedule_service
+from organization import service as org_service
 
 shift_router = APIRouter(prefix="/shifts", tags=["Shifts"])
 
+SHIFT_FIELDS = list(ShiftSchema.model_fields)
+_shift_rows = TypeAdapter(list[ShiftRow])
+
 @shift_router.get("", response_model=list[ShiftSchema])
 def list_shifts(
+    request: Request,
     schedule_id: Optional[int] = Query(None, description="Filter by schedule"),
     location_id: Optional[int] = None,
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
     notes: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables keyset pagination"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of shift fields"),
+    fmt: Optional[Literal["json", "columnar"]] = Query(None, alias="format", description="columnar: one array per field plus role/location lookups"),
     db: Session = Depends(get_db),
     user = Depends(get_current_active_user),
     ):
-    return service.get_shifts(
-        db,
+    columnar = wants_columnar(request, fmt)
+    headers = {"Vary": "Accept"}
+    if schedule_id is not None:
+        # schedule-scoped lists are versioned by the schedule's change counter;
+        # a matching If-None-Match skips the list query entirely
+        seq = schedule_service.get_change_seq(db, schedule_id=schedule_id, org_id=user.org_id)
+        if seq is not None:
+            parts = ("s", schedule_id, seq)
+            if columnar:
+                # columnar bodies carry name lookups, so renames must change the tag too
+                parts += ("c", org_service.get_ref_seq(db, user.org_id))
+            etag = make_etag(*parts)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            headers.update(etag_headers(etag))
+
+    selected = parse_fields(fields, set(SHIFT_FIELDS))
+    after = decode_cursor(cursor) if cursor else None
+    if after is not None and limit is None:
+        limit = MAX_PAGE_SIZE
+    filters = dict(
         org_id=user.org_id,
         schedule_id=schedule_id,
         location_id=location_id,
         start=start,
         end=end,
         notes=notes,
+        after=after,
+        # one extra row tells us whether another page exists
+        limit=limit + 1 if limit is not None else None,
+    )
+
+    # Core column select + cached TypeAdapter: no ORM hydration, no per-row validation.
+    # The cursor needs start_at/id even when the caller did not ask for them.
+    columns = list(dict.fromkeys([*(selected or SHIFT_FIELDS), "start_at", "id"]))
+    rows = service.get_shift_fields(db, fields=columns, **filters)
+
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1]["start_at"], rows[-1]["id"])
+
+    if columnar:
+        names = selected or SHIFT_FIELDS
+        lookups = service.get_shift_lookups(
+            db,
+            org_id=user.org_id,
+            role_ids={r["role_id"] for r in rows if r.get("role_id") is not None},
+            location_ids={r["location_id"] for r in rows if r.get("location_id") is not None},
+        )
+        columns = to_columns(rows, names, epoch=("start_at", "end_at"))
+        return columnar_response(columns, count=len(rows), lookups=lookups, headers=headers)
+
+    if selected is not None:
+        rows = [{name: row[name] for name in selected} for row in rows]
+    return rows_response(_shift_rows, rows, headers=headers)
+
+@shift_router.get("/search", response_model=list[ShiftSchema])
+def search_shifts(
+    q: str = Query(..., min_length=2, max_length=100, description="Text to look for in shift notes"),
+    schedule_id: Optional[int] = Query(None, description="Restrict to one schedule"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    ):
+    return service.search_shifts_by_notes(
+        db,
+        org_id=user.org_id,
+        q=q,
+        schedule_id=schedule_id,
+        limit=limit,
     )
 
 @shift_router.get("/{shift_id}", response_model=ShiftSchema)
@@ -41,6 +126,11 @@ def create_shift(payload: ShiftCreatePayload, db: Session = Depends(get_db), use
     internal = ShiftCreate(org_id=user.org_id, **payload.model_dump())
     return service.create_shift(db, internal)
 
+# Creates/updates/deletes in one transaction; any invalid op rejects the whole batch (422)
+@shift_router.post("/batch", response_model=list[ShiftBatchResult])
+def batch_shifts(payload: ShiftBatchRequest, db: Session = Depends(get_db), user = Depends(get_current_active_user)):
+    return service.apply_shift_batch(db, org_id=user.org_id, ops=payload.ops)
+
 @shift_router.patch("/{shift_id}", response_model=ShiftSchema)
 def patch_shift(shift_id: int, payload: ShiftUpdate, db: Session = Depends(get_db), user = Depends(get_current_active_user)):
     if not service.get_shift_for_org(db, shift_id, user.org_id):
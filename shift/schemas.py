@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal, Union, Annotated
+from typing_extensions import TypedDict
 from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 
 class ShiftSchema(BaseModel):
@@ -15,6 +16,20 @@ class ShiftSchema(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Plain-dict shape of ShiftSchema for list endpoints that serialize Core rows
+# directly (no ORM objects, no per-row validation). total=False: fields= may
+# project any subset.
+class ShiftRow(TypedDict, total=False):
+    id: int
+    org_id: int
+    schedule_id: int
+    location_id: Optional[int]
+    role_id: Optional[int]
+    start_at: datetime
+    end_at: datetime
+    notes: Optional[str]
+    required_staff_count: int
+
 class ShiftCreatePayload(BaseModel):
     schedule_id: int
     location_id: Optional[int] = None
@@ -64,3 +79,37 @@ class ShiftUpdate(BaseModel):
         if self.start_at is not None and self.end_at is not None and self.start_at >= self.end_at:
             raise ValueError("start_at must be before end_at")
         return self
+
+# POST /shifts/batch: one list of create/update/delete ops, applied all-or-nothing
+class ShiftBatchCreate(BaseModel):
+    op: Literal["create"]
+    shift: ShiftCreatePayload
+
+    model_config = ConfigDict(extra="forbid")
+
+class ShiftBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    patch: ShiftUpdate
+
+    model_config = ConfigDict(extra="forbid")
+
+class ShiftBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+    model_config = ConfigDict(extra="forbid")
+
+ShiftBatchOp = Annotated[
+    Union[ShiftBatchCreate, ShiftBatchUpdate, ShiftBatchDelete],
+    Field(discriminator="op"),
+]
+
+class ShiftBatchRequest(BaseModel):
+    ops: list[ShiftBatchOp] = Field(..., min_length=1, max_length=500)
+
+class ShiftBatchResult(BaseModel):
+    index: int
+    op: Literal["create", "update", "delete"]
+    id: int
+    status: Literal["created", "updated", "deleted"]
@@ -1,28 +1,35 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import select, or_, func, insert, update, delete
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from core.ranges import overlaps
 from .models import Shift
-from .schemas import ShiftCreate, ShiftUpdate
+from assignment.models import Assignment
+from schedule.models import Schedule
+from jobrole.models import JobRole
+from location.models import Location
+from schedule.service import bump_change_seq
+from .schemas import ShiftCreate, ShiftUpdate, ShiftBatchCreate, ShiftBatchUpdate, ShiftBatchDelete, ShiftBatchOp
 
 def get_shift(db: Session, shift_id: int) -> Shift | None:
     return db.get(Shift, shift_id)
 
-def get_shifts(
-    db: Session,
+def _filter_shifts(
+    stmt,
     *,
     org_id: Optional[int] = None,
     schedule_id: Optional[int] = None,
     location_id: Optional[int] = None,
-    role_id: Optional[int] = None, 
+    role_id: Optional[int] = None,
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
     notes: Optional[str] = None,
-    ) -> list[Shift]:
-    stmt = select(Shift)
+    after: Optional[tuple[datetime, int]] = None,
+    limit: Optional[int] = None,
+    ):
     if org_id is not None:
         stmt = stmt.where(Shift.org_id == org_id)
     if schedule_id is not None:
@@ -31,14 +38,102 @@ def get_shifts(
         stmt = stmt.where(Shift.location_id == location_id)
     if role_id is not None:
         stmt = stmt.where(Shift.role_id == role_id)
-    if start is not None:
+    if start is not None and end is not None:
+        stmt = stmt.where(overlaps(Shift.start_at, Shift.end_at, start, end))
+    elif start is not None:
         stmt = stmt.where(Shift.end_at > start)    # overlaps window
-    if end is not None:
+    elif end is not None:
         stmt = stmt.where(Shift.start_at < end)    # overlaps window
     if notes:
         stmt = stmt.where(Shift.notes.ilike(f"%{notes}%"))
+    if after is not None:
+        # keyset: (start_at, id) > cursor; the leading start_at >= bound lets
+        # ix_shifts_org_start / ix_shifts_schedule_start range-scan from the cursor
+        after_start, after_id = after
+        stmt = stmt.where(
+            Shift.start_at >= after_start,
+            or_(Shift.start_at > after_start, Shift.id > after_id),
+        )
     stmt = stmt.order_by(Shift.start_at, Shift.id)
-    return list(db.scalars(stmt))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+def get_shift_fields(
+    db: Session,
+    *,
+    fields: list[str],
+    org_id: Optional[int] = None,
+    schedule_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+    role_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    notes: Optional[str] = None,
+    after: Optional[tuple[datetime, int]] = None,
+    limit: Optional[int] = None,
+    ) -> list[dict]:
+    """Filtered, keyset-ordered shift listing as plain dicts of the named columns."""
+    columns = [getattr(Shift, name) for name in fields]
+    stmt = _filter_shifts(
+        select(*columns),
+        org_id=org_id,
+        schedule_id=schedule_id,
+        location_id=location_id,
+        role_id=role_id,
+        start=start,
+        end=end,
+        notes=notes,
+        after=after,
+        limit=limit,
+    )
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+def get_shift_lookups(
+    db: Session,
+    *,
+    org_id: int,
+    role_ids: set[int],
+    location_ids: set[int],
+    ) -> dict[str, dict[int, str]]:
+    """id -> name tables for the roles/locations a page of shifts references."""
+    roles = dict(db.execute(
+        select(JobRole.id, JobRole.name).where(JobRole.org_id == org_id, JobRole.id.in_(role_ids))
+    ).all()) if role_ids else {}
+    locations = dict(db.execute(
+        select(Location.id, Location.name).where(Location.org_id == org_id, Location.id.in_(location_ids))
+    ).all()) if location_ids else {}
+    return {"roles": roles, "locations": locations}
+
+def search_shifts_by_notes(
+    db: Session,
+    *,
+    org_id: int,
+    q: str,
+    schedule_id: Optional[int] = None,
+    limit: int = 50,
+    ) -> list[Shift]:
+    """
+    Notes search, best match first. On PostgreSQL both the substring match and
+    the fuzzy word-similarity match (`notes %> q`) are served by
+    ix_shifts_notes_trgm and ranked by word_similarity; elsewhere it is a
+    plain ILIKE, newest first.
+    """
+    q = q.strip()
+    stmt = select(Shift).where(Shift.org_id == org_id, Shift.notes.is_not(None))
+    if schedule_id is not None:
+        stmt = stmt.where(Shift.schedule_id == schedule_id)
+
+    # autoescape: a "%" or "_" typed by the user is matched literally
+    substring = Shift.notes.icontains(q, autoescape=True)
+    if db.get_bind().dialect.name == "postgresql":
+        rank = func.word_similarity(q, Shift.notes)
+        stmt = stmt.where(or_(substring, Shift.notes.op("%>")(q))).order_by(
+            rank.desc(), Shift.start_at.desc(), Shift.id
+        )
+    else:
+        stmt = stmt.where(substring).order_by(Shift.start_at.desc(), Shift.id)
+    return list(db.scalars(stmt.limit(limit)))
 
 def create_shift(db: Session, shift: ShiftCreate) -> Shift:
     row = Shift(
@@ -57,6 +152,7 @@ def create_shift(db: Session, shift: ShiftCreate) -> Shift:
         raise HTTPException(status_code=422, detail="required_staff_count must be >= 1")
 
     db.add(row)
+    bump_change_seq(db, [row.schedule_id])
     db.commit()
     db.refresh(row)
     return row
@@ -77,9 +173,12 @@ def update_shift(db: Session, shift_id: int, patch: ShiftUpdate) -> Shift:
         if data["required_staff_count"] < 1:
             raise HTTPException(status_code=422, detail="required_staff_count must be >= 1")
 
+    touched = {row.schedule_id}
     for k, v in data.items():
         setattr(row, k, v)
+    touched.add(row.schedule_id)
 
+    bump_change_seq(db, touched)
     db.commit()
     db.refresh(row)
     return row
@@ -87,9 +186,112 @@ def update_shift(db: Session, shift_id: int, patch: ShiftUpdate) -> Shift:
 def delete_shift(db: Session, shift_id: int) -> None:
     row = db.get(Shift, shift_id)
     if row:
+        bump_change_seq(db, [row.schedule_id])
         db.delete(row)
         db.commit()
 
 def get_shift_for_org(db: Session, shift_id: int, org_id: int) -> Optional[Shift]:
     stmt = select(Shift).where(Shift.id == shift_id, Shift.org_id == org_id)
-    return db.scalars(stmt).first()
\ No newline at end of file
+    return db.scalars(stmt).first()
+
+_NOT_NULL = ("schedule_id", "role_id", "start_at", "end_at", "required_staff_count")
+_BATCH_STATUS = {"create": "created", "update": "updated", "delete": "deleted"}
+
+def _owned_ids(db: Session, column, org_column, org_id: int, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(org_column == org_id, column.in_(ids))))
+
+def apply_shift_batch(db: Session, *, org_id: int, ops: list[ShiftBatchOp]) -> list[dict]:
+    """
+    Validate every op up front, then apply creates/updates/deletes with one
+    bulk statement each and a single commit. Any invalid op rejects the whole
+    batch with 422 and a per-index error list; nothing is written.
+    """
+    target_ids = [op.id for op in ops if not isinstance(op, ShiftBatchCreate)]
+    existing = {
+        row.id: row
+        for row in db.execute(
+            select(Shift.id, Shift.schedule_id, Shift.start_at, Shift.end_at)
+            .where(Shift.org_id == org_id, Shift.id.in_(target_ids))
+        )
+    } if target_ids else {}
+
+    values = []
+    for op in ops:
+        if isinstance(op, ShiftBatchCreate):
+            values.append(op.shift.model_dump())
+        elif isinstance(op, ShiftBatchUpdate):
+            values.append(op.patch.model_dump(exclude_unset=True))
+        else:
+            values.append({})
+
+    def referenced(key):
+        return {v[key] for v in values if v.get(key) is not None}
+
+    schedules = _owned_ids(db, Schedule.id, Schedule.org_id, org_id, referenced("schedule_id"))
+    locations = _owned_ids(db, Location.id, Location.org_id, org_id, referenced("location_id"))
+    roles = _owned_ids(db, JobRole.id, JobRole.org_id, org_id, referenced("role_id"))
+
+    errors = []
+    seen: set[int] = set()
+    for index, (op, data) in enumerate(zip(ops, values)):
+        def fail(detail):
+            errors.append({"index": index, "detail": detail})
+
+        if not isinstance(op, ShiftBatchCreate):
+            if op.id not in existing:
+                fail("Shift not found")
+                continue
+            if op.id in seen:
+                fail("Shift appears more than once in the batch")
+                continue
+            seen.add(op.id)
+
+        nulls = [k for k in _NOT_NULL if k in data and data[k] is None]
+        if nulls:
+            fail(f"{', '.join(nulls)} cannot be null")
+            continue
+        if data.get("schedule_id") is not None and data["schedule_id"] not in schedules:
+            fail("schedule not found")
+        if data.get("location_id") is not None and data["location_id"] not in locations:
+            fail("location not found")
+        if data.get("role_id") is not None and data["role_id"] not in roles:
+            fail("role not found")
+        if isinstance(op, ShiftBatchUpdate):
+            current = existing[op.id]
+            if data.get("start_at", current.start_at) >= data.get("end_at", current.end_at):
+                fail("start_at must be before end_at")
+
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    creates = [(i, v) for i, (op, v) in enumerate(zip(ops, values)) if isinstance(op, ShiftBatchCreate)]
+    updates = [(op, v) for op, v in zip(ops, values) if isinstance(op, ShiftBatchUpdate)]
+    delete_ids = [op.id for op in ops if isinstance(op, ShiftBatchDelete)]
+
+    touched = {existing[i].schedule_id for i in target_ids}
+    touched |= referenced("schedule_id")
+
+    if delete_ids:
+        # FK cascade covers this on PostgreSQL; explicit so SQLite agrees
+        db.execute(delete(Assignment).where(Assignment.shift_id.in_(delete_ids)))
+        db.execute(delete(Shift).where(Shift.org_id == org_id, Shift.id.in_(delete_ids)))
+    if any(data for _, data in updates):
+        # ORM bulk UPDATE by primary key: one executemany per distinct key set
+        db.execute(update(Shift), [{"id": op.id, **data} for op, data in updates if data])
+    new_ids = []
+    if creates:
+        new_ids = list(db.scalars(
+            insert(Shift).returning(Shift.id, sort_by_parameter_order=True),
+            [{"org_id": org_id, **v} for _, v in creates],
+        ))
+    bump_change_seq(db, touched)
+    db.commit()
+
+    created = dict(zip((i for i, _ in creates), new_ids))
+    results = []
+    for index, op in enumerate(ops):
+        row_id = created[index] if index in created else op.id
+        results.append({"index": index, "op": op.op, "id": row_id, "status": _BATCH_STATUS[op.op]})
+    return results
@@ -228,5 +228,43 @@ class IntegrationFlowTests(unittest.TestCase):
         self.assertEqual(len(all_assigns), 2)
 
 
+    def test_role_rename_invalidates_columnar_etag(self):
+        r = self.client.post("/api/locations", json={"name": "HQ"})
+        loc_id = r.json()["id"]
+        r = self.client.post("/api/jobroles", json={"name": "Cashier"})
+        role_id = r.json()["id"]
+        r = self.client.post(
+            "/api/schedules",
+            json={"name": "Vika 41", "range_start": "2025-10-08", "range_end": "2025-10-14"},
+        )
+        schedule_id = r.json()["id"]
+        r = self.client.post(
+            "/api/shifts",
+            json={
+                "schedule_id": schedule_id,
+                "location_id": loc_id,
+                "role_id": role_id,
+                "start_at": "2025-10-08T09:00:00Z",
+                "end_at": "2025-10-08T17:00:00Z",
+            },
+        )
+        self.assertEqual(r.status_code, 201, r.text)
+
+        url = f"/api/shifts?schedule_id={schedule_id}&format=columnar"
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200, r.text)
+        etag = r.headers["ETag"]
+        self.assertEqual(self.client.get(url, headers={"If-None-Match": etag}).status_code, 304)
+
+        # renaming only bumps the org's reference counter, not the schedule's
+        r = self.client.patch(f"/api/jobroles/{role_id}", json={"name": "Barista"})
+        self.assertEqual(r.status_code, 200, r.text)
+
+        r = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(r.status_code, 200, r.text)
+        self.assertNotEqual(r.headers["ETag"], etag)
+        self.assertEqual(r.json()["lookups"]["roles"], {str(role_id): "Barista"})
+
+
 if __name__ == "__main__":
     unittest.main()
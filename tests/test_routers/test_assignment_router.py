@@ -3,6 +3,7 @@
 import unittest
 from types import SimpleNamespace as Obj
 from unittest.mock import patch
+from datetime import datetime, timezone
 from fastapi.testclient import TestClient
 from sqlalchemy.exc import IntegrityError
 
@@ -23,6 +24,11 @@ class AssignmentRouterTests(unittest.TestCase):
         app.dependency_overrides[get_current_active_user] = lambda: Obj(org_id=1, id=123)
         app.dependency_overrides[require_manager] = lambda: None
 
+        # change counters behind the ETag; the fake DB can't answer them
+        self.change_seq = patch("assignment.router.schedule_service.get_change_seq", return_value=7).start()
+        self.ref_seq = patch("assignment.router.org_service.get_ref_seq", return_value=3).start()
+        self.addCleanup(patch.stopall)
+
         self.client = TestClient(app)
 
     def tearDown(self):
@@ -32,11 +38,11 @@ class AssignmentRouterTests(unittest.TestCase):
 
     # --- LIST ---
 
-    @patch("assignment.router.service.get_assignments")
+    @patch("assignment.router.service.get_assignment_rows")
     def test_list_assignments_happy_path(self, mock_list):
         mock_list.return_value = [
-            Obj(shift_id=100, employee_id=10),
-            Obj(shift_id=101, employee_id=11),
+            dict(shift_id=100, employee_id=10),
+            dict(shift_id=101, employee_id=11),
         ]
         resp = self.client.get("/api/assignments")
         self.assertEqual(resp.status_code, 200, resp.text)
@@ -44,15 +50,78 @@ class AssignmentRouterTests(unittest.TestCase):
         self.assertEqual(len(data), 2)
         self.assertEqual(data[0]["shift_id"], 100)
 
-    @patch("assignment.router.service.get_assignments")
+    @patch("assignment.router.service.get_assignment_rows")
     def test_list_assignments_with_filters(self, mock_list):
-        mock_list.return_value = [Obj(shift_id=100, employee_id=10)]
+        mock_list.return_value = [dict(shift_id=100, employee_id=10)]
         resp = self.client.get("/api/assignments?shift_id=100&employee_id=10")
         self.assertEqual(resp.status_code, 200)
         out = resp.json()
         self.assertEqual(out[0]["shift_id"], 100)
         self.assertEqual(out[0]["employee_id"], 10)
 
+    @patch("assignment.router.service.get_assignment_rows")
+    def test_list_assignments_schedule_window_filters(self, mock_list):
+        mock_list.return_value = [dict(shift_id=100, employee_id=10)]
+        resp = self.client.get(
+            "/api/assignments?schedule_id=5&location_id=2"
+            "&start=2025-10-01T00:00:00Z&end=2025-10-08T00:00:00Z"
+        )
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual(resp.json(), [{"shift_id": 100, "employee_id": 10}])
+        _, kwargs = mock_list.call_args
+        self.assertEqual(kwargs["schedule_id"], 5)
+        self.assertEqual(kwargs["location_id"], 2)
+        self.assertEqual(kwargs["start"].day, 1)
+        self.assertEqual(kwargs["end"].day, 8)
+        self.assertFalse(kwargs["include_shift"])
+
+    @patch("assignment.router.service.get_assignment_rows")
+    def test_list_assignments_include_shift(self, mock_list):
+        mock_list.return_value = [
+            dict(
+                shift_id=100,
+                employee_id=10,
+                shift=dict(
+                    id=100, org_id=1, schedule_id=5, location_id=None, role_id=3,
+                    start_at=datetime(2025, 10, 1, 9, 0, tzinfo=timezone.utc),
+                    end_at=datetime(2025, 10, 1, 17, 0, tzinfo=timezone.utc),
+                    notes=None, required_staff_count=1,
+                ),
+            )
+        ]
+        resp = self.client.get("/api/assignments?schedule_id=5&include_shift=true")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        shift = resp.json()[0]["shift"]
+        self.assertEqual(shift["id"], 100)
+        self.assertEqual(shift["start_at"], "2025-10-01T09:00:00Z")
+        _, kwargs = mock_list.call_args
+        self.assertTrue(kwargs["include_shift"])
+
+    @patch("assignment.router.service.get_employee_names")
+    @patch("assignment.router.service.get_assignment_rows")
+    def test_list_assignments_columnar_with_shift(self, mock_list, mock_names):
+        mock_list.return_value = [
+            dict(
+                shift_id=100,
+                employee_id=10,
+                shift=dict(
+                    id=100, org_id=1, schedule_id=5, location_id=None, role_id=3,
+                    start_at=datetime(2025, 10, 1, 9, 0, tzinfo=timezone.utc),
+                    end_at=datetime(2025, 10, 1, 17, 0, tzinfo=timezone.utc),
+                    notes=None, required_staff_count=1,
+                ),
+            )
+        ]
+        mock_names.return_value = {10: "Anna"}
+        resp = self.client.get("/api/assignments?schedule_id=5&include_shift=true&format=columnar")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        body = resp.json()
+        self.assertEqual(body["columns"]["employee_id"], [10])
+        self.assertEqual(body["columns"]["shift_start_at"], [1759309200])
+        self.assertEqual(body["columns"]["shift_location_id"], [None])
+        self.assertEqual(body["lookups"], {"employees": {"10": "Anna"}})
+        self.assertEqual(resp.headers["ETag"], 'W/"s.5.7.c.3"')
+
     # --- GET /{shift_id}/{employee_id} ---
 
     @patch("assignment.router.service.get_assignment_for_org")
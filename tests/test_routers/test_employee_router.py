@@ -20,6 +20,10 @@ class EmployeeRouterTests(unittest.TestCase):
         app.dependency_overrides[get_current_active_user] = lambda: Obj(org_id=1)
         app.dependency_overrides[require_manager] = lambda: None
 
+        # change counters behind the ETag; the fake DB can't answer them
+        self.ref_seq = patch("employee.router.org_service.get_ref_seq", return_value=4).start()
+        self.addCleanup(patch.stopall)
+
         self.client = TestClient(app)
 
     def tearDown(self):
@@ -37,6 +41,22 @@ class EmployeeRouterTests(unittest.TestCase):
         self.assertEqual(resp.json(), [{"id": 1, "org_id": 1, "display_name": "johanna", "user_id": None}])
 
 
+    @patch("employee.router.service.get_employees")
+    def test_get_employees_etag_and_304(self, mock_get):
+        mock_get.return_value = [Obj(id=1, org_id=1, display_name="johanna")]
+        resp = self.client.get("/api/employees")
+        etag = resp.headers["ETag"]
+        self.assertEqual(etag, 'W/"r.1.4"')
+
+        resp = self.client.get("/api/employees", headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(mock_get.call_count, 1)
+
+        # a write elsewhere bumped the counter -> fresh body
+        self.ref_seq.return_value = 5
+        resp = self.client.get("/api/employees", headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 200)
+
     @patch("employee.router.service.get_employees")
     def test_get_employees_query_param_defaults_to_user_org(self, mock_get_employees):
         mock_get_employees.return_value = [Obj(id=1, org_id=1, display_name="HQ")]
@@ -0,0 +1,128 @@
+import unittest
+from types import SimpleNamespace as Obj
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from fastapi import HTTPException
+
+from main import app
+from core.database import get_db
+from auth.services.auth_service import get_current_active_user
+
+from me.ics import _fold, _text
+
+
+def _shift(**kw):
+    base = dict(
+        id=11, schedule_id=3,
+        start_at=datetime(2025, 10, 2, 9, tzinfo=timezone.utc),
+        end_at=datetime(2025, 10, 2, 17, tzinfo=timezone.utc),
+        role_id=2, role_name="Cook", location_id=4, location_name="HQ", notes=None,
+    )
+    base.update(kw)
+    return base
+
+
+class MeRouterTests(unittest.TestCase):
+    def setUp(self):
+        class FakeDB:
+            def rollback(self): ...
+        def _fake_db():
+            yield FakeDB()
+
+        app.dependency_overrides[get_db] = _fake_db
+        app.dependency_overrides[get_current_active_user] = lambda: Obj(org_id=1, id=123, is_manager=False)
+
+        self.emp = Obj(id=9, org_id=1, display_name="Anna")
+        patch("me.router.service.get_employee_for_user", return_value=self.emp).start()
+        self.addCleanup(patch.stopall)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        for dep in (get_db, get_current_active_user):
+            app.dependency_overrides.pop(dep, None)
+
+    @patch("me.router.service.get_my_shifts")
+    def test_my_shifts_passes_window(self, mock_get):
+        mock_get.return_value = [_shift()]
+        r = self.client.get(
+            "/api/me/shifts",
+            params={"from": "2025-10-01T00:00:00Z", "to": "2025-11-01T00:00:00Z", "limit": 5},
+        )
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()[0]["role_name"], "Cook")
+        kwargs = mock_get.call_args.kwargs
+        self.assertEqual(kwargs["employee_id"], 9)
+        self.assertEqual(kwargs["start"], datetime(2025, 10, 1, tzinfo=timezone.utc))
+        self.assertEqual(kwargs["limit"], 5)
+
+    @patch("me.router.service.get_my_shifts", return_value=[])
+    def test_my_shifts_defaults_to_now(self, mock_get):
+        r = self.client.get("/api/me/shifts")
+        self.assertEqual(r.status_code, 200)
+        self.assertIsNotNone(mock_get.call_args.kwargs["start"])
+        self.assertIsNone(mock_get.call_args.kwargs["end"])
+
+    @patch("me.router.service.get_employee_for_user")
+    def test_my_shifts_without_profile_404(self, mock_emp):
+        mock_emp.side_effect = HTTPException(status_code=404, detail="no employee profile linked to this user")
+        self.assertEqual(self.client.get("/api/me/shifts").status_code, 404)
+
+    @patch("me.router.service.rotate_calendar_token", return_value="tok123")
+    def test_rotate_calendar_token(self, mock_rotate):
+        r = self.client.post("/api/me/calendar-token")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json(), {"token": "tok123", "path": "/api/me/calendar/tok123.ics"})
+        self.assertIs(mock_rotate.call_args.args[1], self.emp)
+
+    @patch("me.router.service.get_feed_shifts")
+    @patch("me.router.service.get_feed_version", return_value=(1, 5, 3, 2))
+    @patch("me.router.service.get_employee_by_calendar_token")
+    def test_calendar_feed_streams_and_revalidates(self, mock_token, _version, mock_shifts):
+        mock_token.return_value = self.emp
+        mock_shifts.return_value = [_shift(notes="Bring keys; front door")]
+
+        r = self.client.get("/api/me/calendar/tok123.ics")
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.headers["content-type"].startswith("text/calendar"))
+        self.assertIn("BEGIN:VEVENT\r\nUID:shift-11@vaktaplan\r\n", r.text)
+        self.assertIn("SUMMARY:Cook\r\nLOCATION:HQ\r\n", r.text)
+        self.assertIn("DESCRIPTION:Bring keys\\; front door\r\n", r.text)
+        mock_token.assert_called_once()
+        self.assertEqual(mock_token.call_args.args[1], "tok123")
+
+        r2 = self.client.get("/api/me/calendar/tok123.ics", headers={"If-None-Match": r.headers["etag"]})
+        self.assertEqual(r2.status_code, 304)
+        self.assertEqual(mock_shifts.call_count, 1)
+
+    @patch("me.router.datetime")
+    @patch("me.router.service.get_feed_shifts", return_value=[])
+    @patch("me.router.service.get_feed_version", return_value=(1, 5, 3, 2))
+    @patch("me.router.service.get_employee_by_calendar_token")
+    def test_calendar_feed_etag_changes_with_the_day(self, mock_token, _version, mock_shifts, mock_dt):
+        mock_token.return_value = self.emp
+        mock_dt.now.return_value = datetime(2025, 10, 1, 23, 0, tzinfo=timezone.utc)
+        etag = self.client.get("/api/me/calendar/tok123.ics").headers["etag"]
+
+        mock_dt.now.return_value = datetime(2025, 10, 2, 1, 0, tzinfo=timezone.utc)
+        r = self.client.get("/api/me/calendar/tok123.ics", headers={"If-None-Match": etag})
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r.headers["etag"], etag)
+        self.assertEqual(mock_shifts.call_count, 2)
+
+    @patch("me.router.service.get_employee_by_calendar_token", return_value=None)
+    def test_calendar_feed_unknown_token_404(self, _):
+        self.assertEqual(self.client.get("/api/me/calendar/nope.ics").status_code, 404)
+
+    def test_ics_folding_and_escaping(self):
+        self.assertEqual(_text("a,b;c\\d\ne"), "a\\,b\\;c\\\\d\\ne")
+        folded = _fold("DESCRIPTION:" + "é" * 80)
+        lines = folded[:-2].split("\r\n")
+        self.assertTrue(all(len(l.encode()) <= 75 for l in lines))
+        self.assertTrue(all(l.startswith(" ") for l in lines[1:]))
+        self.assertEqual("".join(l[1:] if i else l for i, l in enumerate(lines)), "DESCRIPTION:" + "é" * 80)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+import gzip
+import json
 import unittest
 from types import SimpleNamespace as Obj
 from datetime import date
@@ -8,7 +10,7 @@ from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 
 from main import app
-from core.database import get_db
+from core.database import get_db, SessionLocal
 from auth.services.auth_service import get_current_active_user
 from authz.deps import require_manager
 
@@ -30,6 +32,11 @@ class ScheduleRouterTests(unittest.TestCase):
         # Bypass manager check entirely (POST/DELETE/PUBLISH)
         app.dependency_overrides[require_manager] = lambda: None
 
+        # change counters behind the ETag; the fake DB can't answer them
+        self.change_seq = patch("schedule.router.service.get_change_seq", return_value=7).start()
+        self.ref_seq = patch("schedule.router.org_service.get_ref_seq", return_value=4).start()
+        self.addCleanup(patch.stopall)
+
         self.client = TestClient(app)
 
     def tearDown(self):
@@ -93,6 +100,186 @@ class ScheduleRouterTests(unittest.TestCase):
         self.assertEqual(r.status_code, 404)
         self.assertEqual(r.json()["detail"], "schedule not found")
 
+    # ---------- BUNDLE ----------
+    @patch("schedule.router.service.get_schedules")
+    def test_list_schedules_include_stats(self, mock_get):
+        mock_get.return_value = [
+            dict(
+                id=1, org_id=1, name="Október 2025",
+                range_start=date(2025, 10, 1), range_end=date(2025, 10, 31),
+                version=1, status="draft", created_by=123, published_at=None,
+                stats=dict(shift_count=40, required_seats=80, assigned_seats=72, hours=320.0),
+            )
+        ]
+        r = self.client.get("/api/schedules?include_stats=true")
+        self.assertEqual(r.status_code, 200, r.text)
+        self.assertEqual(r.json()[0]["stats"]["assigned_seats"], 72)
+        _, kwargs = mock_get.call_args
+        self.assertTrue(kwargs["include_stats"])
+
+    @patch("schedule.router.service.get_schedule_bundle")
+    def test_get_schedule_bundle_ok(self, mock_bundle):
+        mock_bundle.return_value = {
+            "schedule": Obj(
+                id=9, org_id=1, name="Nóvember 2025", range_start=date(2025, 11, 1),
+                range_end=date(2025, 11, 30), version=1, status="draft",
+                created_by=123, published_at=None,
+            ),
+            "shifts": [Obj(
+                id=5, org_id=1, schedule_id=9, location_id=2, role_id=3,
+                start_at="2025-11-03T09:00:00Z", end_at="2025-11-03T17:00:00Z",
+                notes=None, required_staff_count=1,
+            )],
+            "assignments": [Obj(shift_id=5, employee_id=7)],
+            "employees": [Obj(id=7, org_id=1, display_name="Anna", user_id=None)],
+            "roles": [Obj(id=3, org_id=1, name="Cook", weekly_hours_cap=None)],
+            "locations": [Obj(id=2, org_id=1, name="HQ")],
+        }
+        r = self.client.get("/api/schedules/9/bundle")
+        self.assertEqual(r.status_code, 200, r.text)
+        body = r.json()
+        self.assertEqual(body["schedule"]["id"], 9)
+        self.assertEqual(body["shifts"][0]["id"], 5)
+        self.assertEqual(body["assignments"], [{"shift_id": 5, "employee_id": 7}])
+        self.assertEqual(body["employees"][0]["display_name"], "Anna")
+        _, kwargs = mock_bundle.call_args
+        self.assertEqual(kwargs, {"schedule_id": 9, "org_id": 1})
+
+    @patch("schedule.router.service.get_schedule_bundle")
+    def test_get_schedule_bundle_404(self, mock_bundle):
+        mock_bundle.side_effect = HTTPException(status_code=404, detail="schedule not found")
+        r = self.client.get("/api/schedules/9999/bundle")
+        self.assertEqual(r.status_code, 404)
+
+    @patch("schedule.router.service.get_schedule_bundle")
+    def test_get_schedule_bundle_304_when_unchanged(self, mock_bundle):
+        resp = self.client.get("/api/schedules/9/bundle", headers={"If-None-Match": 'W/"b.9.7.4"'})
+        self.assertEqual(resp.status_code, 304)
+        mock_bundle.assert_not_called()
+
+    def test_get_schedule_bundle_404_when_not_in_org(self):
+        self.change_seq.return_value = None
+        r = self.client.get("/api/schedules/9999/bundle")
+        self.assertEqual(r.status_code, 404)
+
+    # ---------- PUBLISHED SNAPSHOT ----------
+    @patch("schedule.router.snapshot_service.get_published_snapshot")
+    def test_get_published_serves_snapshot_bytes(self, mock_snap):
+        body = b'{"schedule": {"id": 9}, "shifts": [], "assignments": [], "employees": []}'
+        mock_snap.return_value = ('"abc"', gzip.compress(body))
+
+        r = self.client.get("/api/schedules/9/published", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(r.status_code, 200, r.text)
+        self.assertEqual(r.headers["content-encoding"], "gzip")
+        self.assertEqual(r.headers["ETag"], '"abc-gzip"')
+        self.assertEqual(r.json()["schedule"]["id"], 9)
+
+        r = self.client.get("/api/schedules/9/published", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", r.headers)
+        self.assertEqual(r.headers["ETag"], '"abc"')
+        self.assertEqual(r.content, body)
+
+        r = self.client.get(
+            "/api/schedules/9/published",
+            headers={"Accept-Encoding": "identity", "If-None-Match": '"abc"'},
+        )
+        self.assertEqual(r.status_code, 304)
+        _, kwargs = mock_snap.call_args
+        self.assertEqual(kwargs["org_id"], 1)
+
+    @patch("schedule.router.snapshot_service.get_published_snapshot")
+    def test_get_published_honours_gzip_q_values(self, mock_snap):
+        body = b'{"schedule": {"id": 9}, "shifts": [], "assignments": [], "employees": []}'
+        mock_snap.return_value = ('"abc"', gzip.compress(body))
+        cases = {
+            "gzip;q=0": False,
+            "gzip; q=0.0, identity": False,
+            "br, gzip;q=0.5": True,
+            "*": True,
+            "*;q=0": False,
+            "GZIP": True,
+        }
+        for accept, gzipped in cases.items():
+            r = self.client.get("/api/schedules/9/published", headers={"Accept-Encoding": accept})
+            self.assertEqual(r.status_code, 200, accept)
+            self.assertEqual(r.headers.get("content-encoding") == "gzip", gzipped, accept)
+            self.assertEqual(r.headers["ETag"], '"abc-gzip"' if gzipped else '"abc"', accept)
+
+    @patch("schedule.router.snapshot_service.get_published_snapshot")
+    def test_get_published_404_when_draft(self, mock_snap):
+        mock_snap.side_effect = HTTPException(status_code=404, detail="schedule not published")
+        r = self.client.get("/api/schedules/9/published")
+        self.assertEqual(r.status_code, 404)
+
+    # ---------- DIFF ----------
+    @patch("schedule.router.diff_service.iter_diff_records")
+    @patch("schedule.router.diff_service.check_schedules")
+    def test_diff_streams_ndjson(self, mock_check, mock_iter):
+        mock_iter.return_value = iter([
+            {"type": "shift", "change": "added", "id": 30, "start_at": "2025-10-01T09:00:00Z"},
+            {"type": "assignment", "change": "added", "shift_id": 30, "employee_id": 5},
+            {"type": "summary", "a": 2, "b": 3, "shifts_added": 1, "assignments_added": 1},
+        ])
+        r = self.client.get("/api/schedules/2/diff/3")
+        self.assertEqual(r.status_code, 200, r.text)
+        self.assertEqual(r.headers["content-type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in r.text.splitlines()]
+        self.assertEqual(lines[0], {"type": "shift", "change": "added", "id": 30, "start_at": "2025-10-01T09:00:00Z"})
+        self.assertEqual(lines[-1]["type"], "summary")
+        _, kwargs = mock_check.call_args
+        self.assertEqual((kwargs["a_id"], kwargs["b_id"], kwargs["org_id"]), (2, 3, 1))
+        # streamed from its own session, not the request's
+        self.assertIs(mock_iter.call_args.args[0], SessionLocal)
+        self.assertEqual((mock_iter.call_args.kwargs["a_id"], mock_iter.call_args.kwargs["b_id"]), (2, 3))
+
+    @patch("schedule.router.diff_service.iter_diff_records")
+    @patch("schedule.router.diff_service.check_schedules")
+    def test_diff_404(self, mock_check, mock_iter):
+        mock_check.side_effect = HTTPException(status_code=404, detail="schedule not found")
+        self.assertEqual(self.client.get("/api/schedules/2/diff/999").status_code, 404)
+        mock_iter.assert_not_called()
+
+    # ---------- COVERAGE ----------
+    @patch("schedule.router.coverage_service.get_coverage")
+    def test_get_coverage_passes_grouping(self, mock_cov):
+        mock_cov.return_value = {
+            "schedule_id": 9,
+            "buckets": [{
+                "day": "2025-10-01", "role_id": 3, "shifts": 2, "required": 3,
+                "assigned": 2, "open": 1, "understaffed_shifts": 1,
+            }],
+            "totals": {"shifts": 2, "required": 3, "assigned": 2, "open": 1, "understaffed_shifts": 1},
+            "unfilled": None,
+        }
+        r = self.client.get("/api/schedules/9/coverage?by=role&include_unfilled=true")
+        self.assertEqual(r.status_code, 200, r.text)
+        self.assertEqual(r.json()["buckets"][0]["open"], 1)
+        _, kwargs = mock_cov.call_args
+        self.assertEqual(kwargs["org_id"], 1)
+        self.assertEqual(kwargs["group_by"], ["role"])
+        self.assertTrue(kwargs["include_unfilled"])
+
+    @patch("schedule.router.coverage_service.get_coverage")
+    def test_get_coverage_rejects_unknown_grouping(self, mock_cov):
+        r = self.client.get("/api/schedules/9/coverage?by=employee")
+        self.assertEqual(r.status_code, 422)
+        mock_cov.assert_not_called()
+
+    @patch("schedule.router.calendar_service.get_month_calendar")
+    def test_get_calendar_parses_month(self, mock_cal):
+        mock_cal.return_value = {"schedule_id": 9, "month": "2025-10", "days": []}
+        r = self.client.get("/api/schedules/9/calendar?month=2025-10&per_day=3")
+        self.assertEqual(r.status_code, 200)
+        kwargs = mock_cal.call_args.kwargs
+        self.assertEqual((kwargs["schedule_id"], kwargs["org_id"]), (9, 1))
+        self.assertEqual((kwargs["month"], kwargs["per_day"]), (date(2025, 10, 1), 3))
+
+    @patch("schedule.router.calendar_service.get_month_calendar")
+    def test_get_calendar_rejects_bad_month(self, mock_cal):
+        r = self.client.get("/api/schedules/9/calendar?month=2025-13")
+        self.assertEqual(r.status_code, 422)
+        mock_cal.assert_not_called()
+
     # ---------- CREATE ----------
     @patch("schedule.router.service.create_schedule")
     def test_create_schedule_201(self, mock_create):
@@ -118,6 +305,34 @@ class ScheduleRouterTests(unittest.TestCase):
         self.assertEqual(r.json()["id"], 3)
         self.assertEqual(r.json()["name"], "Desember 2025")
 
+    @patch("schedule.router.service.clone_schedule")
+    def test_clone_schedule_201(self, mock_clone):
+        mock_clone.return_value = Obj(
+            id=4,
+            org_id=1,
+            name="Desember 2025",
+            range_start=date(2025, 12, 1),
+            range_end=date(2025, 12, 31),
+            version=2,
+            status="draft",
+            created_by=123,
+            published_at=None,
+        )
+        r = self.client.post("/api/schedules/3/clone", json={"include_assignments": False})
+        self.assertEqual(r.status_code, 201, r.text)
+        self.assertEqual(r.json()["version"], 2)
+        _, kwargs = mock_clone.call_args
+        self.assertEqual(kwargs["schedule_id"], 3)
+        self.assertEqual(kwargs["org_id"], 1)
+        self.assertFalse(kwargs["include_assignments"])
+
+        # body is optional
+        r = self.client.post("/api/schedules/3/clone")
+        self.assertEqual(r.status_code, 201, r.text)
+        _, kwargs = mock_clone.call_args
+        self.assertTrue(kwargs["include_assignments"])
+        self.assertIsNone(kwargs["name"])
+
     @patch("schedule.router.service.create_schedule")
     def test_create_schedule_409_conflict(self, mock_create):
         # router maps IntegrityError to 409
@@ -152,6 +367,25 @@ class ScheduleRouterTests(unittest.TestCase):
         self.assertEqual(r.status_code, 404)
         self.assertEqual(r.json()["detail"], "schedule not found")
 
+    # ---------- ARCHIVE ----------
+    @patch("schedule.router.archive_service.archive_schedule")
+    @patch("schedule.router.service.get_schedule_for_org")
+    def test_archive_schedule_202_runs_in_background(self, mock_get_one, mock_archive):
+        mock_get_one.return_value = Obj(id=5, org_id=1, name="Gamalt")
+        r = self.client.post("/api/schedules/5/archive")
+        self.assertEqual(r.status_code, 202, r.text)
+        self.assertEqual(r.json()["schedule_id"], 5)
+        args, _ = mock_archive.call_args
+        self.assertEqual(args[1], 5)
+
+    @patch("schedule.router.archive_service.archive_schedule")
+    @patch("schedule.router.service.get_schedule_for_org")
+    def test_archive_schedule_404(self, mock_get_one, mock_archive):
+        mock_get_one.return_value = None
+        r = self.client.post("/api/schedules/5/archive")
+        self.assertEqual(r.status_code, 404)
+        mock_archive.assert_not_called()
+
     # ---------- PUBLISH ----------
     @patch("schedule.router.service.publish_schedule")
     def test_publish_schedule_200(self, mock_publish):
@@ -22,6 +22,11 @@ class ShiftRouterTests(unittest.TestCase):
         # fake logged-in user scoped to org 1
         app.dependency_overrides[get_current_active_user] = lambda: Obj(org_id=1, id=123)
 
+        # change counters behind the ETag; the fake DB can't answer them
+        self.change_seq = patch("shift.router.schedule_service.get_change_seq", return_value=7).start()
+        self.ref_seq = patch("shift.router.org_service.get_ref_seq", return_value=3).start()
+        self.addCleanup(patch.stopall)
+
         self.client = TestClient(app)
 
     def tearDown(self):
@@ -29,10 +34,10 @@ class ShiftRouterTests(unittest.TestCase):
         app.dependency_overrides.pop(get_current_active_user, None)
 
     # ---------- LIST ----------
-    @patch("shift.router.service.get_shifts")
+    @patch("shift.router.service.get_shift_fields")
     def test_get_shifts_returns_dummy_and_forces_org(self, mock_get_shifts):
         mock_get_shifts.return_value = [
-            Obj(
+            dict(
                 id=1,
                 org_id=1,
                 schedule_id=10,
@@ -55,7 +60,7 @@ class ShiftRouterTests(unittest.TestCase):
         _, kwargs = mock_get_shifts.call_args
         self.assertEqual(kwargs.get("org_id"), 1)
 
-    @patch("shift.router.service.get_shifts")
+    @patch("shift.router.service.get_shift_fields")
     def test_get_shifts_can_filter_by_schedule_id(self, mock_get_shifts):
         mock_get_shifts.return_value = []
         resp = self.client.get("/api/shifts?schedule_id=10")
@@ -63,6 +68,120 @@ class ShiftRouterTests(unittest.TestCase):
         _, kwargs = mock_get_shifts.call_args
         self.assertEqual(kwargs.get("schedule_id"), 10)
 
+    @patch("shift.router.service.get_shift_fields")
+    def test_get_shifts_paginates_with_next_cursor(self, mock_get_shifts):
+        mock_get_shifts.return_value = [
+            dict(
+                id=i,
+                org_id=1,
+                schedule_id=10,
+                location_id=1,
+                role_id=1,
+                start_at=datetime(2025, 10, 16 + i, 9, 0, tzinfo=timezone.utc),
+                end_at=datetime(2025, 10, 16 + i, 17, 0, tzinfo=timezone.utc),
+                notes=None,
+            )
+            for i in (1, 2, 3)
+        ]
+        resp = self.client.get("/api/shifts?limit=2")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual([s["id"] for s in resp.json()], [1, 2])
+        # service is asked for one extra row to detect the next page
+        _, kwargs = mock_get_shifts.call_args
+        self.assertEqual(kwargs.get("limit"), 3)
+
+        cursor = resp.headers["X-Next-Cursor"]
+        mock_get_shifts.return_value = []
+        resp = self.client.get(f"/api/shifts?limit=2&cursor={cursor}")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertNotIn("X-Next-Cursor", resp.headers)
+        _, kwargs = mock_get_shifts.call_args
+        self.assertEqual(kwargs.get("after"), (datetime(2025, 10, 18, 9, 0, tzinfo=timezone.utc), 2))
+
+    def test_get_shifts_rejects_bad_cursor_and_page_size(self):
+        self.assertEqual(self.client.get("/api/shifts?cursor=not-a-cursor").status_code, 422)
+        self.assertEqual(self.client.get("/api/shifts?limit=100000").status_code, 422)
+
+    @patch("shift.router.service.get_shift_fields")
+    def test_get_shifts_fields_projection(self, mock_fields):
+        mock_fields.return_value = [
+            {"id": 1, "notes": "a", "start_at": datetime(2025, 10, 16, 9, 0, tzinfo=timezone.utc)},
+        ]
+        resp = self.client.get("/api/shifts?fields=id,notes")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual(resp.json(), [{"id": 1, "notes": "a"}])
+        _, kwargs = mock_fields.call_args
+        self.assertEqual(kwargs.get("fields"), ["id", "notes", "start_at"])
+        self.assertEqual(kwargs.get("org_id"), 1)
+
+    @patch("shift.router.service.get_shift_lookups")
+    @patch("shift.router.service.get_shift_fields")
+    def test_get_shifts_columnar_format(self, mock_fields, mock_lookups):
+        mock_fields.return_value = [
+            dict(
+                id=i, org_id=1, schedule_id=10, location_id=2, role_id=3,
+                start_at=datetime(2025, 10, 16, 9, 0, tzinfo=timezone.utc),
+                end_at=datetime(2025, 10, 16, 17, 0, tzinfo=timezone.utc),
+                notes=None, required_staff_count=1,
+            )
+            for i in (1, 2)
+        ]
+        mock_lookups.return_value = {"roles": {3: "Cook"}, "locations": {2: "Main"}}
+
+        resp = self.client.get("/api/shifts?schedule_id=10&format=columnar")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual(resp.headers["content-type"], "application/vnd.vaktaplan.columnar+json")
+        self.assertEqual(resp.headers["ETag"], 'W/"s.10.7.c.3"')
+        body = resp.json()
+        self.assertEqual(body["count"], 2)
+        self.assertEqual(body["columns"]["id"], [1, 2])
+        self.assertEqual(body["columns"]["start_at"], [1760605200, 1760605200])
+        self.assertEqual(body["lookups"], {"roles": {"3": "Cook"}, "locations": {"2": "Main"}})
+        _, kwargs = mock_lookups.call_args
+        self.assertEqual(kwargs["role_ids"], {3})
+        self.assertEqual(kwargs["location_ids"], {2})
+
+        # the Accept header selects the same format
+        resp = self.client.get("/api/shifts", headers={"Accept": "application/vnd.vaktaplan.columnar+json"})
+        self.assertEqual(resp.json()["columns"]["role_id"], [3, 3])
+
+    def test_get_shifts_unknown_field_422(self):
+        resp = self.client.get("/api/shifts?fields=id,password")
+        self.assertEqual(resp.status_code, 422, resp.text)
+
+    @patch("shift.router.service.get_shift_fields")
+    def test_get_shifts_for_schedule_etag_304_skips_query(self, mock_get_shifts):
+        mock_get_shifts.return_value = []
+        resp = self.client.get("/api/shifts?schedule_id=10")
+        self.assertEqual(resp.headers["ETag"], 'W/"s.10.7"')
+
+        resp = self.client.get("/api/shifts?schedule_id=10", headers={"If-None-Match": 'W/"s.10.7"'})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(mock_get_shifts.call_count, 1)
+
+        # fields projection carries the same tag
+        with patch("shift.router.service.get_shift_fields", return_value=[]):
+            resp = self.client.get("/api/shifts?schedule_id=10&fields=id")
+        self.assertEqual(resp.headers["ETag"], 'W/"s.10.7"')
+
+    @patch("shift.router.service.get_shift_fields")
+    def test_get_shifts_without_schedule_has_no_etag(self, mock_get_shifts):
+        mock_get_shifts.return_value = []
+        resp = self.client.get("/api/shifts")
+        self.assertNotIn("ETag", resp.headers)
+
+    @patch("shift.router.service.search_shifts_by_notes")
+    def test_search_shifts_route_is_not_shadowed_by_id(self, mock_search):
+        mock_search.return_value = []
+        resp = self.client.get("/api/shifts/search?q=training&limit=5")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        _, kwargs = mock_search.call_args
+        self.assertEqual(kwargs, {"org_id": 1, "q": "training", "schedule_id": None, "limit": 5})
+
+    def test_search_shifts_requires_query(self):
+        self.assertEqual(self.client.get("/api/shifts/search").status_code, 422)
+        self.assertEqual(self.client.get("/api/shifts/search?q=x").status_code, 422)
+
     # ---------- CREATE ----------
     @patch("shift.router.service.create_shift")
     def test_post_creates_shift(self, mock_create_shift):
@@ -117,6 +236,35 @@ class ShiftRouterTests(unittest.TestCase):
         resp = self.client.post("/api/shifts", json=payload)
         self.assertEqual(resp.status_code, 422)
 
+    # ---------- BATCH ----------
+    @patch("shift.router.service.apply_shift_batch")
+    def test_batch_passes_parsed_ops_and_org(self, mock_batch):
+        mock_batch.return_value = [
+            {"index": 0, "op": "create", "id": 50, "status": "created"},
+            {"index": 1, "op": "delete", "id": 7, "status": "deleted"},
+        ]
+        payload = {"ops": [
+            {"op": "create", "shift": {
+                "schedule_id": 10, "role_id": 1,
+                "start_at": "2025-10-17T09:00:00Z", "end_at": "2025-10-17T17:00:00Z",
+            }},
+            {"op": "delete", "id": 7},
+        ]}
+        resp = self.client.post("/api/shifts/batch", json=payload)
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual(resp.json()[0]["id"], 50)
+        _, kwargs = mock_batch.call_args
+        self.assertEqual(kwargs["org_id"], 1)
+        self.assertEqual([op.op for op in kwargs["ops"]], ["create", "delete"])
+
+    @patch("shift.router.service.apply_shift_batch")
+    def test_batch_422_on_bad_op(self, mock_batch):
+        resp = self.client.post("/api/shifts/batch", json={"ops": [{"op": "upsert", "id": 1}]})
+        self.assertEqual(resp.status_code, 422)
+        resp = self.client.post("/api/shifts/batch", json={"ops": []})
+        self.assertEqual(resp.status_code, 422)
+        mock_batch.assert_not_called()
+
     # ---------- GET BY ID ----------
     @patch("shift.router.service.get_shift_for_org")
     def test_get_shift(self, mock_get_for_org):
@@ -158,5 +158,63 @@ class WeeklyTemplateRouterTests(unittest.TestCase):
         self.assertEqual(resp.json()["detail"], "Schedule not found")
 
 
+    # ---------------- GENERATE + AUTO-ASSIGN ----------------
+
+    @patch("weeklytemplate.router.get_schedule_for_org")
+    @patch("weeklytemplate.router.service.generate_and_assign_from_weekly_template")
+    def test_generate_and_assign_200(self, mock_pipeline, mock_sched):
+        mock_sched.return_value = Obj(id=11, org_id=1)
+        mock_pipeline.return_value = {
+            "created": 4, "replaced": 0, "skipped": 1,
+            "assigned": 6, "skipped_full": 0, "skipped_no_candidates": 2,
+        }
+        payload = {"start_date": "2025-10-27", "end_date": "2025-11-02", "policy": "fill_missing"}
+        resp = self.client.post(f"{self.base}/11/weekly-template/generate-and-assign", json=payload)
+        self.assertEqual(resp.status_code, 200, resp.text)
+        body = resp.json()
+        self.assertEqual(body["created"], 4)
+        self.assertEqual(body["assigned"], 6)
+        mock_pipeline.assert_called_once()
+
+    @patch("weeklytemplate.router.get_schedule_for_org")
+    def test_generate_and_assign_404_wrong_org(self, mock_sched):
+        mock_sched.return_value = None
+        payload = {"start_date": "2025-10-27", "end_date": "2025-11-02"}
+        resp = self.client.post(f"{self.base}/999/weekly-template/generate-and-assign", json=payload)
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(resp.json()["detail"], "Schedule not found")
+
+    # ---------------- BATCH GENERATE ----------------
+
+    @patch("weeklytemplate.router.batch.generate_for_schedules")
+    def test_generate_batch_200(self, mock_batch):
+        class ScalarsDB:
+            def scalars(self, stmt):
+                return [11, 12]
+        app.dependency_overrides[get_db] = lambda: ScalarsDB()
+        mock_batch.return_value = [
+            {"schedule_id": 11, "status": "ok", "created": 20, "replaced": 0, "skipped": 0, "updated": 0, "elapsed_ms": 12.5},
+            {"schedule_id": 12, "status": "ok", "created": 18, "replaced": 0, "skipped": 2, "updated": 0, "elapsed_ms": 10.1},
+        ]
+        payload = {"schedule_ids": [11, 12], "start_date": "2025-12-01", "end_date": "2025-12-31", "policy": "replace"}
+        resp = self.client.post(f"{self.base}/weekly-template/generate-batch", json=payload)
+        self.assertEqual(resp.status_code, 200, resp.text)
+        body = resp.json()
+        self.assertEqual([r["schedule_id"] for r in body], [11, 12])
+        self.assertEqual(body[1]["skipped"], 2)
+        self.assertEqual(mock_batch.call_args.kwargs["schedule_ids"], [11, 12])
+
+    @patch("weeklytemplate.router.batch.generate_for_schedules")
+    def test_generate_batch_404_foreign_schedule(self, mock_batch):
+        class ScalarsDB:
+            def scalars(self, stmt):
+                return [11]  # 12 belongs to another org
+        app.dependency_overrides[get_db] = lambda: ScalarsDB()
+        payload = {"schedule_ids": [11, 12], "start_date": "2025-12-01", "end_date": "2025-12-31"}
+        resp = self.client.post(f"{self.base}/weekly-template/generate-batch", json=payload)
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(resp.json()["detail"], "Schedule not found")
+        mock_batch.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
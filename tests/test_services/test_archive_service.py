@@ -0,0 +1,91 @@
+import unittest
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from organization.models import Organization
+from schedule.models import Schedule, ScheduleStatus
+from schedule import archive_service
+from employee.models import Employee
+from jobrole.models import JobRole
+from shift.models import Shift, ShiftArchive
+from assignment.models import Assignment, AssignmentArchive
+import models_bootstrap
+
+
+class ArchiveServiceTests(unittest.TestCase):
+    def setUp(self):
+        # one shared connection so the job's own sessions see the seeded data
+        self.engine = create_engine(
+            "sqlite:///:memory:", future=True,
+            connect_args={"check_same_thread": False}, poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, future=True)
+        self.db = self.Session()
+
+        org = Organization(name="Org One", timezone="Atlantic/Reykjavik")
+        self.db.add(org)
+        self.db.flush()
+        old, current = (
+            Schedule(
+                org_id=org.id, name=name, range_start=start, range_end=end,
+                version=1, status=ScheduleStatus.published,
+            )
+            for name, start, end in (
+                ("Old", date(2024, 10, 1), date(2024, 10, 7)),
+                ("Current", date(2025, 10, 1), date(2025, 10, 7)),
+            )
+        )
+        role = JobRole(org_id=org.id, name="Cook")
+        emps = [Employee(org_id=org.id, display_name=f"E{i}") for i in range(2)]
+        self.db.add_all([old, current, role, *emps])
+        self.db.flush()
+        for sched in (old, current):
+            for day in range(1, 6):
+                sh = Shift(
+                    org_id=org.id, schedule_id=sched.id, role_id=role.id,
+                    start_at=datetime(sched.range_start.year, 10, day, 9, tzinfo=timezone.utc),
+                    end_at=datetime(sched.range_start.year, 10, day, 17, tzinfo=timezone.utc),
+                    notes=f"day {day}",
+                )
+                self.db.add(sh)
+                self.db.flush()
+                self.db.add_all([Assignment(shift_id=sh.id, employee_id=e.id) for e in emps])
+        self.db.commit()
+        self.old_id, self.current_id = old.id, current.id
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_archive_schedule_moves_rows_in_batches(self):
+        result = archive_service.archive_schedule(self.Session, self.old_id, batch_size=2)
+        self.assertEqual(result, {"schedule_id": self.old_id, "shifts_archived": 5})
+
+        self.db.expire_all()
+        self.assertEqual(self.db.query(Shift).filter_by(schedule_id=self.old_id).count(), 0)
+        self.assertEqual(self.db.query(Shift).filter_by(schedule_id=self.current_id).count(), 5)
+        self.assertEqual(self.db.query(Assignment).count(), 10)
+
+        archived = self.db.query(ShiftArchive).order_by(ShiftArchive.start_at).all()
+        self.assertEqual([s.notes for s in archived], [f"day {d}" for d in range(1, 6)])
+        self.assertTrue(all(s.schedule_id == self.old_id for s in archived))
+        self.assertEqual(self.db.query(AssignmentArchive).count(), 10)
+
+        sched = self.db.get(Schedule, self.old_id)
+        self.assertEqual(sched.status, ScheduleStatus.archived)
+        self.assertEqual(sched.change_seq, 1)
+
+    def test_archive_schedules_ended_before(self):
+        results = archive_service.archive_schedules_ended_before(self.Session, date(2025, 1, 1))
+        self.assertEqual([r["schedule_id"] for r in results], [self.old_id])
+        # already archived schedules are skipped on the next run
+        self.assertEqual(archive_service.archive_schedules_ended_before(self.Session, date(2025, 1, 1)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from datetime import datetime, timedelta, timezone, date
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from core.database import Base
@@ -125,22 +125,69 @@ class AssignmentServiceTests(unittest.TestCase):
 
     # -------------- LIST ----------------
 
-    def test_get_assignments_all_for_org(self):
-        rows = service.get_assignments(self.db, org_id=self.org1_id)
-        got = {(r.shift_id, r.employee_id) for r in rows}
+    def test_get_assignment_rows_all_for_org(self):
+        rows = service.get_assignment_rows(self.db, org_id=self.org1_id)
+        got = {(r["shift_id"], r["employee_id"]) for r in rows}
         self.assertIn((self.sh1_o1.id, self.emp1_o1.id), got)
         # Ensure nothing from org2 leaks in
-        got2 = service.get_assignments(self.db, org_id=self.org2_id)
+        got2 = service.get_assignment_rows(self.db, org_id=self.org2_id, include_shift=True)
         for r in got2:
-            self.assertEqual(r.shift.org_id, self.org2_id)
+            self.assertEqual(r["shift"]["org_id"], self.org2_id)
 
-    def test_get_assignments_filter_by_shift(self):
-        rows = service.get_assignments(self.db, org_id=self.org1_id, shift_id=self.sh1_o1.id)
-        self.assertTrue(all(r.shift_id == self.sh1_o1.id for r in rows))
+    def test_get_assignment_rows_filter_by_shift(self):
+        rows = service.get_assignment_rows(self.db, org_id=self.org1_id, shift_id=self.sh1_o1.id)
+        self.assertTrue(all(r["shift_id"] == self.sh1_o1.id for r in rows))
 
-    def test_get_assignments_filter_by_employee(self):
-        rows = service.get_assignments(self.db, org_id=self.org1_id, employee_id=self.emp1_o1.id)
-        self.assertTrue(all(r.employee_id == self.emp1_o1.id for r in rows))
+    def test_get_assignment_rows_filter_by_employee(self):
+        rows = service.get_assignment_rows(self.db, org_id=self.org1_id, employee_id=self.emp1_o1.id)
+        self.assertTrue(all(r["employee_id"] == self.emp1_o1.id for r in rows))
+
+    def test_get_assignment_rows_filter_by_schedule_window_and_location(self):
+        self.db.add(Assignment(shift_id=self.sh2_o1.id, employee_id=self.emp2_o1.id))
+        self.db.commit()
+        rows = service.get_assignment_rows(self.db, org_id=self.org1_id, schedule_id=self.schedule1_id)
+        self.assertEqual(len(rows), 2)
+
+        # window only overlaps the second day's shift
+        rows = service.get_assignment_rows(
+            self.db,
+            org_id=self.org1_id,
+            schedule_id=self.schedule1_id,
+            start=datetime(2025, 10, 2, 0, 0, tzinfo=timezone.utc),
+            end=datetime(2025, 10, 3, 0, 0, tzinfo=timezone.utc),
+        )
+        self.assertEqual(rows, [{"shift_id": self.sh2_o1.id, "employee_id": self.emp2_o1.id}])
+
+        rows = service.get_assignment_rows(self.db, org_id=self.org1_id, location_id=self.loc2.id)
+        self.assertEqual(rows, [])
+
+    def test_get_assignment_rows_include_shift_in_same_query(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+        rows = service.get_assignment_rows(self.db, org_id=self.org1_id, include_shift=True)
+        self.assertEqual(len(statements), 1)
+        shift = rows[0]["shift"]
+        self.assertEqual(shift["id"], self.sh1_o1.id)
+        self.assertEqual(shift["schedule_id"], self.schedule1_id)
+        self.assertEqual(shift["start_at"].day, 1)
+        self.assertEqual(service.get_assignment_rows(self.db, org_id=self.org1_id, schedule_id=self.schedule2_id), [])
+
+    def test_create_and_delete_bump_schedule_change_seq(self):
+        before = self.db.get(Schedule, self.schedule1_id).change_seq
+        service.create_assignment(self.db, AssignmentCreate(
+            org_id=self.org1_id, shift_id=self.sh2_o1.id, employee_id=self.emp2_o1.id,
+        ))
+        service.delete_assignment(self.db, self.sh1_o1.id, self.emp1_o1.id)
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Schedule, self.schedule1_id).change_seq, before + 2)
+        self.assertEqual(self.db.get(Schedule, self.schedule2_id).change_seq, 0)
+
+    def test_get_employee_names_scoped_to_org(self):
+        names = service.get_employee_names(
+            self.db, org_id=self.org1_id, employee_ids={self.emp1_o1.id, self.emp1_o2.id}
+        )
+        self.assertEqual(names, {self.emp1_o1.id: "Kalli"})
+        self.assertEqual(service.get_employee_names(self.db, org_id=self.org1_id, employee_ids=set()), {})
 
     # -------------- GET (single) ----------------
 
@@ -0,0 +1,148 @@
+import asyncio
+import inspect
+import time
+import unittest
+from types import SimpleNamespace as Obj
+from unittest.mock import patch
+
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from core.database import Base, get_db
+from auth.services import auth_service, principal_cache
+from auth.services.principal_cache import Principal
+from auth.routes import auth_router
+from user import service as user_service
+from user.models import User
+import models_bootstrap
+
+
+class AuthServiceTests(unittest.TestCase):
+    def setUp(self):
+        def _fake_db():
+            yield None
+        app.dependency_overrides[get_db] = _fake_db
+        principal_cache.clear()
+        self.token = auth_service.create_access_token({"sub": "anna@example.com"})
+        self.user = User(
+            id=1, org_id=1, username="anna", email="anna@example.com",
+            is_manager=False, is_active=True, token_version=3,
+        )
+
+    def tearDown(self):
+        app.dependency_overrides.pop(get_db, None)
+        principal_cache.clear()
+
+    def test_dependencies_are_sync(self):
+        # sync session work must stay off the event loop
+        for fn in (
+            auth_service.get_current_user,
+            auth_service.get_current_active_user,
+            auth_router.login_for_access_token,
+        ):
+            self.assertFalse(inspect.iscoroutinefunction(fn), fn.__name__)
+
+    def test_current_user_is_cached_per_token(self):
+        with patch("auth.services.auth_service.get_user_by_email", return_value=self.user) as mock_get:
+            first = auth_service.get_current_user(self.token, db=None)
+            second = auth_service.get_current_user(self.token, db=None)
+        self.assertEqual((first.id, first.org_id, first.is_manager), (1, 1, False))
+        self.assertIs(second, first)
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.kwargs["email"], "anna@example.com")
+
+    def test_invalidate_user_forces_lookup(self):
+        with patch("auth.services.auth_service.get_user_by_email", return_value=self.user) as mock_get:
+            auth_service.get_current_user(self.token, db=None)
+            principal_cache.invalidate_user(self.user.id)
+            auth_service.get_current_user(self.token, db=None)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_inactive_user_rejected(self):
+        self.user.is_active = False
+        with patch("auth.services.auth_service.get_user_by_email", return_value=self.user):
+            principal = auth_service.get_current_user(self.token, db=None)
+        with self.assertRaises(HTTPException) as cm:
+            auth_service.get_current_active_user(principal)
+        self.assertEqual(cm.exception.status_code, 400)
+
+    def test_bad_token_rejected_and_not_cached(self):
+        with self.assertRaises(HTTPException) as cm:
+            auth_service.get_current_user("not-a-jwt", db=None)
+        self.assertEqual(cm.exception.status_code, 401)
+        self.assertEqual(len(principal_cache._cache), 0)
+
+    def test_claims_token_needs_no_user_lookup(self):
+        token = auth_service.create_access_token(auth_service.token_claims(self.user))
+        other = auth_service.create_access_token({**auth_service.token_claims(self.user), "n": 2})
+        state = Obj(token_version=3, is_active=True)
+        with patch("auth.services.auth_service.get_user_by_email") as mock_email, \
+             patch("auth.services.auth_service.get_token_state", return_value=state) as mock_state:
+            principal = auth_service.get_current_user(token, db=None)
+            # a second token of the same user reuses the cached version
+            auth_service.get_current_user(other, db=None)
+        self.assertEqual(principal, Principal(id=1, org_id=1, is_manager=False, is_active=True))
+        mock_email.assert_not_called()
+        mock_state.assert_called_once()
+
+    def test_claims_token_with_old_version_rejected(self):
+        token = auth_service.create_access_token(auth_service.token_claims(self.user))
+        with patch("auth.services.auth_service.get_token_state", return_value=Obj(token_version=4, is_active=True)):
+            with self.assertRaises(HTTPException) as cm:
+                auth_service.get_current_user(token, db=None)
+        self.assertEqual(cm.exception.status_code, 401)
+
+    def test_revoke_tokens_bumps_version(self):
+        engine = create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine, future=True)()
+        self.addCleanup(engine.dispose)
+        self.addCleanup(db.close)
+        user = User(username="anna", email="anna@example.com", password_hash="x", is_active=True)
+        db.add(user)
+        db.commit()
+        token = auth_service.create_access_token(auth_service.token_claims(user))
+
+        self.assertEqual(auth_service.get_current_user(token, db=db).id, user.id)
+        user_service.revoke_tokens(db, user.id)
+        with self.assertRaises(HTTPException) as cm:
+            auth_service.get_current_user(token, db=db)
+        self.assertEqual(cm.exception.status_code, 401)
+
+        fresh = auth_service.create_access_token(auth_service.token_claims(db.get(User, user.id)))
+        self.assertEqual(auth_service.get_current_user(fresh, db=db).id, user.id)
+
+    def test_slow_user_lookups_overlap(self):
+        delay, n = 0.2, 8
+
+        def slow_lookup(db, email):
+            time.sleep(delay)
+            return self.user
+
+        # distinct tokens, so every request misses the principal cache
+        tokens = [auth_service.create_access_token({"sub": "anna@example.com", "n": i}) for i in range(n)]
+
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(
+                    client.get("/api/users/me", headers={"Authorization": f"Bearer {t}"}) for t in tokens
+                ))
+
+        with patch("auth.services.auth_service.get_user_by_email", side_effect=slow_lookup) as mock_get, \
+             patch("user.router.get_user", return_value=self.user):
+            started = time.perf_counter()
+            responses = asyncio.run(burst())
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(mock_get.call_count, n)
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+        # serialized on the event loop this would take n * delay
+        self.assertLess(elapsed, n * delay / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException
+
+from core.database import Base
+from organization.models import Organization
+from schedule.models import Schedule, ScheduleStatus
+from schedule import calendar_service
+from schedule.schema import MonthCalendarSchema
+from jobrole.models import JobRole
+from employee.models import Employee
+from shift.models import Shift
+from assignment.models import Assignment
+import models_bootstrap
+
+
+class CalendarServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(self.engine)
+        Session = sessionmaker(bind=self.engine, future=True)
+        self.db = Session()
+
+        org = Organization(name="Org One", timezone="Atlantic/Reykjavik")
+        self.db.add(org)
+        self.db.flush()
+        self.org_id = org.id
+
+        sched = Schedule(
+            org_id=self.org_id, name="October", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 31), version=1, status=ScheduleStatus.draft,
+        )
+        role = JobRole(org_id=self.org_id, name="Cook")
+        emps = [Employee(org_id=self.org_id, display_name=f"E{i}") for i in range(3)]
+        self.db.add_all([sched, role, *emps])
+        self.db.flush()
+        self.schedule_id = sched.id
+
+        def shift(month, day, hour, required, staff):
+            sh = Shift(
+                org_id=self.org_id, schedule_id=sched.id, role_id=role.id,
+                start_at=datetime(2025, month, day, hour, tzinfo=timezone.utc),
+                end_at=datetime(2025, month, day, hour + 2, tzinfo=timezone.utc),
+                required_staff_count=required,
+            )
+            self.db.add(sh)
+            self.db.flush()
+            self.db.add_all([Assignment(shift_id=sh.id, employee_id=e.id) for e in staff])
+            return sh
+
+        # Oct 3: four shifts, one over-staffed (3 of 1) and one empty
+        self.busy = [
+            shift(10, 3, 8, 1, emps),
+            shift(10, 3, 10, 2, emps[:1]),
+            shift(10, 3, 12, 1, []),
+            shift(10, 3, 14, 1, emps[:1]),
+        ]
+        self.quiet = shift(10, 20, 9, 1, emps[:1])
+        # outside the month on either side
+        shift(9, 30, 20, 1, [])
+        shift(11, 1, 9, 1, [])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_month_buckets_in_one_windowed_query(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+        out = calendar_service.get_month_calendar(
+            self.db, schedule_id=self.schedule_id, org_id=self.org_id, month=date(2025, 10, 1), per_day=2,
+        )
+        MonthCalendarSchema.model_validate(out)
+
+        # org timezone lookup + the windowed month query
+        self.assertEqual(len(statements), 2)
+        # assignment counts are limited to the schedule's shifts in the month window
+        self.assertGreaterEqual(statements[1].count("shifts.schedule_id = ?"), 2)
+        self.assertGreaterEqual(statements[1].count("shifts.start_at >= ?"), 2)
+        self.assertEqual(out["month"], "2025-10")
+        self.assertEqual(len(out["days"]), 31)
+
+        busy = out["days"][2]
+        self.assertEqual(busy["day"], date(2025, 10, 3))
+        self.assertEqual((busy["shifts"], busy["required"], busy["assigned"], busy["more"]), (4, 5, 5, 2))
+        # filled seats are capped per shift: 1 + 1 + 0 + 1 of 5
+        self.assertEqual(busy["coverage"], 0.6)
+        self.assertEqual([i["id"] for i in busy["items"]], [s.id for s in self.busy[:2]])
+
+        quiet = out["days"][19]
+        self.assertEqual((quiet["shifts"], quiet["coverage"], quiet["more"]), (1, 1.0, 0))
+        self.assertEqual(quiet["items"][0]["id"], self.quiet.id)
+
+        empty = out["days"][0]
+        self.assertEqual((empty["shifts"], empty["coverage"], empty["items"]), (0, None, []))
+        self.assertEqual(sum(d["shifts"] for d in out["days"]), 5)
+
+    def test_parse_month(self):
+        self.assertEqual(calendar_service.parse_month("2025-02"), date(2025, 2, 1))
+        for bad in ("2025-13", "2025", "2025-10-01", "oct"):
+            with self.assertRaises(HTTPException) as cm:
+                calendar_service.parse_month(bad)
+            self.assertEqual(cm.exception.status_code, 422)
+
+    def test_calendar_404_for_other_org(self):
+        with self.assertRaises(HTTPException) as cm:
+            calendar_service.get_month_calendar(
+                self.db, schedule_id=self.schedule_id, org_id=self.org_id + 1, month=date(2025, 10, 1),
+            )
+        self.assertEqual(cm.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
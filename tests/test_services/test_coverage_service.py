@@ -0,0 +1,110 @@
+import unittest
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException
+
+from core.database import Base
+from organization.models import Organization
+from schedule.models import Schedule, ScheduleStatus
+from schedule import coverage_service
+from schedule.schema import CoverageSchema
+from location.models import Location
+from jobrole.models import JobRole
+from employee.models import Employee
+from shift.models import Shift
+from assignment.models import Assignment
+import models_bootstrap
+
+
+class CoverageServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(self.engine)
+        Session = sessionmaker(bind=self.engine, future=True)
+        self.db = Session()
+
+        org = Organization(name="Org One", timezone="Atlantic/Reykjavik")
+        self.db.add(org)
+        self.db.flush()
+        self.org_id = org.id
+
+        sched = Schedule(
+            org_id=self.org_id, name="Coverage", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 7), version=1, status=ScheduleStatus.draft,
+        )
+        loc = Location(org_id=self.org_id, name="HQ")
+        cook = JobRole(org_id=self.org_id, name="Cook")
+        waiter = JobRole(org_id=self.org_id, name="Waiter")
+        emps = [Employee(org_id=self.org_id, display_name=f"E{i}") for i in range(3)]
+        self.db.add_all([sched, loc, cook, waiter, *emps])
+        self.db.flush()
+        self.schedule_id = sched.id
+        self.cook_id, self.waiter_id = cook.id, waiter.id
+
+        def shift(day, hour, role, required, staff):
+            sh = Shift(
+                org_id=self.org_id, schedule_id=sched.id, location_id=loc.id, role_id=role.id,
+                start_at=datetime(2025, 10, day, hour, tzinfo=timezone.utc),
+                end_at=datetime(2025, 10, day, hour + 4, tzinfo=timezone.utc),
+                required_staff_count=required,
+            )
+            self.db.add(sh)
+            self.db.flush()
+            self.db.add_all([Assignment(shift_id=sh.id, employee_id=e.id) for e in staff])
+            return sh
+
+        # day 1: cook fully staffed, waiter over-staffed (3 of 1)
+        shift(1, 9, cook, 2, emps[:2])
+        shift(1, 14, waiter, 1, emps)
+        # day 2: cook short by 2, waiter empty
+        self.short = shift(2, 9, cook, 3, emps[:1])
+        self.empty = shift(2, 14, waiter, 1, [])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_coverage_by_day_in_one_aggregate_query(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+        out = coverage_service.get_coverage(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        CoverageSchema.model_validate(out)
+
+        # org timezone lookup + the grouped aggregate
+        self.assertEqual(len(statements), 2)
+        # the per-shift assignment count is scoped to the schedule, not the whole table
+        self.assertGreaterEqual(statements[1].count("shifts.schedule_id = ?"), 2)
+        day1, day2 = out["buckets"]
+        self.assertEqual(str(day1["day"]), "2025-10-01")
+        self.assertEqual((day1["required"], day1["assigned"], day1["open"], day1["understaffed_shifts"]), (3, 5, 0, 0))
+        self.assertEqual((day2["required"], day2["assigned"], day2["open"], day2["understaffed_shifts"]), (4, 1, 3, 2))
+        self.assertEqual(out["totals"]["open"], 3)
+        self.assertIsNone(out["unfilled"])
+
+    def test_coverage_grouped_by_role_and_hour_with_unfilled(self):
+        out = coverage_service.get_coverage(
+            self.db, schedule_id=self.schedule_id, org_id=self.org_id,
+            group_by=["role", "hour"], include_unfilled=True,
+        )
+        keys = [(str(b["day"]), b["role_id"], b["hour"], b["open"]) for b in out["buckets"]]
+        self.assertEqual(keys, [
+            ("2025-10-01", self.cook_id, 9, 0),
+            ("2025-10-01", self.waiter_id, 14, 0),
+            ("2025-10-02", self.cook_id, 9, 2),
+            ("2025-10-02", self.waiter_id, 14, 1),
+        ])
+        self.assertEqual([s["id"] for s in out["unfilled"]], [self.short.id, self.empty.id])
+        self.assertEqual(out["unfilled"][1]["assigned"], 0)
+
+    def test_coverage_404_for_other_org(self):
+        with self.assertRaises(HTTPException) as cm:
+            coverage_service.get_coverage(self.db, schedule_id=self.schedule_id, org_id=self.org_id + 1)
+        self.assertEqual(cm.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException
+
+from core.database import Base
+from organization.models import Organization
+from schedule.models import Schedule, ScheduleStatus
+from schedule import diff_service
+from employee.models import Employee
+from jobrole.models import JobRole
+from shift.models import Shift
+from assignment.models import Assignment
+import models_bootstrap
+
+
+class DiffServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, future=True)
+        self.db = self.Session()
+
+        org = Organization(name="Org One", timezone="Atlantic/Reykjavik")
+        self.db.add(org)
+        self.db.flush()
+        self.org_id = org.id
+
+        v1, v2 = (
+            Schedule(
+                org_id=self.org_id, name="Vika 40", range_start=date(2025, 10, 1),
+                range_end=date(2025, 10, 7), version=v, status=ScheduleStatus.draft,
+            )
+            for v in (1, 2)
+        )
+        self.role = JobRole(org_id=self.org_id, name="Cook")
+        self.emps = [Employee(org_id=self.org_id, display_name=f"E{i}") for i in range(3)]
+        self.db.add_all([v1, v2, self.role, *self.emps])
+        self.db.flush()
+        self.v1, self.v2 = v1.id, v2.id
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def _diff(self, **kw):
+        """Records grouped back by kind, plus the trailing summary."""
+        records = list(diff_service.iter_diff_records(self.Session, a_id=self.v1, b_id=self.v2, **kw))
+        summary = records.pop()
+        self.assertEqual(summary["type"], "summary")
+        diff = {}
+        for r in records:
+            kind = f'{r.pop("type")}s_{r.pop("change")}'
+            diff.setdefault(kind, []).append(r)
+        return diff, summary
+
+    def _shift(self, schedule_id, day, hour=9, staff=(), **kw):
+        sh = Shift(
+            org_id=self.org_id, schedule_id=schedule_id, role_id=self.role.id,
+            start_at=datetime(2025, 10, day, hour, tzinfo=timezone.utc),
+            end_at=datetime(2025, 10, day, hour + 8, tzinfo=timezone.utc),
+            **kw,
+        )
+        self.db.add(sh)
+        self.db.flush()
+        self.db.add_all([Assignment(shift_id=sh.id, employee_id=e.id) for e in staff])
+        return sh
+
+    def test_diff_added_removed_changed_and_assignments(self):
+        e0, e1, e2 = self.emps
+        # unchanged pair, assignment swapped e0 -> e1
+        a_same = self._shift(self.v1, 1, staff=[e0, e2])
+        b_same = self._shift(self.v2, 1, staff=[e1, e2])
+        # changed staffing
+        a_chg = self._shift(self.v1, 2, required_staff_count=1)
+        b_chg = self._shift(self.v2, 2, required_staff_count=2)
+        # removed / added
+        a_gone = self._shift(self.v1, 3)
+        b_new = self._shift(self.v2, 4, hour=12, notes="new")
+        # duplicate slot: two in v1, one in v2 -> one removed
+        a_dup1 = self._shift(self.v1, 5)
+        a_dup2 = self._shift(self.v1, 5)
+        self._shift(self.v2, 5)
+        self.db.commit()
+
+        diff, summary = self._diff(batch_size=1)
+
+        self.assertEqual([s["id"] for s in diff["shifts_removed"]], [a_gone.id, a_dup2.id])
+        self.assertEqual([s["id"] for s in diff["shifts_added"]], [b_new.id])
+        self.assertEqual(diff["shifts_added"][0]["notes"], "new")
+        self.assertEqual(len(diff["shifts_changed"]), 1)
+        chg = diff["shifts_changed"][0]
+        self.assertEqual((chg["a"]["id"], chg["b"]["id"]), (a_chg.id, b_chg.id))
+        self.assertEqual((chg["a"]["required_staff_count"], chg["b"]["required_staff_count"]), (1, 2))
+        self.assertEqual(diff["assignments_added"], [{"shift_id": b_same.id, "employee_id": e1.id}])
+        self.assertEqual(diff["assignments_removed"], [{"shift_id": a_same.id, "employee_id": e0.id}])
+
+        self.assertEqual(summary, {
+            "type": "summary", "a": self.v1, "b": self.v2,
+            "shifts_added": 1, "shifts_removed": 2, "shifts_changed": 1,
+            "assignments_added": 1, "assignments_removed": 1,
+        })
+
+    def test_diff_identical_schedules_is_empty(self):
+        self._shift(self.v1, 1, staff=[self.emps[0]])
+        self._shift(self.v2, 1, staff=[self.emps[0]])
+        self.db.commit()
+        diff, summary = self._diff()
+        self.assertEqual(diff, {})
+        for key in ("shifts_added", "shifts_removed", "shifts_changed", "assignments_added", "assignments_removed"):
+            self.assertEqual(summary[key], 0, key)
+
+    def test_diff_404_when_a_schedule_is_outside_org(self):
+        with self.assertRaises(HTTPException) as cm:
+            diff_service.check_schedules(self.db, a_id=self.v1, b_id=9999, org_id=self.org_id)
+        self.assertEqual(cm.exception.status_code, 404)
+        diff_service.check_schedules(self.db, a_id=self.v1, b_id=self.v2, org_id=self.org_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -115,5 +115,14 @@ class employeeServiceTests(unittest.TestCase):
         return True
 
 
+    # ---- change counters ----
+    def test_writes_bump_org_ref_seq_only_for_that_org(self):
+        service.create_employee(self.db, EmployeeCreate(org_id=self.org1_id, display_name="Nýr"))
+        service.delete_employee(self.db, self.loc_org1_ids[0])
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Organization, self.org1_id).ref_seq, 2)
+        self.assertEqual(self.db.get(Organization, self.org2_id).ref_seq, 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException
+
+from core.database import Base
+from organization.models import Organization
+from schedule.models import Schedule, ScheduleStatus
+from location.models import Location
+from jobrole.models import JobRole
+from employee.models import Employee
+from shift.models import Shift
+from assignment.models import Assignment
+from me import service
+from me.ics import iter_calendar
+import models_bootstrap
+
+
+def _dt(day, hour):
+    return datetime(2025, 10, day, hour, tzinfo=timezone.utc)
+
+
+class MeServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(self.engine)
+        Session = sessionmaker(bind=self.engine, future=True)
+        self.db = Session()
+
+        org = Organization(name="Org One")
+        other = Organization(name="Org Two")
+        self.db.add_all([org, other])
+        self.db.flush()
+        self.org_id = org.id
+
+        published = Schedule(
+            org_id=org.id, name="Live", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 31), version=1, status=ScheduleStatus.published,
+        )
+        draft = Schedule(
+            org_id=org.id, name="Draft", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 31), version=2, status=ScheduleStatus.draft,
+        )
+        loc = Location(org_id=org.id, name="HQ")
+        cook = JobRole(org_id=org.id, name="Cook")
+        self.emp = Employee(org_id=org.id, display_name="Anna", user_id=500)
+        colleague = Employee(org_id=org.id, display_name="Bjorn", user_id=501)
+        self.db.add_all([published, draft, loc, cook, self.emp, colleague])
+        self.db.flush()
+        self.published_id = published.id
+
+        def shift(sched, day, hour, staff, location=loc, notes=None):
+            sh = Shift(
+                org_id=org.id, schedule_id=sched.id, role_id=cook.id,
+                location_id=location.id if location else None,
+                start_at=_dt(day, hour), end_at=_dt(day, hour + 8), notes=notes,
+            )
+            self.db.add(sh)
+            self.db.flush()
+            self.db.add_all([Assignment(shift_id=sh.id, employee_id=e.id) for e in staff])
+            return sh
+
+        self.late = shift(published, 9, 9, [self.emp], location=None)
+        self.early = shift(published, 2, 9, [self.emp], notes="Inventory")
+        self.theirs = shift(published, 3, 9, [colleague])
+        self.drafted = shift(draft, 4, 9, [self.emp])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_employee_for_user_is_org_scoped(self):
+        self.assertEqual(service.get_employee_for_user(self.db, user_id=500, org_id=self.org_id).id, self.emp.id)
+        with self.assertRaises(HTTPException) as cm:
+            service.get_employee_for_user(self.db, user_id=500, org_id=self.org_id + 1)
+        self.assertEqual(cm.exception.status_code, 404)
+
+    def test_my_shifts_published_only_in_start_order(self):
+        rows = service.get_my_shifts(self.db, employee_id=self.emp.id)
+        self.assertEqual([r["id"] for r in rows], [self.early.id, self.late.id])
+        self.assertEqual((rows[0]["role_name"], rows[0]["location_name"]), ("Cook", "HQ"))
+        self.assertIsNone(rows[1]["location_name"])
+
+    def test_my_shifts_window_and_limit(self):
+        rows = service.get_my_shifts(self.db, employee_id=self.emp.id, start=_dt(3, 0), end=_dt(30, 0))
+        self.assertEqual([r["id"] for r in rows], [self.late.id])
+        rows = service.get_my_shifts(self.db, employee_id=self.emp.id, start=_dt(1, 0), end=_dt(9, 9))
+        self.assertEqual([r["id"] for r in rows], [self.early.id])
+        rows = service.get_my_shifts(self.db, employee_id=self.emp.id, limit=1)
+        self.assertEqual(len(rows), 1)
+
+    def test_my_shifts_includes_shift_in_progress(self):
+        # early runs 09:00-17:00 on the 2nd; at noon it is still on the list
+        rows = service.get_my_shifts(self.db, employee_id=self.emp.id, start=_dt(2, 12))
+        self.assertEqual([r["id"] for r in rows], [self.early.id, self.late.id])
+        rows = service.get_my_shifts(self.db, employee_id=self.emp.id, start=_dt(2, 17))
+        self.assertEqual([r["id"] for r in rows], [self.late.id])
+
+    def test_rotate_calendar_token_revokes_old_one(self):
+        first = service.rotate_calendar_token(self.db, self.emp)
+        self.assertEqual(service.get_employee_by_calendar_token(self.db, first).id, self.emp.id)
+        second = service.rotate_calendar_token(self.db, self.emp)
+        self.assertNotEqual(first, second)
+        self.assertIsNone(service.get_employee_by_calendar_token(self.db, first))
+        self.assertEqual(service.get_employee_by_calendar_token(self.db, second).id, self.emp.id)
+
+    def test_feed_version_moves_with_published_schedules(self):
+        before = service.get_feed_version(self.db, org_id=self.org_id)
+        sched = self.db.get(Schedule, self.published_id)
+        sched.change_seq += 1
+        self.db.commit()
+        self.assertNotEqual(service.get_feed_version(self.db, org_id=self.org_id), before)
+
+    def test_feed_renders_events(self):
+        rows = service.get_feed_shifts(self.db, employee_id=self.emp.id, now=_dt(5, 0))
+        body = b"".join(iter_calendar(rows, name="Anna", stamp=_dt(5, 0))).decode()
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(body.endswith("END:VCALENDAR\r\n"))
+        self.assertEqual(body.count("BEGIN:VEVENT"), 2)
+        self.assertIn(f"UID:shift-{self.early.id}@vaktaplan\r\n", body)
+        self.assertIn("DTSTART:20251002T090000Z\r\n", body)
+        self.assertIn("DESCRIPTION:Inventory\r\n", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
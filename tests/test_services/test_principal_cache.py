@@ -0,0 +1,52 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from auth.services import principal_cache
+from auth.services.principal_cache import Principal
+
+
+def _p(user_id):
+    return Principal(id=user_id, org_id=1, is_manager=False, is_active=True)
+
+
+class PrincipalCacheTests(unittest.TestCase):
+    def setUp(self):
+        principal_cache.clear()
+        self.addCleanup(principal_cache.clear)
+
+    def test_entry_expires_after_ttl(self):
+        principal_cache.put("t1", _p(1))
+        self.assertEqual(principal_cache.get("t1"), _p(1))
+        later = time.monotonic() + principal_cache.PRINCIPAL_TTL + 1
+        with patch("auth.services.principal_cache.time.monotonic", return_value=later):
+            self.assertIsNone(principal_cache.get("t1"))
+        self.assertNotIn("t1", principal_cache._cache)
+
+    def test_ttl_capped_by_token_exp(self):
+        principal_cache.put("gone", _p(1), expires_at=time.time() - 1)
+        self.assertIsNone(principal_cache.get("gone"))
+        principal_cache.put("soon", _p(1), expires_at=time.time() + 5)
+        deadline, _ = principal_cache._cache["soon"]
+        self.assertLess(deadline, time.monotonic() + 6)
+
+    def test_bounded_lru(self):
+        with patch.object(principal_cache, "CACHE_SIZE", 2):
+            principal_cache.put("a", _p(1))
+            principal_cache.put("b", _p(2))
+            principal_cache.get("a")
+            principal_cache.put("c", _p(3))
+        self.assertEqual(list(principal_cache._cache), ["a", "c"])
+
+    def test_invalidate_user_drops_all_their_tokens(self):
+        principal_cache.put("a1", _p(1))
+        principal_cache.put("a2", _p(1))
+        principal_cache.put("b1", _p(2))
+        principal_cache.put_version(1, 0, True)
+        principal_cache.invalidate_user(1)
+        self.assertEqual(list(principal_cache._cache), ["b1"])
+        self.assertIsNone(principal_cache.get_version(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
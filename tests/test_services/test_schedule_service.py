@@ -9,7 +9,17 @@ from core.database import Base
 from organization.models import Organization
 from schedule.models import Schedule, ScheduleStatus
 from schedule import service
-from schedule.schema import ScheduleCreate
+from schedule.schema import ScheduleCreate, ScheduleBundleSchema
+from sqlalchemy import event
+from datetime import datetime, timezone
+from location.models import Location
+from jobrole.models import JobRole
+from employee.models import Employee
+from shift.models import Shift
+from assignment.models import Assignment
+from weeklytemplate.models import WeeklyTemplate
+from datetime import time
+import models_bootstrap
 
 
 class ScheduleServiceTests(unittest.TestCase):
@@ -289,6 +299,46 @@ class ScheduleServiceTests(unittest.TestCase):
         )
         self.assertIsNone(got_none)
 
+    def test_get_schedules_include_stats_in_one_query(self):
+        full, empty = (
+            Schedule(
+                org_id=self.org1_id, name=name, range_start=date(2025, 10, day),
+                range_end=date(2025, 10, day + 6), version=1, status=ScheduleStatus.draft,
+            )
+            for name, day in (("Full", 1), ("Empty", 8))
+        )
+        role = JobRole(org_id=self.org1_id, name="Cook")
+        emps = [Employee(org_id=self.org1_id, display_name=f"E{i}") for i in range(2)]
+        self.db.add_all([full, empty, role, *emps])
+        self.db.flush()
+        for day, hours, required, staff in ((1, 8, 2, emps), (2, 4, 3, emps[:1])):
+            sh = Shift(
+                org_id=self.org1_id, schedule_id=full.id, role_id=role.id,
+                start_at=datetime(2025, 10, day, 9, tzinfo=timezone.utc),
+                end_at=datetime(2025, 10, day, 9 + hours, tzinfo=timezone.utc),
+                required_staff_count=required,
+            )
+            self.db.add(sh)
+            self.db.flush()
+            self.db.add_all([Assignment(shift_id=sh.id, employee_id=e.id) for e in staff])
+        self.db.commit()
+
+        statements = []
+        event.listen(self.db.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+        rows = service.get_schedules(self.db, org_id=self.org1_id, include_stats=True)
+        self.assertEqual(len(statements), 1)
+
+        by_name = {r["name"]: r for r in rows}
+        self.assertEqual(
+            by_name["Full"]["stats"],
+            {"shift_count": 2, "required_seats": 5, "assigned_seats": 3, "hours": 12.0},
+        )
+        self.assertEqual(
+            by_name["Empty"]["stats"],
+            {"shift_count": 0, "required_seats": 0, "assigned_seats": 0, "hours": 0},
+        )
+        self.assertEqual([r["name"] for r in rows], ["Empty", "Full"])
+
     # ---------- delete_schedule ----------
     def test_delete_schedule_existing_and_missing(self):
         s1 = service.create_schedule(
@@ -310,6 +360,183 @@ class ScheduleServiceTests(unittest.TestCase):
         # delete non-existing should be no-op
         service.delete_schedule(self.db, 999999)
 
+    def test_delete_schedule_leaves_children_to_fk_cascade(self):
+        # separate engine with SQLite FK enforcement, like PostgreSQL
+        engine = create_engine("sqlite:///:memory:", future=True)
+        event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine, future=True)()
+        self.addCleanup(engine.dispose)
+        self.addCleanup(db.close)
+
+        org = Organization(name="FK Org", timezone="Atlantic/Reykjavik")
+        db.add(org)
+        db.flush()
+        sched = Schedule(
+            org_id=org.id, name="Big", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 7), version=1, status=ScheduleStatus.draft,
+        )
+        role = JobRole(org_id=org.id, name="Cook")
+        emp = Employee(org_id=org.id, display_name="E")
+        db.add_all([sched, role, emp])
+        db.flush()
+        for day in range(1, 6):
+            sh = Shift(
+                org_id=org.id, schedule_id=sched.id, role_id=role.id,
+                start_at=datetime(2025, 10, day, 9, tzinfo=timezone.utc),
+                end_at=datetime(2025, 10, day, 17, tzinfo=timezone.utc),
+            )
+            db.add(sh)
+            db.flush()
+            db.add(Assignment(shift_id=sh.id, employee_id=emp.id))
+        db.commit()
+        sched_id = sched.id
+        db.expire_all()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+        service.delete_schedule(db, sched_id)
+
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith("DELETE FROM schedules"))
+        self.assertEqual(db.query(Shift).count(), 0)
+        self.assertEqual(db.query(Assignment).count(), 0)
+
+    # ---------- get_schedule_bundle ----------
+    def test_get_schedule_bundle_loads_everything_in_bounded_queries(self):
+        sched = Schedule(
+            org_id=self.org1_id, name="Bundle", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 7), version=1, status=ScheduleStatus.draft,
+        )
+        loc = Location(org_id=self.org1_id, name="HQ")
+        role = JobRole(org_id=self.org1_id, name="Cook")
+        emps = [Employee(org_id=self.org1_id, display_name=f"E{i}") for i in range(3)]
+        self.db.add_all([sched, loc, role, *emps])
+        self.db.flush()
+        for day in range(1, 6):
+            sh = Shift(
+                org_id=self.org1_id, schedule_id=sched.id, location_id=loc.id, role_id=role.id,
+                start_at=datetime(2025, 10, day, 9, tzinfo=timezone.utc),
+                end_at=datetime(2025, 10, day, 17, tzinfo=timezone.utc),
+                required_staff_count=2,
+            )
+            self.db.add(sh)
+            self.db.flush()
+            self.db.add_all([
+                Assignment(shift_id=sh.id, employee_id=emps[0].id),
+                Assignment(shift_id=sh.id, employee_id=emps[day % 2 + 1].id),
+            ])
+        self.db.commit()
+        sched_id = sched.id
+        self.db.expire_all()
+
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+        bundle = service.get_schedule_bundle(self.db, schedule_id=sched_id, org_id=self.org1_id)
+        out = ScheduleBundleSchema.model_validate(bundle)
+
+        # schedule, shifts, assignments (selectin), employees, roles, locations
+        self.assertLessEqual(len(statements), 6)
+        self.assertEqual(len(out.shifts), 5)
+        self.assertEqual(len(out.assignments), 10)
+        self.assertEqual({e.display_name for e in out.employees}, {"E0", "E1", "E2"})
+        self.assertEqual([r.name for r in out.roles], ["Cook"])
+        self.assertEqual([l.name for l in out.locations], ["HQ"])
+
+    def test_get_schedule_bundle_404_for_other_org(self):
+        sched = Schedule(
+            org_id=self.org2_id, name="Other", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 7), version=1, status=ScheduleStatus.draft,
+        )
+        self.db.add(sched)
+        self.db.commit()
+        with self.assertRaises(HTTPException) as cm:
+            service.get_schedule_bundle(self.db, schedule_id=sched.id, org_id=self.org1_id)
+        self.assertEqual(cm.exception.status_code, 404)
+
+    # ---------- clone_schedule ----------
+    def test_clone_schedule_copies_template_shifts_and_assignments(self):
+        src = Schedule(
+            org_id=self.org1_id, name="Source", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 7), version=1, status=ScheduleStatus.published,
+            generated_through=date(2025, 10, 3),
+        )
+        role = JobRole(org_id=self.org1_id, name="Cook")
+        emps = [Employee(org_id=self.org1_id, display_name=f"E{i}") for i in range(2)]
+        self.db.add_all([src, role, *emps])
+        self.db.flush()
+        self.db.add(WeeklyTemplate(
+            org_id=self.org1_id, schedule_id=src.id, weekday=0, role_id=role.id,
+            start_time=time(9), end_time=time(17), required_staff_count=2,
+        ))
+        src_shifts = []
+        for day in range(1, 4):
+            sh = Shift(
+                org_id=self.org1_id, schedule_id=src.id, role_id=role.id,
+                start_at=datetime(2025, 10, day, 9, tzinfo=timezone.utc),
+                end_at=datetime(2025, 10, day, 17, tzinfo=timezone.utc),
+                notes=f"day {day}",
+            )
+            self.db.add(sh)
+            self.db.flush()
+            src_shifts.append(sh)
+            self.db.add(Assignment(shift_id=sh.id, employee_id=emps[day % 2].id))
+        self.db.commit()
+
+        clone = service.clone_schedule(
+            self.db, schedule_id=src.id, org_id=self.org1_id, created_by=7,
+        )
+        self.assertEqual(clone.version, 2)
+        self.assertEqual(clone.name, "Source")
+        self.assertEqual(clone.status, ScheduleStatus.draft)
+        self.assertEqual(clone.generated_through, date(2025, 10, 3))
+
+        tpl = self.db.query(WeeklyTemplate).filter_by(schedule_id=clone.id).one()
+        self.assertEqual((tpl.weekday, tpl.required_staff_count), (0, 2))
+
+        copies = self.db.query(Shift).filter_by(schedule_id=clone.id).order_by(Shift.start_at).all()
+        self.assertEqual([c.notes for c in copies], ["day 1", "day 2", "day 3"])
+        self.assertEqual([c.source_shift_id for c in copies], [s.id for s in src_shifts])
+        for copy, orig in zip(copies, src_shifts):
+            self.assertEqual(
+                [a.employee_id for a in copy.assignments],
+                [a.employee_id for a in orig.assignments],
+            )
+        # source untouched
+        self.assertEqual(self.db.query(Shift).filter_by(schedule_id=src.id).count(), 3)
+        self.assertEqual(self.db.query(Assignment).count(), 6)
+
+    def test_clone_schedule_without_assignments_and_404(self):
+        src = Schedule(
+            org_id=self.org1_id, name="Source", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 7), version=3, status=ScheduleStatus.draft,
+        )
+        role = JobRole(org_id=self.org1_id, name="Cook")
+        emp = Employee(org_id=self.org1_id, display_name="E")
+        self.db.add_all([src, role, emp])
+        self.db.flush()
+        sh = Shift(
+            org_id=self.org1_id, schedule_id=src.id, role_id=role.id,
+            start_at=datetime(2025, 10, 1, 9, tzinfo=timezone.utc),
+            end_at=datetime(2025, 10, 1, 17, tzinfo=timezone.utc),
+        )
+        self.db.add(sh)
+        self.db.flush()
+        self.db.add(Assignment(shift_id=sh.id, employee_id=emp.id))
+        self.db.commit()
+
+        clone = service.clone_schedule(
+            self.db, schedule_id=src.id, org_id=self.org1_id, created_by=7,
+            name="Try B", include_assignments=False,
+        )
+        self.assertEqual((clone.name, clone.version), ("Try B", 4))
+        self.assertEqual(self.db.query(Shift).filter_by(schedule_id=clone.id).count(), 1)
+        self.assertEqual(self.db.query(Assignment).count(), 1)
+
+        with self.assertRaises(HTTPException) as cm:
+            service.clone_schedule(self.db, schedule_id=src.id, org_id=self.org2_id, created_by=7)
+        self.assertEqual(cm.exception.status_code, 404)
+
 
 if __name__ == "__main__":
     unittest.main()
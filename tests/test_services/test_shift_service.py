@@ -12,7 +12,11 @@ from location.models import Location
 from schedule.models import Schedule, ScheduleStatus
 from shift.models import Shift
 from shift import service
-from shift.schemas import ShiftUpdate
+from schedule import service as service_schedule
+from shift.schemas import ShiftUpdate, ShiftBatchRequest
+from assignment.models import Assignment
+from employee.models import Employee
+from jobrole.models import JobRole
 import models_bootstrap
 
 
@@ -110,34 +114,187 @@ class ShiftServiceTests(unittest.TestCase):
         got = service.get_shift(self.db, 999999)
         self.assertIsNone(got)
 
-    # ---- get_shifts: filters ----
+    # ---- get_shift_fields: filters ----
+    def _list(self, **kw):
+        return service.get_shift_fields(
+            self.db, fields=["id", "schedule_id", "location_id", "start_at", "notes"], **kw
+        )
+
     def test_get_shifts_all(self):
-        rows = service.get_shifts(self.db)
+        rows = self._list()
         self.assertEqual(len(rows), 3)
-        self.assertTrue(rows[0].start_at <= rows[1].start_at <= rows[2].start_at)
+        self.assertTrue(rows[0]["start_at"] <= rows[1]["start_at"] <= rows[2]["start_at"])
 
     def test_get_shifts_location_filter(self):
-        rows = service.get_shifts(self.db, location_id=self.location_id)
-        self.assertTrue(all(r.location_id == self.location_id for r in rows))
+        rows = self._list(location_id=self.location_id)
+        self.assertTrue(all(r["location_id"] == self.location_id for r in rows))
         self.assertEqual(len(rows), 3)
 
     def test_get_shifts_schedule_filter(self):
-        rows = service.get_shifts(self.db, schedule_id=self.schedule_id)
-        self.assertTrue(all(r.schedule_id == self.schedule_id for r in rows))
+        rows = self._list(schedule_id=self.schedule_id)
+        self.assertTrue(all(r["schedule_id"] == self.schedule_id for r in rows))
         self.assertEqual(len(rows), 3)
 
     def test_get_shifts_notes_ilike(self):
-        rows = service.get_shifts(self.db, notes="front")
+        rows = self._list(notes="front")
         self.assertEqual(len(rows), 1)
-        self.assertIn("front", rows[0].notes)
+        self.assertIn("front", rows[0]["notes"])
 
     def test_get_shifts_time_window_overlap(self):
         # Overlaps only the middle shift (2025-10-17)
         start = datetime(2025, 10, 17, 8, 30, tzinfo=timezone.utc)
         end = datetime(2025, 10, 17, 12, 0, tzinfo=timezone.utc)
-        rows = service.get_shifts(self.db, start=start, end=end)
+        rows = self._list(start=start, end=end)
         self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0].start_at.date().isoformat(), "2025-10-17")
+        self.assertEqual(rows[0]["start_at"].date().isoformat(), "2025-10-17")
+
+    def test_overlap_filter_renders_range_operator_on_postgres(self):
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        from core.ranges import overlaps
+
+        stmt = select(Shift.id).where(
+            overlaps(Shift.start_at, Shift.end_at, datetime(2025, 10, 17, tzinfo=timezone.utc), datetime(2025, 10, 18, tzinfo=timezone.utc))
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        # must match the ix_shifts_*_during expression exactly to use the GiST index
+        self.assertIn("tstzrange(shifts.start_at, shifts.end_at, '[)') &&", sql)
+
+    def test_reversed_window_matches_nothing(self):
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        from core.ranges import overlaps
+
+        start = datetime(2025, 10, 18, tzinfo=timezone.utc)
+        end = datetime(2025, 10, 15, tzinfo=timezone.utc)
+        self.assertEqual(service.get_shift_fields(self.db, fields=["id"], start=start, end=end), [])
+        # tstzrange(lo, hi) raises when lo > hi; the upper bound is clamped instead
+        sql = str(select(Shift.id).where(overlaps(Shift.start_at, Shift.end_at, start, end))
+                  .compile(dialect=postgresql.dialect()))
+        self.assertIn("GREATEST(CAST(", sql)
+
+    # ---- get_shift_fields: keyset pagination ----
+    def test_get_shifts_keyset_pages_in_order(self):
+        first = self._list(limit=2)
+        self.assertEqual([r["id"] for r in first], self.ids[:2])
+        last = first[-1]
+        rest = self._list(limit=2, after=(last["start_at"], last["id"]))
+        self.assertEqual([r["id"] for r in rest], self.ids[2:])
+
+    def test_get_shifts_keyset_breaks_ties_on_id(self):
+        twin = Shift(
+            org_id=self.org_id,
+            schedule_id=self.schedule_id,
+            location_id=self.location_id,
+            role_id=1,
+            start_at=datetime(2025, 10, 16, 9, 0, tzinfo=timezone.utc),
+            end_at=datetime(2025, 10, 16, 12, 0, tzinfo=timezone.utc),
+        )
+        self.db.add(twin)
+        self.db.commit()
+        first = self._list(limit=1)
+        rest = self._list(after=(first[0]["start_at"], first[0]["id"]))
+        self.assertEqual([r["id"] for r in first + rest], [self.ids[0], twin.id, *self.ids[1:]])
+
+    def test_get_shift_fields_projects_columns(self):
+        rows = service.get_shift_fields(self.db, fields=["id", "notes"], schedule_id=self.schedule_id)
+        self.assertEqual(rows[0], {"id": self.ids[0], "notes": "front desk"})
+        self.assertEqual(len(rows), 3)
+
+    def test_get_shift_lookups_scoped_to_org(self):
+        lookups = service.get_shift_lookups(
+            self.db, org_id=self.org_id, role_ids=set(), location_ids={self.location_id, 999}
+        )
+        self.assertEqual(lookups, {"roles": {}, "locations": {self.location_id: "HQ"}})
+        other = service.get_shift_lookups(
+            self.db, org_id=self.org_id + 1, role_ids=set(), location_ids={self.location_id}
+        )
+        self.assertEqual(other["locations"], {})
+
+    # ---- apply_shift_batch ----
+    def _batch(self, *ops):
+        return service.apply_shift_batch(self.db, org_id=self.org_id, ops=ShiftBatchRequest(ops=list(ops)).ops)
+
+    def test_apply_shift_batch_creates_updates_and_deletes(self):
+        base = datetime(2025, 10, 19, 9, 0, tzinfo=timezone.utc)
+        emp = Employee(org_id=self.org_id, display_name="Gunna")
+        role = JobRole(org_id=self.org_id, name="Barista")
+        self.db.add_all([emp, role])
+        self.db.flush()
+        self.db.add(Assignment(shift_id=self.ids[2], employee_id=emp.id))
+        self.db.commit()
+
+        results = self._batch(
+            {"op": "create", "shift": {"schedule_id": self.schedule_id, "role_id": role.id, "start_at": base, "end_at": base + timedelta(hours=4)}},
+            {"op": "update", "id": self.ids[0], "patch": {"notes": "moved", "required_staff_count": 2}},
+            {"op": "update", "id": self.ids[1], "patch": {"location_id": self.location_id}},
+            {"op": "delete", "id": self.ids[2]},
+            {"op": "create", "shift": {"schedule_id": self.schedule_id, "role_id": role.id, "start_at": base, "end_at": base + timedelta(hours=8), "notes": "late"}},
+        )
+        self.assertEqual([r["status"] for r in results], ["created", "updated", "updated", "deleted", "created"])
+        self.assertEqual(results[1]["id"], self.ids[0])
+        created = self.db.get(Shift, results[4]["id"])
+        self.assertEqual(created.notes, "late")
+        self.assertEqual(created.org_id, self.org_id)
+
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Shift, self.ids[0]).notes, "moved")
+        self.assertEqual(self.db.get(Shift, self.ids[0]).required_staff_count, 2)
+        notes = {s.notes for s in self.db.query(Shift)}
+        self.assertEqual(notes, {"moved", "mid shift", None, "late"})
+        self.assertEqual(self.db.query(Assignment).count(), 0)
+        self.assertEqual(self.db.get(Schedule, self.schedule_id).change_seq, 1)
+
+    def test_apply_shift_batch_rejects_whole_batch(self):
+        base = datetime(2025, 10, 19, 9, 0, tzinfo=timezone.utc)
+        with self.assertRaises(HTTPException) as cm:
+            self._batch(
+                {"op": "create", "shift": {"schedule_id": self.schedule_id, "start_at": base, "end_at": base + timedelta(hours=4)}},
+                {"op": "delete", "id": 99999},
+                {"op": "update", "id": self.ids[0], "patch": {"end_at": datetime(2025, 10, 16, 8, 0)}},
+                {"op": "create", "shift": {"schedule_id": 424242, "role_id": 1, "start_at": base, "end_at": base + timedelta(hours=4)}},
+                {"op": "delete", "id": self.ids[1]},
+                {"op": "update", "id": self.ids[1], "patch": {"notes": "x"}},
+            )
+        self.assertEqual(cm.exception.status_code, 422)
+        self.assertEqual(
+            cm.exception.detail,
+            [
+                {"index": 0, "detail": "role_id cannot be null"},
+                {"index": 1, "detail": "Shift not found"},
+                {"index": 2, "detail": "start_at must be before end_at"},
+                {"index": 3, "detail": "schedule not found"},
+                {"index": 3, "detail": "role not found"},
+                {"index": 5, "detail": "Shift appears more than once in the batch"},
+            ],
+        )
+        self.db.rollback()
+        self.assertEqual(self.db.query(Shift).count(), 3)
+        self.assertEqual(self.db.get(Schedule, self.schedule_id).change_seq, 0)
+
+    # ---- search_shifts_by_notes ----
+    def test_search_shifts_by_notes_matches_substring_newest_first(self):
+        extra = Shift(
+            org_id=self.org_id,
+            schedule_id=self.schedule_id,
+            location_id=self.location_id,
+            role_id=1,
+            start_at=datetime(2025, 10, 19, 9, 0, tzinfo=timezone.utc),
+            end_at=datetime(2025, 10, 19, 17, 0, tzinfo=timezone.utc),
+            notes="FRONT desk training",
+        )
+        self.db.add(extra)
+        self.db.commit()
+        rows = service.search_shifts_by_notes(self.db, org_id=self.org_id, q="front")
+        self.assertEqual([r.id for r in rows], [extra.id, self.ids[0]])
+
+        rows = service.search_shifts_by_notes(self.db, org_id=self.org_id, q="front", limit=1)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(service.search_shifts_by_notes(self.db, org_id=self.org_id + 1, q="front"), [])
+
+    def test_search_shifts_by_notes_treats_wildcards_literally(self):
+        self.assertEqual(service.search_shifts_by_notes(self.db, org_id=self.org_id, q="%"), [])
+        self.assertEqual(service.search_shifts_by_notes(self.db, org_id=self.org_id, q="mid_shift"), [])
 
     # ---- create_shift ----
     def test_create_shift_inserts_and_returns(self):
@@ -161,6 +318,16 @@ class ShiftServiceTests(unittest.TestCase):
         self.assertEqual(again.required_staff_count, 1)
 
 
+    def test_writes_bump_schedule_change_seq(self):
+        def seq():
+            return service_schedule.get_change_seq(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+
+        self.assertEqual(seq(), 0)
+        service.update_shift(self.db, self.ids[0], ShiftUpdate(notes="changed"))
+        self.assertEqual(seq(), 1)
+        service.delete_shift(self.db, self.ids[1])
+        self.assertEqual(seq(), 2)
+
     # ---- delete_shift ----
     def test_delete_shift_existing(self):
         victim = self.ids[1]
@@ -171,7 +338,7 @@ class ShiftServiceTests(unittest.TestCase):
         # should not raise
         service.delete_shift(self.db, 999999)
         # still 3 originals remain (we didn’t delete any real row)
-        rows = service.get_shifts(self.db)
+        rows = self._list()
         self.assertEqual(len(rows), 3)
 
     # ---- update_shift ----
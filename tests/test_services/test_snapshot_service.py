@@ -0,0 +1,145 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException
+
+from core.database import Base
+from organization.models import Organization
+from schedule.models import Schedule, ScheduleStatus, ScheduleSnapshot
+from schedule import service, snapshot_service
+from employee.models import Employee
+from jobrole.models import JobRole
+from shift.models import Shift
+from assignment.models import Assignment
+from schedule.service import bump_change_seq
+import models_bootstrap
+
+
+class SnapshotServiceTests(unittest.TestCase):
+    def setUp(self):
+        # file-backed so a second session can act as a concurrent request
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.path}", future=True, connect_args={"timeout": 30})
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, future=True)
+        self.db = self.Session()
+        snapshot_service._cache.clear()
+
+        org = Organization(name="Org One", timezone="Atlantic/Reykjavik")
+        self.db.add(org)
+        self.db.flush()
+        self.org_id = org.id
+
+        sched = Schedule(
+            org_id=self.org_id, name="Vika 40", range_start=date(2025, 10, 1),
+            range_end=date(2025, 10, 7), version=1, status=ScheduleStatus.draft,
+        )
+        role = JobRole(org_id=self.org_id, name="Cook")
+        emp = Employee(org_id=self.org_id, display_name="Sigga")
+        self.db.add_all([sched, role, emp])
+        self.db.flush()
+        shift = Shift(
+            org_id=self.org_id, schedule_id=sched.id, role_id=role.id,
+            start_at=datetime(2025, 10, 1, 9, tzinfo=timezone.utc),
+            end_at=datetime(2025, 10, 1, 17, tzinfo=timezone.utc),
+        )
+        self.db.add(shift)
+        self.db.flush()
+        self.db.add(Assignment(shift_id=shift.id, employee_id=emp.id))
+        self.db.commit()
+        self.schedule_id = sched.id
+        self.shift_id = shift.id
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        os.remove(self.path)
+        snapshot_service._cache.clear()
+
+    def _count_statements(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+        return statements
+
+    def test_publish_materializes_snapshot_served_from_cache(self):
+        service.publish_schedule(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        snap = self.db.get(ScheduleSnapshot, self.schedule_id)
+        self.assertEqual(snap.change_seq, 1)
+
+        body = json.loads(gzip.decompress(snap.body))
+        self.assertEqual(body["schedule"]["status"], "published")
+        self.assertEqual([s["id"] for s in body["shifts"]], [self.shift_id])
+        self.assertEqual(body["employees"], [{"id": body["assignments"][0]["employee_id"], "display_name": "Sigga"}])
+
+        etag, gz = snapshot_service.get_published_snapshot(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        self.assertEqual(etag, snap.etag)
+        self.assertTrue(etag.startswith('"') and not etag.startswith("W/"))
+
+        # warm cache: only the change_seq check touches the database
+        statements = self._count_statements()
+        again = snapshot_service.get_published_snapshot(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        self.assertEqual(again, (etag, gz))
+        self.assertEqual(len(statements), 1)
+
+    def test_snapshot_rebuilt_after_schedule_changes(self):
+        service.publish_schedule(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        etag, _ = snapshot_service.get_published_snapshot(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+
+        self.db.get(Shift, self.shift_id).notes = "bring knives"
+        bump_change_seq(self.db, [self.schedule_id])
+        self.db.commit()
+
+        new_etag, gz = snapshot_service.get_published_snapshot(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(json.loads(gzip.decompress(gz))["shifts"][0]["notes"], "bring knives")
+        self.assertEqual(self.db.get(ScheduleSnapshot, self.schedule_id).change_seq, 2)
+
+    def test_concurrent_first_reads_do_not_collide(self):
+        sched = self.db.get(Schedule, self.schedule_id)
+        sched.status = ScheduleStatus.published
+        self.db.commit()
+        change_seq = sched.change_seq
+
+        real = snapshot_service.materialize_snapshot
+        def racing(db, sched):
+            snap = real(db, sched)
+            # another request stores the same snapshot before this one commits
+            with self.Session() as other:
+                other.add(ScheduleSnapshot(
+                    schedule_id=sched.id, change_seq=change_seq, etag='"theirs"', body=gzip.compress(b"{}"),
+                ))
+                other.commit()
+            return snap
+
+        with patch("schedule.snapshot_service.materialize_snapshot", side_effect=racing):
+            etag, _ = snapshot_service.get_published_snapshot(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        self.assertEqual(etag, '"theirs"')
+
+    def test_snapshot_404_for_draft_or_other_org(self):
+        with self.assertRaises(HTTPException) as cm:
+            snapshot_service.get_published_snapshot(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        self.assertEqual(cm.exception.detail, "schedule not published")
+
+        service.publish_schedule(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        with self.assertRaises(HTTPException) as cm:
+            snapshot_service.get_published_snapshot(self.db, schedule_id=self.schedule_id, org_id=self.org_id + 1)
+        self.assertEqual(cm.exception.status_code, 404)
+
+    def test_delete_schedule_drops_cached_snapshot(self):
+        service.publish_schedule(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        snapshot_service.get_published_snapshot(self.db, schedule_id=self.schedule_id, org_id=self.org_id)
+        self.assertIn(self.schedule_id, snapshot_service._cache)
+        service.delete_schedule(self.db, self.schedule_id)
+        self.assertNotIn(self.schedule_id, snapshot_service._cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
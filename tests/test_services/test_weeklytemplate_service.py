@@ -0,0 +1,652 @@
+from __future__ import annotations
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from datetime import date, time, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, Session
+
+from core.database import Base
+from user.models import User
+from organization.models import Organization
+from location.models import Location
+from jobrole.models import JobRole
+from employee.models import Employee
+from schedule.models import Schedule, ScheduleStatus
+from weeklytemplate.models import WeeklyTemplate
+from shift.models import Shift
+from assignment.models import Assignment
+from unavailability.models import Unavailability
+import models_bootstrap
+
+from weeklytemplate import service
+from weeklytemplate.horizon import run_rolling_horizon
+from weeklytemplate import batch
+from weeklytemplate.batch import generate_for_schedules
+from weeklytemplate.schema import WeeklyTemplateUpsertPayload, WeeklyTemplateRowUpdate, WeeklyTemplateGeneratePayload
+
+
+class WeeklyTemplateServiceTests(unittest.TestCase):
+    def setUp(self):
+        # Fresh DB per test
+        self.engine = create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(self.engine)
+        TestingSession = sessionmaker(bind=self.engine, expire_on_commit=False, future=True)
+        self.db: Session = TestingSession()
+
+        # Seed orgs
+        org1 = Organization(name="Org One", timezone="Atlantic/Reykjavik")
+        org2 = Organization(name="Org Two", timezone="Atlantic/Reykjavik")
+        self.db.add_all([org1, org2]); self.db.flush()
+        self.org1_id = org1.id
+        self.org2_id = org2.id
+
+        # generation needs a job role on every template row
+        role = JobRole(org_id=self.org1_id, name="Cashier")
+        self.db.add(role); self.db.flush()
+        self.role_id = role.id
+
+        # Seed schedules (one per org)
+        sched1 = Schedule(
+            org_id=self.org1_id,
+            name="Week 44",
+            range_start=date(2025, 10, 27),
+            range_end=date(2025, 11, 2),
+            version=1,
+            status=ScheduleStatus.draft,
+            created_by=None,
+        )
+        sched2 = Schedule(
+            org_id=self.org2_id,
+            name="Week 44",
+            range_start=date(2025, 10, 27),
+            range_end=date(2025, 11, 2),
+            version=1,
+            status=ScheduleStatus.draft,
+            created_by=None,
+        )
+        self.db.add_all([sched1, sched2]); self.db.commit()
+        self.db.refresh(sched1); self.db.refresh(sched2)
+        self.sched1_id = sched1.id
+        self.sched2_id = sched2.id
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    # ---------- queries ----------
+
+    def test_get_weekly_template_rows_empty(self):
+        rows = service.get_weekly_template_rows(self.db, schedule_id=self.sched1_id, org_id=self.org1_id)
+        self.assertEqual(rows, [])
+
+    # ---------- upsert/save ----------
+
+    def test_upsert_weekly_template_inserts_rows(self):
+        payload = WeeklyTemplateUpsertPayload(items=[
+            {"weekday": 0, "start_time": time(9, 0), "end_time": time(17, 0), "required_staff_count": 2},
+            {"weekday": 2, "start_time": time(10, 0), "end_time": time(18, 0), "required_staff_count": 1},
+        ])
+        rows = service.upsert_weekly_template(self.db, schedule_id=self.sched1_id, payload=payload)
+        self.assertEqual(len(rows), 2)
+
+        # reading back
+        back = service.get_weekly_template_rows(self.db, schedule_id=self.sched1_id, org_id=self.org1_id)
+        self.assertEqual(len(back), 2)
+        self.assertEqual(back[0].weekday, 0)
+        self.assertEqual(back[0].required_staff_count, 2)
+
+    def test_upsert_weekly_template_404_schedule(self):
+        payload = WeeklyTemplateUpsertPayload(items=[
+            {"weekday": 0, "start_time": time(9, 0), "end_time": time(17, 0)}
+        ])
+        with self.assertRaisesRegex(Exception, "Schedule not found"):
+            service.upsert_weekly_template(self.db, schedule_id=999999, payload=payload)
+
+    def test_upsert_weekly_template_422_same_times(self):
+        # rejected by the payload schema before the service is reached
+        with self.assertRaisesRegex(Exception, "cannot be equal"):
+            WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 1, "start_time": time(9, 0), "end_time": time(9, 0)}
+            ])
+
+    def test_upsert_weekly_template_replaces_existing(self):
+        # First save 2 rows
+        payload1 = WeeklyTemplateUpsertPayload(items=[
+            {"weekday": 0, "start_time": time(9, 0), "end_time": time(17, 0)},
+            {"weekday": 1, "start_time": time(8, 0), "end_time": time(16, 0)},
+        ])
+        service.upsert_weekly_template(self.db, schedule_id=self.sched1_id, payload=payload1)
+
+        # Now replace with 1 row
+        payload2 = WeeklyTemplateUpsertPayload(items=[
+            {"weekday": 2, "start_time": time(10, 0), "end_time": time(18, 0)}
+        ])
+        service.upsert_weekly_template(self.db, schedule_id=self.sched1_id, payload=payload2)
+
+        back = service.get_weekly_template_rows(self.db, schedule_id=self.sched1_id, org_id=self.org1_id)
+        self.assertEqual(len(back), 1)
+        self.assertEqual(back[0].weekday, 2)
+
+    # ---------- patch row ----------
+
+    def test_update_weekly_template_row_ok(self):
+        # seed one row
+        payload = WeeklyTemplateUpsertPayload(items=[
+            {"weekday": 0, "start_time": time(9, 0), "end_time": time(17, 0), "required_staff_count": 2}
+        ])
+        rows = service.upsert_weekly_template(self.db, schedule_id=self.sched1_id, payload=payload)
+        row_id = rows[0].id
+
+        patch = WeeklyTemplateRowUpdate(required_staff_count=3, notes="updated")
+        updated = service.update_weekly_template_row(
+            self.db, schedule_id=self.sched1_id, row_id=row_id, patch=patch
+        )
+        self.assertIsNotNone(updated)
+        self.assertEqual(updated.required_staff_count, 3)
+        self.assertEqual(updated.notes, "updated")
+
+    def test_update_weekly_template_row_wrong_schedule_returns_none(self):
+        # create on sched1
+        rows = service.upsert_weekly_template(
+            self.db, schedule_id=self.sched1_id,
+            payload=WeeklyTemplateUpsertPayload(items=[{"weekday": 0, "start_time": time(9), "end_time": time(17)}])
+        )
+        row_id = rows[0].id
+
+        # try to patch under sched2 -> None
+        out = service.update_weekly_template_row(
+            self.db, schedule_id=self.sched2_id, row_id=row_id, patch=WeeklyTemplateRowUpdate(notes="x")
+        )
+        self.assertIsNone(out)
+
+    def test_update_weekly_template_row_422_invalid_equal_times(self):
+        rows = service.upsert_weekly_template(
+            self.db, schedule_id=self.sched1_id,
+            payload=WeeklyTemplateUpsertPayload(items=[{"weekday": 0, "start_time": time(9), "end_time": time(17)}])
+        )
+        row_id = rows[0].id
+        with self.assertRaisesRegex(Exception, "cannot be equal"):
+            service.update_weekly_template_row(
+                self.db,
+                schedule_id=self.sched1_id,
+                row_id=row_id,
+                patch=WeeklyTemplateRowUpdate(start_time=time(9, 0), end_time=time(9, 0)),
+            )
+
+    def test_delete_weekly_template_row(self):
+        rows = service.upsert_weekly_template(
+            self.db, schedule_id=self.sched1_id,
+            payload=WeeklyTemplateUpsertPayload(items=[{"weekday": 4, "start_time": time(9), "end_time": time(17)}])
+        )
+        row_id = rows[0].id
+
+        ok = service.delete_weekly_template_row(self.db, schedule_id=self.sched1_id, row_id=row_id)
+        self.assertTrue(ok)
+        after = service.get_weekly_template_rows(self.db, schedule_id=self.sched1_id, org_id=self.org1_id)
+        self.assertEqual(after, [])
+
+    # ---------- generate ----------
+
+    def test_generate_replace_simple_week(self):
+        # Mon + Wed template
+        service.upsert_weekly_template(
+            self.db, schedule_id=self.sched1_id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 0, "start_time": time(9), "end_time": time(17), "role_id": self.role_id},
+                {"weekday": 2, "start_time": time(10), "end_time": time(18), "role_id": self.role_id},
+            ])
+        )
+
+        # generate for Mon..Sun that includes exactly one Mon and one Wed
+        body = WeeklyTemplateGeneratePayload(
+            start_date=date(2025, 10, 27),
+            end_date=date(2025, 11, 2),
+            policy="replace",
+        )
+        summary = service.generate_from_weekly_template(self.db, schedule_id=self.sched1_id, body=body)
+        self.assertEqual(summary, {"created": 2, "replaced": 0, "skipped": 0, "updated": 0})
+
+        # verify rows are in shifts
+        shifts = self.db.query(Shift).filter(Shift.schedule_id == self.sched1_id).all()
+        self.assertEqual(len(shifts), 2)
+
+    def test_generate_fill_missing_skips_overlaps(self):
+        # Seed template
+        service.upsert_weekly_template(
+            self.db, schedule_id=self.sched1_id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 0, "start_time": time(9), "end_time": time(17), "role_id": self.role_id},
+                {"weekday": 2, "start_time": time(10), "end_time": time(18), "role_id": self.role_id},
+            ])
+        )
+        # First, create shifts (replace)
+        body1 = WeeklyTemplateGeneratePayload(
+            start_date=date(2025, 10, 27),
+            end_date=date(2025, 11, 2),
+            policy="replace",
+        )
+        _ = service.generate_from_weekly_template(self.db, schedule_id=self.sched1_id, body=body1)
+
+        # Run again with fill_missing -> should create 0 and skip 2
+        body2 = WeeklyTemplateGeneratePayload(
+            start_date=date(2025, 10, 27),
+            end_date=date(2025, 11, 2),
+            policy="fill_missing",
+        )
+        summary2 = service.generate_from_weekly_template(self.db, schedule_id=self.sched1_id, body=body2)
+        self.assertEqual(summary2["created"], 0)
+        self.assertEqual(summary2["skipped"], 2)
+
+    def test_generate_handles_overnight(self):
+        # Fri 22:00 -> 06:00 next day
+        service.upsert_weekly_template(
+            self.db, schedule_id=self.sched1_id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 4, "start_time": time(22, 0), "end_time": time(6, 0), "role_id": self.role_id},
+            ])
+        )
+        # Week covering a Friday (2025-10-31 is Friday)
+        body = WeeklyTemplateGeneratePayload(
+            start_date=date(2025, 10, 27),  # Monday
+            end_date=date(2025, 11, 2),     # Sunday
+            policy="replace",
+        )
+        summary = service.generate_from_weekly_template(self.db, schedule_id=self.sched1_id, body=body)
+        self.assertEqual(summary["created"], 1)
+
+        # Validate end is next day
+        shift = self.db.query(Shift).filter(Shift.schedule_id == self.sched1_id).first()
+        self.assertIsNotNone(shift)
+        # Iceland == UTC; SQLite hands the timestamps back naive
+        self.assertEqual(shift.start_at.replace(tzinfo=None), datetime(2025, 10, 31, 22, 0))
+        self.assertTrue(shift.end_at > shift.start_at)
+        self.assertEqual((shift.end_at - shift.start_at), timedelta(hours=8))
+
+    def test_generate_no_template_returns_zeroes(self):
+        body = WeeklyTemplateGeneratePayload(
+            start_date=date(2025, 10, 27),
+            end_date=date(2025, 10, 27),
+            policy="replace",
+        )
+        summary = service.generate_from_weekly_template(self.db, schedule_id=self.sched1_id, body=body)
+        self.assertEqual(summary, {"created": 0, "replaced": 0, "skipped": 0, "updated": 0})
+
+    def test_generate_404_schedule(self):
+        body = WeeklyTemplateGeneratePayload(
+            start_date=date(2025, 10, 27),
+            end_date=date(2025, 11, 2),
+            policy="replace",
+        )
+        with self.assertRaisesRegex(Exception, "Schedule not found"):
+            service.generate_from_weekly_template(self.db, schedule_id=999999, body=body)
+
+
+class WeeklyTemplateGenerationTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(self.engine)
+        TestingSession = sessionmaker(bind=self.engine, expire_on_commit=False, future=True)
+        self.db: Session = TestingSession()
+
+        self.org = Organization(name="Org", timezone="Atlantic/Reykjavik")
+        self.db.add(self.org); self.db.flush()
+
+        self.role = JobRole(org_id=self.org.id, name="Cashier", weekly_hours_cap=None)
+        self.db.add(self.role); self.db.flush()
+
+        self.sched = Schedule(
+            org_id=self.org.id,
+            name="Week 44",
+            range_start=date(2025, 10, 27),
+            range_end=date(2025, 11, 2),
+            version=1,
+            status=ScheduleStatus.draft,
+            created_by=None,
+        )
+        self.emp1 = Employee(org_id=self.org.id, display_name="Emp1")
+        self.emp2 = Employee(org_id=self.org.id, display_name="Emp2")
+        self.db.add_all([self.sched, self.emp1, self.emp2]); self.db.commit()
+
+        self.week = dict(start_date=date(2025, 10, 27), end_date=date(2025, 11, 2))
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def _seed_template(self, *items):
+        service.upsert_weekly_template(
+            self.db, schedule_id=self.sched.id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"role_id": self.role.id, **it} for it in items
+            ]),
+        )
+
+    # ---------- save (diff-based upsert) ----------
+
+    def test_upsert_keeps_ids_of_unchanged_rows(self):
+        first = service.upsert_weekly_template(
+            self.db, schedule_id=self.sched.id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 0, "start_time": time(9), "end_time": time(17)},
+                {"weekday": 1, "start_time": time(9), "end_time": time(17)},
+            ]),
+        )
+        ids = {r.weekday: r.id for r in first}
+
+        second = service.upsert_weekly_template(
+            self.db, schedule_id=self.sched.id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 0, "start_time": time(9), "end_time": time(17)},
+                {"weekday": 1, "start_time": time(9), "end_time": time(17), "required_staff_count": 3, "notes": "busy"},
+                {"weekday": 2, "start_time": time(9), "end_time": time(17)},
+            ]),
+        )
+        self.assertEqual([r.weekday for r in second], [0, 1, 2])
+        self.assertEqual(second[0].id, ids[0])
+        self.assertEqual(second[1].id, ids[1])
+        self.assertEqual(second[1].required_staff_count, 3)
+        self.assertEqual(second[1].notes, "busy")
+        self.assertNotIn(second[2].id, ids.values())
+
+        back = service.get_weekly_template_rows(self.db, schedule_id=self.sched.id)
+        self.assertEqual([(r.id, r.required_staff_count) for r in back], [(r.id, r.required_staff_count) for r in second])
+
+    def test_upsert_deletes_vanished_rows(self):
+        service.upsert_weekly_template(
+            self.db, schedule_id=self.sched.id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 0, "start_time": time(9), "end_time": time(17)},
+                {"weekday": 1, "start_time": time(8), "end_time": time(16)},
+            ]),
+        )
+        rows = service.upsert_weekly_template(
+            self.db, schedule_id=self.sched.id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 1, "start_time": time(8), "end_time": time(16)},
+            ]),
+        )
+        self.assertEqual([r.weekday for r in rows], [1])
+        self.assertEqual(self.db.query(WeeklyTemplate).count(), 1)
+
+    def test_upsert_unchanged_payload_issues_no_writes(self):
+        payload = WeeklyTemplateUpsertPayload(items=[
+            {"weekday": d, "start_time": time(9), "end_time": time(17)} for d in range(7)
+        ])
+        service.upsert_weekly_template(self.db, schedule_id=self.sched.id, payload=payload)
+
+        statements: list[str] = []
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement.split()[0].upper())
+        event.listen(self.engine, "before_cursor_execute", _record)
+        try:
+            service.upsert_weekly_template(self.db, schedule_id=self.sched.id, payload=payload)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", _record)
+
+        self.assertNotIn("INSERT", statements)
+        self.assertNotIn("UPDATE", statements)
+        self.assertNotIn("DELETE", statements)
+
+    def test_upsert_duplicate_slots_409(self):
+        payload = WeeklyTemplateUpsertPayload(items=[
+            {"weekday": 0, "start_time": time(9), "end_time": time(17)},
+            {"weekday": 0, "start_time": time(9), "end_time": time(17)},
+        ])
+        with self.assertRaisesRegex(Exception, "duplicate slots"):
+            service.upsert_weekly_template(self.db, schedule_id=self.sched.id, payload=payload)
+
+    # ---------- generate ----------
+
+    def _generate(self, policy: str) -> dict:
+        return service.generate_from_weekly_template(
+            self.db, schedule_id=self.sched.id,
+            body=WeeklyTemplateGeneratePayload(policy=policy, **self.week),
+        )
+
+    def test_generate_reconcile_keeps_matching_shifts_and_assignments(self):
+        self._seed_template(
+            {"weekday": 0, "start_time": time(9), "end_time": time(17)},
+            {"weekday": 2, "start_time": time(10), "end_time": time(18)},
+        )
+        self._generate("replace")
+        monday = self.db.query(Shift).filter(Shift.start_at == datetime(2025, 10, 27, 9, tzinfo=timezone.utc)).one()
+        self.db.add(Assignment(shift_id=monday.id, employee_id=self.emp1.id))
+        self.db.commit()
+
+        # tweak: Monday needs two people now, Wednesday moves an hour, Friday is new
+        self._seed_template(
+            {"weekday": 0, "start_time": time(9), "end_time": time(17), "required_staff_count": 2},
+            {"weekday": 2, "start_time": time(11), "end_time": time(18)},
+            {"weekday": 4, "start_time": time(9), "end_time": time(13)},
+        )
+        summary = self._generate("reconcile")
+        self.assertEqual(summary, {"created": 2, "replaced": 1, "skipped": 0, "updated": 1})
+
+        shifts = self.db.query(Shift).filter(Shift.schedule_id == self.sched.id).order_by(Shift.start_at).all()
+        self.assertEqual(len(shifts), 3)
+        self.assertEqual(shifts[0].id, monday.id)
+        self.assertEqual(shifts[0].required_staff_count, 2)
+        self.assertEqual(self.db.query(Assignment).filter(Assignment.shift_id == monday.id).count(), 1)
+
+    def test_generate_reconcile_unchanged_template_is_a_noop(self):
+        self._seed_template({"weekday": 0, "start_time": time(9), "end_time": time(17)})
+        self._generate("replace")
+        before = [s.id for s in self.db.query(Shift).all()]
+
+        summary = self._generate("reconcile")
+        self.assertEqual(summary, {"created": 0, "replaced": 0, "skipped": 1, "updated": 0})
+        self.assertEqual([s.id for s in self.db.query(Shift).all()], before)
+
+    # ---------- generate + auto-assign ----------
+
+    def test_generate_and_assign_staffs_new_shifts(self):
+        self._seed_template(
+            {"weekday": 0, "start_time": time(9), "end_time": time(17), "required_staff_count": 2},
+            {"weekday": 3, "start_time": time(9), "end_time": time(13)},
+        )
+        body = WeeklyTemplateGeneratePayload(policy="replace", **self.week)
+        summary = service.generate_and_assign_from_weekly_template(self.db, schedule_id=self.sched.id, body=body)
+
+        self.assertEqual(summary["created"], 2)
+        self.assertEqual(summary["assigned"], 3)
+        self.assertEqual(summary["skipped_no_candidates"], 0)
+
+        shifts = self.db.query(Shift).filter(Shift.schedule_id == self.sched.id).all()
+        self.assertEqual(len(shifts), 2)
+        rows = self.db.query(Assignment).all()
+        self.assertEqual(len(rows), 3)
+        self.assertTrue({r.shift_id for r in rows} <= {s.id for s in shifts})
+
+    def test_generate_and_assign_respects_unavailability(self):
+        self._seed_template({"weekday": 0, "start_time": time(9), "end_time": time(17)})
+        self.db.add(Unavailability(
+            employee_id=self.emp1.id,
+            start_at=datetime(2025, 10, 27, 8, 0, tzinfo=timezone.utc),
+            end_at=datetime(2025, 10, 27, 18, 0, tzinfo=timezone.utc),
+        ))
+        self.db.commit()
+
+        body = WeeklyTemplateGeneratePayload(policy="replace", **self.week)
+        summary = service.generate_and_assign_from_weekly_template(self.db, schedule_id=self.sched.id, body=body)
+
+        self.assertEqual(summary["assigned"], 1)
+        rows = self.db.query(Assignment).all()
+        self.assertEqual([r.employee_id for r in rows], [self.emp2.id])
+
+    def test_generate_and_assign_rolls_back_everything_on_failure(self):
+        self._seed_template({"weekday": 0, "start_time": time(9), "end_time": time(17)})
+        body = WeeklyTemplateGeneratePayload(policy="replace", **self.week)
+
+        with patch("weeklytemplate.service.assign_shifts", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                service.generate_and_assign_from_weekly_template(self.db, schedule_id=self.sched.id, body=body)
+
+        # the generated shifts were never committed
+        self.assertEqual(self.db.query(Shift).count(), 0)
+
+    def test_generate_and_assign_no_template_returns_zeroes(self):
+        body = WeeklyTemplateGeneratePayload(policy="replace", **self.week)
+        summary = service.generate_and_assign_from_weekly_template(self.db, schedule_id=self.sched.id, body=body)
+        self.assertEqual(summary["created"], 0)
+        self.assertEqual(summary["assigned"], 0)
+
+    def test_generate_and_assign_404_schedule(self):
+        body = WeeklyTemplateGeneratePayload(policy="replace", **self.week)
+        with self.assertRaisesRegex(Exception, "Schedule not found"):
+            service.generate_and_assign_from_weekly_template(self.db, schedule_id=999999, body=body)
+
+
+
+class MultiScheduleGenerationTests(unittest.TestCase):
+    def setUp(self):
+        # file-backed DB: each worker opens its own session/connection
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_engine(
+            f"sqlite:///{self.path}", future=True, connect_args={"check_same_thread": False, "timeout": 30}
+        )
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False, future=True)
+        self.db: Session = self.Session()
+
+        org = Organization(name="Org", timezone="Atlantic/Reykjavik")
+        self.db.add(org); self.db.flush()
+        role = JobRole(org_id=org.id, name="Cashier")
+        self.db.add(role); self.db.flush()
+        self.role_id = role.id
+
+        self.today = date(2025, 11, 3)  # Monday
+        self.scheds = []
+        for i in range(3):
+            sched = Schedule(
+                org_id=org.id, name=f"Location {i}",
+                range_start=date(2025, 11, 1), range_end=date(2025, 12, 31),
+                version=i + 1, status=ScheduleStatus.published,
+            )
+            self.db.add(sched); self.db.flush()
+            self.db.add(WeeklyTemplate(
+                org_id=org.id, schedule_id=sched.id, weekday=0, role_id=role.id,
+                start_time=time(9), end_time=time(17),
+            ))
+            self.scheds.append(sched)
+
+        # schedule without a template is never picked up
+        self.db.add(Schedule(
+            org_id=org.id, name="Empty", range_start=date(2025, 11, 1), range_end=date(2025, 12, 31),
+            version=9, status=ScheduleStatus.draft,
+        ))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        os.remove(self.path)
+
+    def _shift_count(self) -> int:
+        return self.db.query(Shift).count()
+
+    def test_generates_n_weeks_ahead_and_sets_watermark(self):
+        results = run_rolling_horizon(self.Session, weeks=2, concurrency=3, today=self.today)
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r["status"] == "generated" for r in results))
+        # two Mondays in the horizon, for each of the three schedules
+        self.assertEqual(self._shift_count(), 6)
+
+        self.db.expire_all()
+        for sched in self.scheds:
+            self.assertEqual(self.db.get(Schedule, sched.id).generated_through, self.today + timedelta(days=13))
+
+    def test_second_run_is_a_noop(self):
+        run_rolling_horizon(self.Session, weeks=2, concurrency=2, today=self.today)
+        again = run_rolling_horizon(self.Session, weeks=2, concurrency=2, today=self.today)
+        self.assertEqual(again, [])
+        self.assertEqual(self._shift_count(), 6)
+
+    def test_advancing_horizon_only_fills_new_days(self):
+        run_rolling_horizon(self.Session, weeks=2, concurrency=1, today=self.today)
+        later = run_rolling_horizon(self.Session, weeks=2, concurrency=1, today=self.today + timedelta(days=7))
+
+        self.assertEqual({r["start_date"] for r in later}, {"2025-11-17"})
+        self.assertEqual(sum(r["created"] for r in later), 3)
+        self.assertEqual(self._shift_count(), 9)
+
+    def test_horizon_is_capped_at_range_end(self):
+        results = run_rolling_horizon(self.Session, weeks=52, concurrency=2, today=self.today)
+        self.assertEqual({r["end_date"] for r in results}, {"2025-12-31"})
+        self.assertEqual(run_rolling_horizon(self.Session, weeks=52, concurrency=2, today=self.today), [])
+
+    def test_template_change_resets_watermark_and_fills_new_slots(self):
+        run_rolling_horizon(self.Session, weeks=2, concurrency=1, today=self.today)
+        sched_id = self.scheds[0].id
+
+        # add a Wednesday slot to one schedule's template after it was generated
+        service.upsert_weekly_template(
+            self.db, schedule_id=sched_id,
+            payload=WeeklyTemplateUpsertPayload(items=[
+                {"weekday": 0, "start_time": time(9), "end_time": time(17), "role_id": self.role_id},
+                {"weekday": 2, "start_time": time(9), "end_time": time(17), "role_id": self.role_id},
+            ]),
+        )
+        self.db.expire_all()
+        self.assertIsNone(self.db.get(Schedule, sched_id).generated_through)
+
+        again = run_rolling_horizon(self.Session, weeks=2, concurrency=1, today=self.today)
+        self.assertEqual([(r["schedule_id"], r["created"], r["skipped"]) for r in again], [(sched_id, 2, 2)])
+        self.assertEqual(self._shift_count(), 8)
+
+    def test_template_row_delete_resets_watermark(self):
+        run_rolling_horizon(self.Session, weeks=2, concurrency=1, today=self.today)
+        sched_id = self.scheds[1].id
+        row = self.db.query(WeeklyTemplate).filter(WeeklyTemplate.schedule_id == sched_id).one()
+        self.assertTrue(service.delete_weekly_template_row(self.db, schedule_id=sched_id, row_id=row.id))
+        self.db.expire_all()
+        self.assertIsNone(self.db.get(Schedule, sched_id).generated_through)
+
+    # ---------- batch generation ----------
+
+    def test_batch_generates_every_schedule_in_parallel(self):
+        body = WeeklyTemplateGeneratePayload(start_date=date(2025, 12, 1), end_date=date(2025, 12, 31), policy="replace")
+        ids = [s.id for s in self.scheds]
+        results = generate_for_schedules(self.Session, schedule_ids=ids, body=body, concurrency=3)
+
+        self.assertEqual([r["schedule_id"] for r in results], ids)
+        self.assertTrue(all(r["status"] == "ok" for r in results))
+        # five Mondays in December 2025
+        self.assertEqual([r["created"] for r in results], [5, 5, 5])
+        self.assertTrue(all(r["elapsed_ms"] >= 0 for r in results))
+        self.assertEqual(self._shift_count(), 15)
+
+    def test_batch_reports_failures_per_schedule(self):
+        body = WeeklyTemplateGeneratePayload(start_date=date(2025, 12, 1), end_date=date(2025, 12, 7), policy="replace")
+        results = generate_for_schedules(self.Session, schedule_ids=[self.scheds[0].id, 999999], body=body)
+
+        self.assertEqual(results[0]["status"], "ok")
+        self.assertEqual(results[0]["created"], 1)
+        self.assertEqual(results[1]["status"], "error")
+        self.assertEqual(results[1]["detail"], "Schedule not found")
+
+    def test_batch_unexpected_error_stays_with_its_schedule(self):
+        body = WeeklyTemplateGeneratePayload(start_date=date(2025, 12, 1), end_date=date(2025, 12, 7), policy="replace")
+        ids = [s.id for s in self.scheds]
+        real = batch.expand_weekly_template
+
+        def flaky(db, *, sched, items, body):
+            if sched.id == ids[1]:
+                raise ValueError("bad template")
+            return real(db, sched=sched, items=items, body=body)
+
+        with patch("weeklytemplate.batch.expand_weekly_template", side_effect=flaky):
+            results = generate_for_schedules(self.Session, schedule_ids=ids, body=body, concurrency=1)
+
+        self.assertEqual([r["status"] for r in results], ["ok", "error", "ok"])
+        self.assertEqual(results[1]["detail"], "unexpected error (ValueError)")
+        self.assertEqual([r["created"] for r in results], [1, 0, 1])
+        self.assertEqual(self._shift_count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import DateTime, String, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import DateTime, String, ForeignKey, Index, UniqueConstraint, func, literal_column
 from core.database import Base
 
 class Unavailability(Base):
@@ -19,3 +19,11 @@ class Unavailability(Base):
         Index("ix_unavail_emp_start", "employee_id", "start_at"),
         UniqueConstraint("employee_id", "start_at", "end_at", name="unique_unavailable_exact"),
     )
+
+# GiST over [start_at, end_at) for `&&` overlap lookups (PostgreSQL only, see core.ranges)
+Index(
+    "ix_unavail_emp_during",
+    Unavailability.employee_id,
+    func.tstzrange(Unavailability.start_at, Unavailability.end_at, literal_column("'[)'")),
+    postgresql_using="gist",
+).ddl_if(dialect="postgresql")
@@ -3,12 +3,13 @@ from datetime import datetime, timezone
 from typing import Optional, List
 
 from fastapi import HTTPException
-from sqlalchemy import select, and_
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from .models import Unavailability
 from .schema import UnavailabilityCreate, UnavailabilityUpdate
 from employee.models import Employee
+from core.ranges import overlaps
 
 
 # -------- helpers --------
@@ -69,8 +70,7 @@ def get_unavailabilities(
     if overlaps_start is not None and overlaps_end is not None:
         s = _aware(overlaps_start)
         e = _aware(overlaps_end)
-        # overlap if (start < e) AND (end > s)
-        stmt = stmt.where(and_(Unavailability.start_at < e, Unavailability.end_at > s))
+        stmt = stmt.where(overlaps(Unavailability.start_at, Unavailability.end_at, s, e))
 
     stmt = stmt.order_by(Unavailability.employee_id, Unavailability.start_at.asc())
     return list(db.scalars(stmt))
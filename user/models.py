@@ -18,6 +18,9 @@ class User(Base):
     org_id: Mapped[int | None] = mapped_column(ForeignKey("organizations.id"), index=True, nullable=True)
     is_manager: Mapped[bool] = mapped_column(Boolean, server_default=text("false"), nullable=False)
 
+    # carried in access tokens as "tv"; bumping it revokes every token issued before
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # relationships
@@ -7,7 +7,7 @@ from core.database import get_db
 from user.models import User
 from authz.deps import require_manager
 from user.schemas import UserSchema, UserCreate, ManagerSignup
-from user.service import get_users, create_user, get_user, delete_user, signup_manager_with_org
+from user.service import get_users, create_user, get_user, delete_user, signup_manager_with_org, revoke_tokens
 
 user_router = APIRouter(
     prefix='/users',
@@ -23,8 +23,13 @@ def user_list(db: Session = Depends(get_db)):
 
 # Get current user
 @user_router.get('/me', response_model=UserSchema)
-def user_list(current_user: User = Depends(get_current_active_user)):
-    return current_user
+def user_list(current_user = Depends(get_current_active_user), db: Session = Depends(get_db)):
+    return get_user(db, current_user.id)
+
+# Sign out everywhere: every token issued so far stops working
+@user_router.post('/me/revoke-tokens', status_code=status.HTTP_204_NO_CONTENT)
+def user_revoke_tokens(current_user = Depends(get_current_active_user), db: Session = Depends(get_db)):
+    revoke_tokens(db, current_user.id)
 
 # Get user details
 @user_router.get('/{user_id}', response_model=UserSchema)
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from auth.utils.auth_utils import get_password_hash
+from auth.services.principal_cache import invalidate_user
 from organization.models import Organization
 from user.models import User
 from user.schemas import UserCreate, ManagerSignup
@@ -18,6 +19,19 @@ def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
 
+def get_token_state(db: Session, user_id: int):
+    """(token_version, is_active) for validating a claims-based token, or None."""
+    return db.query(User.token_version, User.is_active).filter(User.id == user_id).first()
+
+
+def revoke_tokens(db: Session, user_id: int):
+    db.query(User).filter(User.id == user_id).update(
+        {User.token_version: User.token_version + 1}, synchronize_session=False
+    )
+    db.commit()
+    invalidate_user(user_id)
+
+
 def create_user(db: Session, user: UserCreate):
     db_user = User(
         email=str(user.email),
@@ -36,6 +50,7 @@ def delete_user(db: Session, user_id: int):
     if db_user:
         db.delete(db_user)
         db.commit()
+        invalidate_user(user_id)
     return
 
 def signup_manager_with_org(db: Session, p: ManagerSignup) -> User:
@@ -0,0 +1,108 @@
+"""
+Batch generation: expand the weekly templates of many schedules for the
+same date window in parallel, one session per worker.
+
+Also usable from the command line for the monthly rollover:
+
+    python -m weeklytemplate.batch --start 2025-12-01 --end 2025-12-31 --policy replace 1 2 3
+"""
+from __future__ import annotations
+import argparse
+import json
+import time as _time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Iterable, Optional, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from schedule.models import Schedule
+from .schema import WeeklyTemplateGeneratePayload
+from .service import load_template_items, expand_weekly_template
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BATCH_CONCURRENCY = 4
+
+
+def map_in_pool(fn: Callable[[T], R], items: Iterable[T], concurrency: int) -> list[R]:
+    """Run fn over items with at most `concurrency` workers, keeping input order."""
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items)))) as pool:
+        return list(pool.map(fn, items))
+
+
+def _generate_one(session_factory: Callable[[], Session], schedule_id: int, body: WeeklyTemplateGeneratePayload) -> dict:
+    started = _time.perf_counter()
+    result = {"schedule_id": schedule_id, "created": 0, "replaced": 0, "skipped": 0, "updated": 0}
+    db = session_factory()
+    try:
+        sched = db.get(Schedule, schedule_id)
+        if not sched:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        items = load_template_items(db, schedule_id)
+        if items:
+            to_insert, counts = expand_weekly_template(db, sched=sched, items=items, body=body)
+            db.commit()
+            result.update(created=len(to_insert), **counts)
+        result["status"] = "ok"
+    except HTTPException as exc:
+        db.rollback()
+        result.update(status="error", detail=str(exc.detail))
+    except SQLAlchemyError:
+        db.rollback()
+        result.update(status="error", detail="database error")
+    except Exception as exc:
+        # anything else is still this schedule's failure; the others keep their results
+        db.rollback()
+        result.update(status="error", detail=f"unexpected error ({type(exc).__name__})")
+    finally:
+        db.close()
+    result["elapsed_ms"] = round((_time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def generate_for_schedules(
+    session_factory: Callable[[], Session],
+    *,
+    schedule_ids: list[int],
+    body: WeeklyTemplateGeneratePayload,
+    concurrency: int = BATCH_CONCURRENCY,
+    ) -> list[dict]:
+    """
+    Generate shifts for every schedule in `schedule_ids` over the same window.
+    Each schedule is its own transaction, so one failure does not undo the rest.
+    """
+    return map_in_pool(
+        lambda sid: _generate_one(session_factory, sid, body),
+        dict.fromkeys(schedule_ids),  # de-duplicate, keep order
+        concurrency,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate shifts from weekly templates for many schedules at once.")
+    parser.add_argument("schedule_ids", type=int, nargs="+")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="last day (YYYY-MM-DD)")
+    parser.add_argument("--policy", choices=["replace", "fill_missing", "reconcile"], default="replace")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    from core.database import SessionLocal
+    import models_bootstrap  # noqa: F401  (register all mappers)
+
+    body = WeeklyTemplateGeneratePayload(start_date=args.start, end_date=args.end, policy=args.policy)
+    results = generate_for_schedules(
+        SessionLocal, schedule_ids=args.schedule_ids, body=body, concurrency=args.concurrency
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
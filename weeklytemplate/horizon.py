@@ -0,0 +1,145 @@
+"""
+Rolling-horizon generation: keep every active schedule generated N weeks
+ahead from its weekly template.
+
+Meant to be run from cron, e.g. every night:
+
+    python -m weeklytemplate.horizon --weeks 4 --concurrency 4
+"""
+from __future__ import annotations
+import argparse
+import json
+from datetime import date, timedelta
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, exists, or_, and_
+from sqlalchemy.orm import Session
+
+from schedule.models import Schedule, ScheduleStatus
+from .models import WeeklyTemplate
+from .schema import WeeklyTemplateGeneratePayload
+from .service import load_template_items, expand_weekly_template
+from .batch import map_in_pool
+
+
+def _due_schedules(db: Session, *, today: date, horizon_end: date) -> list[Schedule]:
+    """
+    Schedules that still have days to generate inside the horizon.
+    Everything already generated through its target is filtered out in SQL,
+    so a run with nothing to do is a single query.
+    """
+    has_template = exists().where(WeeklyTemplate.schedule_id == Schedule.id)
+    stmt = (
+        select(Schedule)
+        .where(
+            Schedule.status.in_([ScheduleStatus.draft, ScheduleStatus.published]),
+            Schedule.range_end >= today,
+            Schedule.range_start <= horizon_end,
+            or_(
+                Schedule.generated_through.is_(None),
+                and_(
+                    Schedule.generated_through < Schedule.range_end,
+                    Schedule.generated_through < horizon_end,
+                ),
+            ),
+            has_template,
+        )
+        .order_by(Schedule.id)
+    )
+    return list(db.scalars(stmt))
+
+
+def _window(sched: Schedule, *, today: date, horizon_end: date) -> Optional[tuple[date, date]]:
+    start = max(sched.range_start, today)
+    if sched.generated_through is not None:
+        start = max(start, sched.generated_through + timedelta(days=1))
+    end = min(sched.range_end, horizon_end)
+    if start > end:
+        return None
+    return start, end
+
+
+def _extend_schedule(session_factory: Callable[[], Session], schedule_id: int, *, today: date, horizon_end: date) -> dict:
+    """Generate the missing days for one schedule in its own session/transaction."""
+    db = session_factory()
+    try:
+        # Lock the row so overlapping runs never generate the same schedule twice
+        sched = db.scalars(
+            select(Schedule).where(Schedule.id == schedule_id).with_for_update(skip_locked=True)
+        ).first()
+        if sched is None:
+            return {"schedule_id": schedule_id, "created": 0, "skipped": 0, "status": "locked"}
+
+        window = _window(sched, today=today, horizon_end=horizon_end)
+        if window is None:
+            db.rollback()
+            return {"schedule_id": schedule_id, "created": 0, "skipped": 0, "status": "up_to_date"}
+
+        start, end = window
+        try:
+            items = load_template_items(db, schedule_id)
+        except HTTPException as exc:
+            db.rollback()
+            return {"schedule_id": schedule_id, "created": 0, "skipped": 0, "status": "error", "detail": exc.detail}
+
+        body = WeeklyTemplateGeneratePayload(start_date=start, end_date=end, policy="fill_missing")
+        created, counts = expand_weekly_template(db, sched=sched, items=items, body=body)
+        sched.generated_through = end
+        db.commit()
+        return {
+            "schedule_id": schedule_id,
+            "created": len(created),
+            "skipped": counts["skipped"],
+            "status": "generated",
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run_rolling_horizon(
+    session_factory: Callable[[], Session],
+    *,
+    weeks: int = 4,
+    concurrency: int = 4,
+    today: Optional[date] = None,
+    ) -> list[dict]:
+    """
+    Generate every due schedule through today + `weeks` using fill_missing,
+    at most `concurrency` schedules at a time. Safe to run repeatedly.
+    """
+    today = today or date.today()
+    horizon_end = today + timedelta(weeks=weeks) - timedelta(days=1)
+
+    db = session_factory()
+    try:
+        due = [s.id for s in _due_schedules(db, today=today, horizon_end=horizon_end)]
+    finally:
+        db.close()
+    return map_in_pool(
+        lambda sid: _extend_schedule(session_factory, sid, today=today, horizon_end=horizon_end),
+        due,
+        concurrency,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Keep schedules generated N weeks ahead from their weekly template.")
+    parser.add_argument("--weeks", type=int, default=4, help="how many weeks ahead to keep generated")
+    parser.add_argument("--concurrency", type=int, default=4, help="schedules generated in parallel")
+    args = parser.parse_args(argv)
+
+    from core.database import SessionLocal
+    import models_bootstrap  # noqa: F401  (register all mappers)
+
+    results = run_rolling_horizon(SessionLocal, weeks=args.weeks, concurrency=args.concurrency)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 from __future__ import annotations
 from typing import Dict, Any
 
+from sqlalchemy import select
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from core.database import get_db
+from core.database import get_db, SessionLocal
 from auth.services.auth_service import get_current_active_user
 from authz.deps import require_manager
 
@@ -14,8 +16,12 @@ from .schema import (
     WeeklyTemplateUpsertPayload,
     WeeklyTemplateRowUpdate,
     WeeklyTemplateGeneratePayload,
+    WeeklyTemplateGenerateAssignResponse,
+    WeeklyTemplateBatchGeneratePayload,
+    WeeklyTemplateBatchGenerateResult,
 )
-from . import service
+from . import service, batch
+from schedule.models import Schedule
 from schedule.service import get_schedule_for_org
 
 weeklytemplate_router = APIRouter(prefix="/schedules", tags=["Weekly Template"])
@@ -26,6 +32,34 @@ def _ensure_schedule_in_org(db: Session, schedule_id: int, org_id: int) -> None:
         raise HTTPException(status_code=404, detail="Schedule not found")
 
 
+@weeklytemplate_router.post(
+    "/weekly-template/generate-batch",
+    response_model=list[WeeklyTemplateBatchGenerateResult],
+)
+def generate_batch_endpoint(
+    payload: WeeklyTemplateBatchGeneratePayload,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    _mgr = Depends(require_manager),
+    ):
+    """
+    Generate shifts for many schedules over the same window in parallel.
+    Every schedule runs in its own transaction; per-schedule counts and
+    timings are returned in request order.
+    """
+    ids = set(payload.schedule_ids)
+    owned = set(db.scalars(
+        select(Schedule.id).where(Schedule.id.in_(ids), Schedule.org_id == user.org_id)
+    ))
+    if owned != ids:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
+    body = WeeklyTemplateGeneratePayload(
+        start_date=payload.start_date, end_date=payload.end_date, policy=payload.policy
+    )
+    return batch.generate_for_schedules(SessionLocal, schedule_ids=payload.schedule_ids, body=body)
+
+
 @weeklytemplate_router.get("/{schedule_id}/weekly-template", response_model=list[WeeklyTemplateSchema])
 def list_weekly_template(
     schedule_id: int,
@@ -98,3 +132,22 @@ def generate_from_template_endpoint(
     ) -> Dict[str, int]:
     _ensure_schedule_in_org(db, schedule_id, user.org_id)
     return service.generate_from_weekly_template(db, schedule_id=schedule_id, body=payload)
+
+
+@weeklytemplate_router.post(
+    "/{schedule_id}/weekly-template/generate-and-assign",
+    response_model=WeeklyTemplateGenerateAssignResponse,
+)
+def generate_and_assign_endpoint(
+    schedule_id: int,
+    payload: WeeklyTemplateGeneratePayload,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_active_user),
+    _mgr = Depends(require_manager),
+    ):
+    """
+    Generate shifts from the template and auto-assign the new ones,
+    committed together as a single transaction.
+    """
+    _ensure_schedule_in_org(db, schedule_id, user.org_id)
+    return service.generate_and_assign_from_weekly_template(db, schedule_id=schedule_id, body=payload)
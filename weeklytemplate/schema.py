@@ -82,7 +82,7 @@ class WeeklyTemplateRowUpdate(BaseModel):
 class WeeklyTemplateGeneratePayload(BaseModel):
     start_date: date
     end_date: date
-    policy: Literal["replace", "fill_missing"] = "replace"
+    policy: Literal["replace", "fill_missing", "reconcile"] = "replace"
     model_config = ConfigDict(extra="forbid")
     @model_validator(mode="after")
     def validate_range(self):
@@ -90,3 +90,29 @@ class WeeklyTemplateGeneratePayload(BaseModel):
             raise ValueError("end_date must be on/after start_date")
         return self
 
+
+# ---------- API → Client (generate shifts, then auto-assign them) ----------
+class WeeklyTemplateGenerateAssignResponse(BaseModel):
+    created: int
+    replaced: int
+    skipped: int
+    updated: int = 0
+    assigned: int
+    skipped_full: int
+    skipped_no_candidates: int
+
+
+# ---------- Client → API (generate many schedules at once) ----------
+class WeeklyTemplateBatchGeneratePayload(WeeklyTemplateGeneratePayload):
+    schedule_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+
+class WeeklyTemplateBatchGenerateResult(BaseModel):
+    schedule_id: int
+    status: Literal["ok", "error"]
+    created: int = 0
+    replaced: int = 0
+    skipped: int = 0
+    updated: int = 0
+    elapsed_ms: float
+    detail: Optional[str] = None
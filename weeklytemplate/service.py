@@ -3,18 +3,22 @@ from datetime import datetime, timedelta, date, time, timezone
 from typing import Optional, Iterable
 
 from fastapi import HTTPException
-from sqlalchemy import select, delete, and_, or_, func
+from sqlalchemy import select, delete, insert, update, and_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .models import WeeklyTemplate
 from .schema import (
+    WeeklyTemplateSchema,
     WeeklyTemplateUpsertPayload,
     WeeklyTemplateRowUpdate,
     WeeklyTemplateGeneratePayload,
 )
 from schedule.models import Schedule
+from schedule.service import bump_change_seq
 from shift.models import Shift
+from core.ranges import overlaps
+from assignment.auto_assign_service import load_constraint_snapshot, assign_shifts
 
 # Timezone is set to iceland for now
 
@@ -47,49 +51,97 @@ def get_weekly_template_rows(
     return list(db.scalars(stmt))
 
 
-# ---------- Replace-all upsert (Save weekly template) ----------
+# ---------- Diff-based upsert (Save weekly template) ----------
+
+def _slot_key(weekday: int, location_id: Optional[int], role_id: Optional[int], start_time: time, end_time: time) -> tuple:
+    """Mirror of the uq_weeklytpl_slot unique constraint (minus schedule_id)."""
+    return (weekday, location_id, role_id, start_time, end_time)
+
+def _reset_generated_through(db: Session, schedule_id: int) -> None:
+    """A changed template invalidates the horizon watermark; the next run re-fills (fill_missing) from today."""
+    db.execute(update(Schedule).where(Schedule.id == schedule_id).values(generated_through=None))
 
 def upsert_weekly_template(
     db: Session,
     *,
     schedule_id: int,
     payload: WeeklyTemplateUpsertPayload,
-    ) -> list[WeeklyTemplate]:
+    ) -> list[WeeklyTemplateSchema]:
+    """
+    Make the schedule's template match the payload, touching only what changed.
+    Rows are matched on the slot key; matched rows keep their ids, changed ones
+    are updated, vanished ones deleted and new ones bulk-inserted with RETURNING.
+    """
     sched = db.get(Schedule, schedule_id)
     if not sched:
         raise HTTPException(status_code=404, detail="Schedule not found")
 
-    # Delete current rows for this schedule 
-    db.execute(delete(WeeklyTemplate).where(WeeklyTemplate.schedule_id == schedule_id))
-
-    rows: list[WeeklyTemplate] = []
+    existing: dict[tuple, WeeklyTemplate] = {}
+    to_delete: list[int] = []
+    for row in db.scalars(select(WeeklyTemplate).where(WeeklyTemplate.schedule_id == schedule_id)):
+        key = _slot_key(row.weekday, row.location_id, row.role_id, row.start_time, row.end_time)
+        if key in existing:
+            # NULL location/role slips past the DB constraint; keep the first one
+            to_delete.append(row.id)
+        else:
+            existing[key] = row
+
+    kept: list[WeeklyTemplate] = []
+    to_insert: list[dict] = []
+    updated = False
+    seen: set[tuple] = set()
     for it in payload.items:
         if it.start_time == it.end_time:
             raise HTTPException(status_code=422, detail="start time and end time cannot be equal")
 
-        row = WeeklyTemplate(
-            org_id=sched.org_id,
-            schedule_id=schedule_id,
-            weekday=it.weekday,
-            location_id=it.location_id,
-            role_id=it.role_id,
-            start_time=it.start_time,
-            end_time=it.end_time,
-            required_staff_count=it.required_staff_count,
-            notes=it.notes,
-        )
-        rows.append(row)
+        key = _slot_key(it.weekday, it.location_id, it.role_id, it.start_time, it.end_time)
+        if key in seen:
+            raise HTTPException(status_code=409, detail="Weekly template contains duplicate slots")
+        seen.add(key)
+
+        row = existing.pop(key, None)
+        if row is None:
+            to_insert.append(dict(
+                org_id=sched.org_id,
+                schedule_id=schedule_id,
+                weekday=it.weekday,
+                location_id=it.location_id,
+                role_id=it.role_id,
+                start_time=it.start_time,
+                end_time=it.end_time,
+                required_staff_count=it.required_staff_count,
+                notes=it.notes,
+            ))
+            continue
+
+        if row.required_staff_count != it.required_staff_count or row.notes != it.notes:
+            row.required_staff_count = it.required_staff_count
+            row.notes = it.notes
+            updated = True
+        kept.append(row)
+
+    to_delete.extend(row.id for row in existing.values())
 
-    db.add_all(rows)
     try:
+        if to_delete:
+            db.execute(delete(WeeklyTemplate).where(WeeklyTemplate.id.in_(to_delete)))
+
+        inserted: list[WeeklyTemplate] = []
+        if to_insert:
+            inserted = list(db.scalars(insert(WeeklyTemplate).returning(WeeklyTemplate), to_insert))
+
+        rows = sorted(kept + inserted, key=lambda r: (r.weekday, r.start_time, r.id))
+        # Snapshot before commit so the response never triggers per-row refreshes
+        result = [WeeklyTemplateSchema.model_validate(r) for r in rows]
+        if to_delete or to_insert or updated:
+            bump_change_seq(db, [schedule_id])
+            _reset_generated_through(db, schedule_id)
         db.commit()
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=409, detail="Weekly template contains duplicate slots")
 
-    for r in rows:
-        db.refresh(r)
-    return rows
+    return result
 
 
 # ---------- PATCH a single row ----------
@@ -116,6 +168,8 @@ def update_weekly_template_row(
         raise HTTPException(status_code=422, detail="weekday must be between 0 and 6")
 
     try:
+        bump_change_seq(db, [schedule_id])
+        _reset_generated_through(db, schedule_id)
         db.commit()
         db.refresh(row)
     except IntegrityError:
@@ -128,6 +182,8 @@ def delete_weekly_template_row(db: Session, *, schedule_id: int, row_id: int) ->
     row = db.get(WeeklyTemplate, row_id)
     if not row or row.schedule_id != schedule_id:
         return False
+    bump_change_seq(db, [schedule_id])
+    _reset_generated_through(db, schedule_id)
     db.delete(row)
     db.commit()
     return True
@@ -160,26 +216,151 @@ def _delete_shifts_in_range(db: Session, schedule_id: int, start_utc: datetime,
     )
     return res.rowcount or 0
 
-def _overlaps_clause(
-    schedule_id: int,
+def load_template_items(db: Session, schedule_id: int) -> list[WeeklyTemplate]:
+    """The schedule's template rows; 422 if any row has no job role yet."""
+    items = list(db.scalars(
+        select(WeeklyTemplate).where(WeeklyTemplate.schedule_id == schedule_id)
+    ))
+    missing_roles = [it for it in items if it.role_id is None]
+    if missing_roles:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "All weekly template rows must have a job role selected "
+                "before generating shifts."
+            ),
+        )
+    return items
+
+def _window_bounds(start_date: date, end_date: date) -> tuple[datetime, datetime]:
+    start_local_midnight = _combine_local_utc(start_date, time(0, 0, 0))
+    end_local_23_59_59   = _combine_local_utc(end_date,   time(23, 59, 59))
+    return start_local_midnight, end_local_23_59_59
+
+def expand_weekly_template(
+    db: Session,
+    *,
+    sched: Schedule,
+    items: list[WeeklyTemplate],
+    body: WeeklyTemplateGeneratePayload,
+    ) -> tuple[list[Shift], dict[str, int]]:
+    """
+    Stage the shifts a template produces for the window on the session
+    (no commit). Returns (new shifts, {"replaced", "skipped", "updated"}).
+    """
+    window_start_utc, window_end_utc = _window_bounds(body.start_date, body.end_date)
+
+    counts = {"replaced": 0, "skipped": 0, "updated": 0}
+    to_insert: list[Shift] = []
+
+    # If replacing, stage the delete first (same transaction)
+    if body.policy == "replace":
+        counts["replaced"] = _delete_shifts_in_range(db, sched.id, window_start_utc, window_end_utc)
+
+    # fill_missing: one query for the window, overlap checks happen in memory
+    existing: list[tuple] = []
+    if body.policy == "fill_missing":
+        existing = _existing_slots(db, sched.id, window_start_utc, window_end_utc + timedelta(days=1))
+
+    # reconcile: match generated slots against existing shifts so assignments survive
+    current: dict[tuple, list[Shift]] = {}
+    if body.policy == "reconcile":
+        current = _shifts_by_slot(db, sched.id, window_start_utc, window_end_utc)
+
+    for day in _daterange(body.start_date, body.end_date):
+        todays = (it for it in items if it.weekday == day.weekday())
+        for it in todays:
+            start_utc = _combine_local_utc(day, it.start_time)
+            end_utc   = _combine_local_utc(day, it.end_time)
+            if end_utc <= start_utc:
+                end_utc += timedelta(days=1)  # overnight
+
+            if body.policy == "fill_missing" and _slot_taken(existing, it.location_id, it.role_id, start_utc, end_utc):
+                counts["skipped"] += 1
+                continue
+
+            if body.policy == "reconcile":
+                matches = current.get((start_utc, end_utc, it.location_id, it.role_id))
+                if matches:
+                    row = matches.pop()
+                    if row.required_staff_count != it.required_staff_count or row.notes != it.notes:
+                        row.required_staff_count = it.required_staff_count
+                        row.notes = it.notes
+                        counts["updated"] += 1
+                    else:
+                        counts["skipped"] += 1
+                    continue
+
+            to_insert.append(Shift(
+                org_id=sched.org_id,
+                schedule_id=sched.id,
+                location_id=it.location_id,
+                role_id=it.role_id,
+                start_at=start_utc,
+                end_at=end_utc,
+                notes=it.notes,
+                required_staff_count=it.required_staff_count,
+            ))
+
+    if body.policy == "reconcile":
+        # whatever was not matched is a slot the template no longer produces
+        vanished = [row.id for rows in current.values() for row in rows]
+        if vanished:
+            db.execute(delete(Shift).where(Shift.id.in_(vanished)))
+        counts["replaced"] = len(vanished)
+
+    if to_insert:
+        db.add_all(to_insert)
+    if to_insert or counts["replaced"] or counts["updated"]:
+        bump_change_seq(db, [sched.id])
+    return to_insert, counts
+
+def _aware(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def _existing_slots(db: Session, schedule_id: int, start_utc: datetime, end_utc: datetime) -> list[tuple]:
+    rows = db.execute(
+        select(Shift.location_id, Shift.role_id, Shift.start_at, Shift.end_at).where(
+            Shift.schedule_id == schedule_id,
+            overlaps(Shift.start_at, Shift.end_at, start_utc, end_utc),
+        )
+    )
+    return [(loc, role, _aware(st), _aware(en)) for loc, role, st, en in rows]
+
+def _shifts_by_slot(db: Session, schedule_id: int, start_utc: datetime, end_utc: datetime) -> dict[tuple, list[Shift]]:
+    """Shifts in the same window replace would delete, keyed by (start, end, location, role)."""
+    rows = db.scalars(
+        select(Shift).where(
+            Shift.schedule_id == schedule_id,
+            Shift.start_at <= end_utc,
+            Shift.end_at >= start_utc,
+        ).order_by(Shift.id.desc())
+    )
+    by_slot: dict[tuple, list[Shift]] = {}
+    for row in rows:
+        key = (_aware(row.start_at), _aware(row.end_at), row.location_id, row.role_id)
+        by_slot.setdefault(key, []).append(row)
+    return by_slot
+
+def _slot_taken(
+    existing: list[tuple],
     location_id: Optional[int],
     role_id: Optional[int],
     start_utc: datetime,
     end_utc: datetime,
-    ):
-    conds = [Shift.schedule_id == schedule_id]
-    if location_id is not None:
-        conds.append(Shift.location_id == location_id)
-    if role_id is not None:
-        conds.append(Shift.role_id == role_id)
-    # time overlap (including exact match)
-    conds.append(
-        or_(
-            and_(Shift.start_at < end_utc, Shift.end_at > start_utc),
-            and_(Shift.start_at == start_utc, Shift.end_at == end_utc),
-        )
-    )
-    return and_(*conds)
+    ) -> bool:
+    """
+    Same location/role (when set on the template row) and overlapping or
+    identical times, checked against preloaded shifts.
+    """
+    for loc, role, st, en in existing:
+        if location_id is not None and loc != location_id:
+            continue
+        if role_id is not None and role != role_id:
+            continue
+        if (st < end_utc and en > start_utc) or (st == start_utc and en == end_utc):
+            return True
+    return False
 
 def generate_from_weekly_template(
     db: Session,
@@ -191,74 +372,71 @@ def generate_from_weekly_template(
     if not sched:
         raise HTTPException(status_code=404, detail="Schedule not found")
 
-    items = list(db.scalars(
-        select(WeeklyTemplate).where(WeeklyTemplate.schedule_id == schedule_id)
-    ))
+    items = load_template_items(db, schedule_id)
     if not items:
-        return {"created": 0, "replaced": 0, "skipped": 0}
-    
-    missing_roles = [it for it in items if it.role_id is None]
-    if missing_roles:
-        raise HTTPException(
-            status_code=422,
-            detail=(
-                "All weekly template rows must have a job role selected "
-                "before generating shifts."
-            ),
-        )
+        return {"created": 0, "replaced": 0, "skipped": 0, "updated": 0}
 
-    start_local_midnight = _combine_local_utc(body.start_date, time(0, 0, 0))
-    end_local_23_59_59   = _combine_local_utc(body.end_date,   time(23, 59, 59))
-    window_start_utc = start_local_midnight
-    window_end_utc   = end_local_23_59_59
+    try:
+        to_insert, counts = expand_weekly_template(db, sched=sched, items=items, body=body)
+        db.commit()
+        return {"created": len(to_insert), **counts}
 
-    replaced = 0
-    created = 0
-    skipped = 0
-    to_insert: list[Shift] = []
+    except Exception:
+        db.rollback()
+        raise
 
-    try:
-        # If replacing, stage the delete first (same transaction)
-        if body.policy == "replace":
-            replaced = _delete_shifts_in_range(db, schedule_id, window_start_utc, window_end_utc)
-
-        for day in _daterange(body.start_date, body.end_date):
-            todays = (it for it in items if it.weekday == day.weekday())
-            for it in todays:
-                start_utc = _combine_local_utc(day, it.start_time)
-                end_utc   = _combine_local_utc(day, it.end_time)
-                if end_utc <= start_utc:
-                    end_utc += timedelta(days=1)  # overnight
-
-                if body.policy == "fill_missing":
-                    exists = db.scalar(
-                        select(func.count(Shift.id)).where(
-                            _overlaps_clause(schedule_id, it.location_id, it.role_id, start_utc, end_utc)
-                        )
-                    )
-                    if exists and exists > 0:
-                        skipped += 1
-                        continue
-
-                to_insert.append(Shift(
-                    org_id=sched.org_id,
-                    schedule_id=schedule_id,
-                    location_id=it.location_id,
-                    role_id=it.role_id,
-                    start_at=start_utc,
-                    end_at=end_utc,
-                    notes=it.notes,
-                    required_staff_count=it.required_staff_count,
-                ))
-                created += 1
 
-        if to_insert:
-            db.add_all(to_insert)
+# ---------- Generate + auto-assign in one transaction ----------
 
+def generate_and_assign_from_weekly_template(
+    db: Session,
+    *,
+    schedule_id: int,
+    body: WeeklyTemplateGeneratePayload,
+    ) -> dict:
+    """
+    Expand the template and auto-assign the freshly created shifts in one pass.
+    The new Shift objects are flushed (for ids) and handed straight to the
+    greedy pass with a single constraint snapshot; nothing is committed until
+    both steps succeed, so employees never see a half-staffed schedule.
+    """
+    sched = db.get(Schedule, schedule_id)
+    if not sched:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
+    items = load_template_items(db, schedule_id)
+    summary = {
+        "created": 0, "replaced": 0, "skipped": 0, "updated": 0,
+        "assigned": 0, "skipped_full": 0, "skipped_no_candidates": 0,
+    }
+    if not items:
+        return summary
+
+    try:
+        to_insert, counts = expand_weekly_template(db, sched=sched, items=items, body=body)
+        summary.update(created=len(to_insert), **counts)
+        if to_insert:
+            db.flush()
+            to_insert.sort(key=lambda s: (s.start_at, s.id))
+            window_start_utc, window_end_utc = _window_bounds(body.start_date, body.end_date)
+            snapshot = load_constraint_snapshot(db, org_id=sched.org_id, shifts=to_insert)
+            assigned = assign_shifts(
+                db,
+                shifts=to_insert,
+                snapshot=snapshot,
+                schedule_id=schedule_id,
+                window_start=window_start_utc,
+                window_end=window_end_utc,
+                policy="fill_missing",
+            )
+            summary.update(
+                assigned=assigned["assigned"],
+                skipped_full=assigned["skipped_full"],
+                skipped_no_candidates=assigned["skipped_no_candidates"],
+            )
         db.commit()
-        return {"created": created, "replaced": replaced, "skipped": skipped}
+        return summary
 
     except Exception:
         db.rollback()
         raise
-